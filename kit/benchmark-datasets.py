@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Benchmark the synthetic dataset generators (rows/sec, wall time, peak memory
+and csv bytes at several scale factors) and flag regressions against a
+stored baseline
+
+The harness lives in datagen.bench; see --help.
+"""
+
+from datagen.bench import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Makes pytest put kit/ on sys.path so the tests import the datagen package as the scripts do
@@ -0,0 +1,27 @@
+"""
+Synthetic water utility datasets for facilis.ai demos
+
+Each dataset is a lazy iterator of row dicts, parameterized by entities, date
+range, seed and (for the time series) sampling frequency:
+
+    from itertools import islice
+    from datagen import iter_water_quality
+
+    rows = list(islice(iter_water_quality(["Station-12-Suburb-West"]), 24))
+
+Importing the package is cheap: NumPy and pyarrow are only loaded by the
+columnar sinks and the vectorized engine. generate-datasets.py is the
+command-line driver that writes everything to csv.
+"""
+
+from .datasets import (
+    HOUR, SEED, asset_types, facilities, iter_customer_complaints, iter_customer_consumption, iter_customers,
+    iter_energy_usage, iter_maintenance_records, iter_network_performance, iter_water_quality, monitoring_stations,
+    pressure_zones, start_date,
+)
+
+__all__ = [
+    'HOUR', 'SEED', 'asset_types', 'facilities', 'iter_customer_complaints', 'iter_customer_consumption',
+    'iter_customers', 'iter_energy_usage', 'iter_maintenance_records', 'iter_network_performance', 'iter_water_quality',
+    'monitoring_stations', 'pressure_zones', 'start_date',
+]
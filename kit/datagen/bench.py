@@ -0,0 +1,265 @@
+"""
+Benchmark harness for the dataset generators (six datasets and the customer dimension)
+
+Every dataset (and engine) is rendered to csv at several scale factors of the
+demo defaults: the hourly datasets scale their window (240 days x SCALE of
+hourly steps) and, with --entity-scales, their stations, zones or facilities
+(the built-in ones followed by replicas), customer consumption, complaints
+and customers their customer base, maintenance records the fleet sizes. Each run happens in a fresh worker
+process, so its peak RSS belongs to that case alone, and the best of
+--repeat runs is recorded with rows, wall time, rows/sec, peak memory, csv
+bytes and the per-phase seconds (datagen.metrics) in a JSON results file.
+
+Against a stored baseline (an earlier results file), cases whose rows/sec
+dropped, or whose peak memory grew, by more than --tolerance are reported as
+regressions and the exit status is 1:
+
+    python benchmark-datasets.py --output bench.json
+    python benchmark-datasets.py --baseline bench.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # peak RSS is only reported on Unix
+    resource = None
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the numpy engine cases
+    np = None
+
+from .datasets import (
+    COMPLAINT_SCHEMA, CONSUMPTION_SCHEMA, CUSTOMER_SCHEMA, DEFAULT_DAYS, ENERGY_SCHEMA, HOUR, MAINTENANCE_SCHEMA,
+    NETWORK_SCHEMA, QUALITY_SCHEMA, SEED, billing_months, complaint_records, customer_records, default_end, facilities,
+    generate_customer_consumption, generate_energy_usage, generate_network_performance, generate_water_quality,
+    maintenance_records, monitoring_stations, pressure_zones, replicas, start_date,
+)
+from .metrics import DatasetMetrics
+from .shards import NUMPY_CUSTOMER_SHARD_SIZE, customer_shards, render_shard, row_blocks, time_shards
+from .sinks import CsvSink, write_blocks
+
+# Demo sizes at scale 1
+CUSTOMERS = 5000
+COMPLAINTS = 2000
+CHUNK_ROWS = 10000
+
+# Datasets with a vectorized engine besides the python reference generators
+NUMPY_DATASETS = ('water-quality', 'network-performance', 'energy-usage', 'customer-consumption',
+                  'water-quality-200x3y')
+
+
+def _hourly(dataset, generator, schema, entities, engine, scale, seed, entity_scale, days=DEFAULT_DAYS):
+    entities = replicas(entities, max(1, round(len(entities) * entity_scale)))
+    end = start_date + round(days * 24 * scale) * HOUR
+    shards = time_shards(start_date, end, HOUR)
+    if engine == 'numpy':
+        from .vectorized import generate_hourly_numpy
+        return (generate_hourly_numpy(dataset, entities, start_date, first, n, seed) for first, n in shards)
+    return (render_shard(generator, schema, False, entities, start_date, first, n, seed) for first, n in shards)
+
+
+def _consumption(engine, scale, seed, entity_scale):
+    num_customers = max(1, round(CUSTOMERS * scale))
+    months = billing_months(start_date, default_end(start_date))
+    if engine == 'numpy':
+        from .vectorized import generate_customer_consumption_numpy
+        return (generate_customer_consumption_numpy(first, n, months, seed)
+                for first, n in customer_shards(num_customers, NUMPY_CUSTOMER_SHARD_SIZE))
+    return (render_shard(generate_customer_consumption, CONSUMPTION_SCHEMA, False, first, n, months, seed)
+            for first, n in customer_shards(num_customers))
+
+
+# dataset -> (schema, blocks(engine, scale, seed, entity_scale)); entity_scale
+# only applies to ENTITY_DATASETS
+CASES = {
+    'water-quality': (QUALITY_SCHEMA, lambda engine, scale, seed, entity_scale: _hourly(
+        'water-quality', generate_water_quality, QUALITY_SCHEMA, monitoring_stations, engine, scale, seed,
+        entity_scale)),
+    'network-performance': (NETWORK_SCHEMA, lambda engine, scale, seed, entity_scale: _hourly(
+        'network-performance', generate_network_performance, NETWORK_SCHEMA, pressure_zones, engine, scale, seed,
+        entity_scale)),
+    'energy-usage': (ENERGY_SCHEMA, lambda engine, scale, seed, entity_scale: _hourly(
+        'energy-usage', generate_energy_usage, ENERGY_SCHEMA, facilities, engine, scale, seed, entity_scale)),
+    'maintenance-records': (MAINTENANCE_SCHEMA, lambda engine, scale, seed, entity_scale: row_blocks(
+        maintenance_records(seed=seed, fleet_scale=scale), MAINTENANCE_SCHEMA, False, CHUNK_ROWS)),
+    'customer-consumption': (CONSUMPTION_SCHEMA, _consumption),
+    'customer-complaints': (COMPLAINT_SCHEMA, lambda engine, scale, seed, entity_scale: row_blocks(
+        complaint_records(max(1, round(COMPLAINTS * scale)), start_date, default_end(start_date), seed,
+                          max(1, round(CUSTOMERS * scale))), COMPLAINT_SCHEMA, False, CHUNK_ROWS)),
+    'customers': (CUSTOMER_SCHEMA, lambda engine, scale, seed, entity_scale: row_blocks(
+        customer_records(max(1, round(CUSTOMERS * scale)), seed), CUSTOMER_SCHEMA, False, CHUNK_ROWS)),
+    # 200 stations (the built-in ones and their replicas) over 3 years at scale 1
+    'water-quality-200x3y': (QUALITY_SCHEMA, lambda engine, scale, seed, entity_scale: _hourly(
+        'water-quality', generate_water_quality, QUALITY_SCHEMA, replicas(monitoring_stations, 200), engine, scale,
+        seed, entity_scale, 3 * 365)),
+}
+
+# Datasets whose entity count --entity-scales multiplies; the others run at entity scale 1 only
+ENTITY_DATASETS = ('water-quality', 'network-performance', 'energy-usage', 'water-quality-200x3y')
+
+# Cases too large for the default run; --datasets selects them
+LARGE_CASES = ('water-quality-200x3y',)
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None where it is not available"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+def run_case(dataset, engine, scale, entity_scale, seed, trace=False):
+    """Render one dataset to a scratch csv and measure it (meant to run in a fresh process)"""
+    schema, blocks = CASES[dataset]
+    with tempfile.TemporaryDirectory(prefix='datagen-bench-') as scratch:
+        path = Path(scratch) / f"{dataset}.csv"
+        if trace:
+            tracemalloc.start()
+        metrics = DatasetMetrics(dataset)
+        began = time.perf_counter()
+        rows = write_blocks(blocks(engine, scale, seed, entity_scale), [CsvSink(path, schema)], metrics)
+        seconds = time.perf_counter() - began
+        result = {'rows': rows, 'seconds': seconds, 'bytes': path.stat().st_size, 'peak_rss_bytes': peak_rss(),
+                  'phases': metrics.summary()['phases']}
+        if trace:
+            result['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result
+
+
+def isolated(dataset, engine, scale, entity_scale, seed, trace=False):
+    """run_case in a worker process of its own"""
+    with ProcessPoolExecutor(1) as pool:
+        return pool.submit(run_case, dataset, engine, scale, entity_scale, seed, trace).result()
+
+
+def benchmark(dataset, engine, scale, entity_scale, seed, repeat, trace):
+    """Best-of-`repeat` measurement of one case; the traced pass (if any) is separate and untimed"""
+    runs = [isolated(dataset, engine, scale, entity_scale, seed) for _ in range(repeat)]
+    best = min(runs, key=lambda run: run['seconds'])
+    result = {
+        'dataset': dataset, 'engine': engine, 'scale': scale, 'entity_scale': entity_scale, 'rows': best['rows'],
+        'seconds': round(best['seconds'], 4), 'rows_per_sec': round(best['rows'] / best['seconds'], 1),
+        'bytes': best['bytes'], 'peak_rss_bytes': min(run['peak_rss_bytes'] or 0 for run in runs) or None,
+        'phases': best['phases'],
+    }
+    if trace:
+        traced = isolated(dataset, engine, scale, entity_scale, seed, trace=True)
+        result['peak_traced_bytes'] = traced['peak_traced_bytes']
+    return result
+
+
+def case_key(case):
+    return case['dataset'], case['engine'], case['scale'], case.get('entity_scale', 1.0)
+
+
+def regressions(results, baseline, tolerance):
+    """(case, metric, baseline value, new value) for every case slower or larger than its baseline beyond tolerance"""
+    previous = {case_key(case): case for case in baseline['cases']}
+    found = []
+    for case in results['cases']:
+        before = previous.get(case_key(case))
+        if before is None:
+            continue
+        if case['rows_per_sec'] < before['rows_per_sec'] * (1 - tolerance):
+            found.append((case, 'rows_per_sec', before['rows_per_sec'], case['rows_per_sec']))
+        for metric in ('peak_rss_bytes', 'peak_traced_bytes'):
+            if case.get(metric) and before.get(metric) and case[metric] > before[metric] * (1 + tolerance):
+                found.append((case, metric, before[metric], case[metric]))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dataset generators at several scale factors")
+    parser.add_argument(
+        "--datasets", nargs="+", choices=list(CASES), default=[name for name in CASES if name not in LARGE_CASES],
+        help=f"datasets to run (default: all but {', '.join(LARGE_CASES)})"
+    )
+    parser.add_argument(
+        "--engines", nargs="+", choices=["python", "numpy"], default=["python", "numpy"],
+        help=f"engines to run; numpy only applies to {', '.join(NUMPY_DATASETS)}"
+    )
+    parser.add_argument(
+        "--scales", nargs="+", type=float, default=[0.25, 1.0, 4.0],
+        help="scale factors of the demo sizes (hours, customers, assets) (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--entity-scales", nargs="+", type=float, default=[1.0],
+        help=f"scale factors of the entity counts of {', '.join(ENTITY_DATASETS)} (stations, zones, facilities), "
+             f"each run at every --scales (default: %(default)s)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=SEED, help="root seed of the generated data")
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="also record the Python heap peak from an extra tracemalloc run per case"
+    )
+    parser.add_argument("--output", type=Path, default=Path("bench-results.json"), help="JSON results file to write")
+    parser.add_argument("--baseline", type=Path, help="results file to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="fraction rows/sec may drop or peak memory grow before a case is a regression (default: 0.2)"
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if any(scale <= 0 for scale in args.scales + args.entity_scales):
+        parser.error("--scales and --entity-scales must be positive")
+    if "numpy" in args.engines and np is None:
+        parser.error("--engines numpy requires NumPy (pip install numpy); pass --engines python")
+    baseline = None
+    if args.baseline is not None:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"--baseline {args.baseline}: {e}")
+
+    cases = [(dataset, engine, scale, entity_scale) for dataset in args.datasets for engine in args.engines
+             if engine == 'python' or dataset in NUMPY_DATASETS
+             for entity_scale in (args.entity_scales if dataset in ENTITY_DATASETS else [1.0])
+             for scale in args.scales]
+    results = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'cases': [],
+    }
+    print(f"{'dataset':<22} {'engine':<7} {'scale':>6} {'entities':>8} {'rows':>10} {'seconds':>8} {'rows/s':>10} "
+          f"{'peak RSS':>9} {'csv':>9}")
+    for dataset, engine, scale, entity_scale in cases:
+        case = benchmark(dataset, engine, scale, entity_scale, args.seed, args.repeat, args.trace_memory)
+        results['cases'].append(case)
+        rss = f"{case['peak_rss_bytes'] / 2**20:.0f} MiB" if case['peak_rss_bytes'] else "-"
+        print(f"{dataset:<22} {engine:<7} {scale:>6g} {entity_scale:>8g} {case['rows']:>10,} {case['seconds']:>8.2f} "
+              f"{case['rows_per_sec']:>10,.0f} {rss:>9} {case['bytes'] / 2**20:>5.1f} MiB")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        found = regressions(results, baseline, args.tolerance)
+        for case, metric, before, after in found:
+            print(f"REGRESSION {case['dataset']} ({case['engine']}, scale {case['scale']:g}, "
+                  f"entity scale {case.get('entity_scale', 1.0):g}): "
+                  f"{metric} {before:,} -> {after:,}")
+        if found:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
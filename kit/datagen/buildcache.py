@@ -0,0 +1,223 @@
+"""
+Content-addressed build cache: skip or relink datasets whose inputs are unchanged
+
+Every dataset's outputs (<name>.csv and all its siblings) are keyed by a
+sha256 of what they are made from: the source of its generator functions,
+the module-level data they read (entity lists, type tables, schemas), the
+source of the shared modules that shape the files (csv driver, sinks,
+shards, ...) and the build parameters (seed, window, engine, output
+options, library versions). INPUTS declares those dependencies per dataset;
+complaints, for instance, read the customer profiles (types, zones and
+their stations), so editing any of those invalidates them too.
+
+DATA_DIR/_build.json records the key, row count and file sizes of each
+dataset's last build. A dataset whose key and files still match is skipped.
+With a cache directory (--cache), every build is also hard-linked under
+<cache>/<key>/, so another data directory built from the same inputs links
+the files from there instead of generating them. Outputs are unlinked, never
+truncated, before a rebuild, and appends copy linked files first, so cached
+files are never modified through a data directory.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from .datasets import (
+    CLUSTER_TRIES, COMPLAINT_SCHEMA, CONSUMPTION_ANOMALIES, CONSUMPTION_SCHEMA, CUSTOMER_SCHEMA, ENERGY_ROLLUP,
+    ENERGY_SCHEMA, ENERGY_SIGNALS, FLAG, MAINTENANCE_SCHEMA, NETWORK_ROLLUP, NETWORK_SCHEMA, NETWORK_SIGNALS,
+    PROFILE_BLOCK, QUALITY_ROLLUP, QUALITY_SCHEMA, QUALITY_SIGNALS, TYPE_WEIGHTS, ZONE_STATIONS, ZONE_WEIGHTS,
+    asset_types, billing_months, clustered_customer, complaint_records, complaint_types, customer_profile,
+    customer_profiles, customer_records, customer_types, default_end, entity_number, facilities, failure_modes,
+    generate_asset_events, generate_complaints, generate_customer_consumption, generate_energy_usage,
+    generate_network_performance, generate_pending_maintenance, generate_water_quality, load_scenario,
+    maintenance_plan, maintenance_records, maintenance_types, monitoring_stations, pressure_zones, priorities,
+    profile_block, statuses,
+)
+
+MANIFEST = '_build.json'
+
+# Cache entry description, stored inside <cache>/<key>/
+ENTRY = '_entry.json'
+
+# What one dataset is generated from besides the build parameters: functions
+# (hashed by source), whole datagen modules (hashed by file) and module-level values
+Inputs = namedtuple('Inputs', 'functions modules values')
+
+# What every customer's profile (customers.csv) is drawn from
+PROFILE_FUNCTIONS = (profile_block, customer_profile, customer_profiles)
+PROFILE_VALUES = {
+    'customer_types': customer_types, 'pressure_zones': pressure_zones, 'profile_block': PROFILE_BLOCK,
+    'type_weights': TYPE_WEIGHTS, 'zone_weights': ZONE_WEIGHTS, 'zone_stations': ZONE_STATIONS,
+}
+
+# Modules every dataset's files depend on
+COMMON_MODULES = ('cli', 'shards', 'sinks', 'seekindex', 'partitions', 'downsample', 'labels')
+
+HOURLY_MODULES = ('timeaxis', 'scenarios', 'checkpoint')
+
+INPUTS = {
+    'water-quality-monitoring.csv': Inputs(
+        (generate_water_quality, entity_number, load_scenario), HOURLY_MODULES + ('vectorized',),
+        {'monitoring_stations': monitoring_stations, 'schema': QUALITY_SCHEMA, 'rollup': QUALITY_ROLLUP,
+         'signals': QUALITY_SIGNALS, 'flag': FLAG},
+    ),
+    'distribution-network-performance.csv': Inputs(
+        (generate_network_performance, entity_number, load_scenario), HOURLY_MODULES + ('vectorized',),
+        {'pressure_zones': pressure_zones, 'schema': NETWORK_SCHEMA, 'rollup': NETWORK_ROLLUP,
+         'signals': NETWORK_SIGNALS, 'flag': FLAG},
+    ),
+    'energy-usage.csv': Inputs(
+        (generate_energy_usage, load_scenario), HOURLY_MODULES + ('vectorized',),
+        {'facilities': facilities, 'schema': ENERGY_SCHEMA, 'rollup': ENERGY_ROLLUP, 'signals': ENERGY_SIGNALS},
+    ),
+    'maintenance-records.csv': Inputs(
+        (generate_asset_events, generate_pending_maintenance, maintenance_plan, maintenance_records, default_end), (),
+        {'asset_types': asset_types, 'maintenance_types': maintenance_types, 'failure_modes': failure_modes,
+         'schema': MAINTENANCE_SCHEMA, 'flag': FLAG},
+    ),
+    'customer-consumption.csv': Inputs(
+        (generate_customer_consumption, billing_months) + PROFILE_FUNCTIONS, ('vectorized',),
+        {**PROFILE_VALUES, 'anomalies': CONSUMPTION_ANOMALIES, 'schema': CONSUMPTION_SCHEMA},
+    ),
+    'customer-complaints.csv': Inputs(
+        (generate_complaints, complaint_records, clustered_customer, default_end) + PROFILE_FUNCTIONS, ('joins',),
+        {**PROFILE_VALUES, 'complaint_types': complaint_types, 'priorities': priorities, 'statuses': statuses,
+         'cluster_tries': CLUSTER_TRIES, 'schema': COMPLAINT_SCHEMA},
+    ),
+    # The join indexes record the billing months of consumption
+    'customers.csv': Inputs(
+        (customer_records, billing_months, default_end) + PROFILE_FUNCTIONS, ('joins',),
+        {**PROFILE_VALUES, 'schema': CUSTOMER_SCHEMA},
+    ),
+}
+
+
+def dataset_key(filename, params):
+    """Hex sha256 of a dataset's inputs (INPUTS) and its build parameters"""
+    inputs = INPUTS[filename]
+    digest = hashlib.sha256(filename.encode())
+    for function in inputs.functions:
+        digest.update(inspect.getsource(function).encode())
+    for module in COMMON_MODULES + inputs.modules:
+        digest.update((Path(__file__).parent / f"{module}.py").read_bytes())
+    data = {'values': inputs.values, 'params': params, 'python': list(sys.version_info[:2])}
+    digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def link(source, target):
+    """Hard-link source at target, or copy it where links are not possible (another filesystem)"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class BuildCache:
+    """The build manifest of a data directory, plus an optional shared cache directory"""
+
+    def __init__(self, data_dir, cache_dir=None):
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir
+        path = data_dir / MANIFEST
+        self.manifest = {'datasets': {}}
+        if path.exists():
+            with open(path) as f:
+                self.manifest = json.load(f)
+
+    def save(self):
+        with open(self.data_dir / MANIFEST, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    def outputs(self, filename):
+        """Paths (relative to the data directory) of every file written for a dataset: <name>.* and <name>/**"""
+        stem = Path(filename).stem
+        files = [path for path in self.data_dir.glob(f"{stem}.*") if path.is_file()]
+        if (self.data_dir / stem).is_dir():
+            files += [path for path in (self.data_dir / stem).rglob('*') if path.is_file()]
+        return sorted(path.relative_to(self.data_dir).as_posix() for path in files)
+
+    def clear(self, filename):
+        """Unlink a dataset's outputs (cached links stay intact) and forget its build"""
+        for name in self.outputs(filename):
+            (self.data_dir / name).unlink()
+        shutil.rmtree(self.data_dir / Path(filename).stem, ignore_errors=True)
+        self.forget(filename)
+
+    def forget(self, filename):
+        if self.manifest['datasets'].pop(filename, None) is not None:
+            self.save()
+
+    def detach(self, filename):
+        """Give a dataset's hard-linked outputs private copies before they are modified in place (--append)"""
+        for name in self.outputs(filename):
+            path = self.data_dir / name
+            if path.stat().st_nlink > 1:
+                copy = path.with_name(f".{path.name}.detach")
+                shutil.copy2(path, copy)
+                os.replace(copy, path)
+        self.forget(filename)
+
+    def restore(self, filename, key):
+        """(rows, source) when the dataset's outputs for `key` are in place or could be linked from the cache,
+        else None
+
+        source is 'unchanged' (the last build's files still match) or 'cache'.
+        """
+        entry = self.manifest['datasets'].get(filename)
+        if entry is not None and entry['key'] == key and self._intact(self.data_dir, entry['files']):
+            return entry['rows'], 'unchanged'
+        if self.cache_dir is None:
+            return None
+        cached = self.cache_dir / key
+        try:
+            with open(cached / ENTRY) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self._intact(cached, entry['files']):
+            return None
+        self.clear(filename)
+        for name in entry['files']:
+            link(cached / name, self.data_dir / name)
+        self.manifest['datasets'][filename] = entry
+        self.save()
+        return entry['rows'], 'cache'
+
+    def store(self, filename, key, rows):
+        """Record a finished build in the manifest and, with a cache directory, link its files under the key"""
+        files = {name: (self.data_dir / name).stat().st_size for name in self.outputs(filename)}
+        entry = {'key': key, 'rows': rows, 'files': files}
+        self.manifest['datasets'][filename] = entry
+        self.save()
+        if self.cache_dir is None or (self.cache_dir / key / ENTRY).exists():
+            return
+        # Filled under a temporary name and renamed, so a half-written entry is never seen
+        staging = self.cache_dir / f".{key}.{os.getpid()}"
+        staging.mkdir(parents=True)
+        for name in files:
+            link(self.data_dir / name, staging / name)
+        with open(staging / ENTRY, 'w') as f:
+            json.dump(entry, f, indent=2)
+            f.write('\n')
+        try:
+            os.rename(staging, self.cache_dir / key)
+        except OSError:  # another build stored the same key first
+            shutil.rmtree(staging)
+
+    @staticmethod
+    def _intact(root, files):
+        """Whether every file is present with its recorded size"""
+        for name, size in files.items():
+            path = root / name
+            if not path.is_file() or path.stat().st_size != size:
+                return False
+        return True
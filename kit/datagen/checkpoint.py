@@ -0,0 +1,102 @@
+"""
+Checkpoints that let the hourly csv files be extended in time (--append)
+
+Every shard draws from a seed stream keyed by (seed, dataset, entity, first
+step) and the stateful effects (Zone-C-South leak growth, desalination
+efficiency loss) are functions of the timestamp and the window start, so the
+generator state at any hour is fully described by the window start, seed,
+engine, frequency, entity list and scenario rules. That is what the
+checkpoint records (the scenario as a digest of its rules), next to the csv
+length it was taken at. Resuming replays at most the partial shard the file
+ended in and produces the same bytes a full rebuild would.
+"""
+
+import datetime
+import json
+import os
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Tail bytes read to find the last csv line; far longer than any row
+TAIL_BYTES = 4096
+
+
+def checkpoint_path(csv_path):
+    """<name>.state.json next to <name>.csv"""
+    return csv_path.with_suffix('.state.json')
+
+
+def save_checkpoint(csv_path, start, end, freq, seed, engine, entities, scenario, rows):
+    """Record the generator state the csv at csv_path ends in"""
+    state = {
+        'start': start.strftime(TIMESTAMP_FORMAT),
+        'end': end.strftime(TIMESTAMP_FORMAT),
+        'freq_seconds': int(freq.total_seconds()),
+        'seed': seed,
+        'engine': engine,
+        'entities': list(entities),
+        'scenario': scenario,
+        'rows': rows,
+        'bytes': os.path.getsize(csv_path),
+    }
+    with open(checkpoint_path(csv_path), 'w') as f:
+        json.dump(state, f, indent=2)
+        f.write('\n')
+
+
+def load_checkpoint(csv_path):
+    """The checkpoint saved with csv_path, with start/end/freq parsed back"""
+    path = checkpoint_path(csv_path)
+    if not path.exists():
+        raise ValueError(f"{csv_path} has no checkpoint ({path.name}); generate it once without --append")
+    with open(path) as f:
+        state = json.load(f)
+    state['start'] = datetime.datetime.strptime(state['start'], TIMESTAMP_FORMAT)
+    state['end'] = datetime.datetime.strptime(state['end'], TIMESTAMP_FORMAT)
+    state['freq'] = datetime.timedelta(seconds=state.pop('freq_seconds'))
+    return state
+
+
+def last_line(csv_path, size=None):
+    """The last non-empty line of a csv file (of its first `size` bytes), read from its tail"""
+    with open(csv_path, 'rb') as f:
+        if size is None:
+            size = f.seek(0, os.SEEK_END)
+        start = max(0, size - TAIL_BYTES)
+        f.seek(start)
+        lines = f.read(size - start).decode().splitlines()
+    return lines[-1] if lines else ''
+
+
+def resume_point(csv_path, seed, engine, entities, scenario):
+    """Checkpoint state plus the first step missing from csv_path
+
+    A file longer than its checkpoint was left by an interrupted append; it is
+    validated up to the checkpointed length and left as it is, so nothing is
+    modified until every dataset has passed (truncate_to_checkpoint then cuts
+    it back). Anything else that disagrees with the checkpoint (or with the
+    requested seed, engine, entities or scenario digest) raises ValueError
+    rather than appending rows that would not match a rebuild.
+    """
+    state = load_checkpoint(csv_path)
+    expected = {'seed': seed, 'engine': engine, 'entities': list(entities), 'scenario': scenario}
+    for key, value in expected.items():
+        if state.get(key) != value:
+            raise ValueError(f"{csv_path} was generated with {key}={state.get(key)!r}, not {value!r}")
+
+    size = os.path.getsize(csv_path)
+    if size < state['bytes']:
+        raise ValueError(f"{csv_path} is shorter than its checkpoint; regenerate it without --append")
+
+    steps, partial = divmod(state['rows'], len(entities))
+    last = datetime.datetime.strptime(last_line(csv_path, state['bytes']).split(',', 1)[0], TIMESTAMP_FORMAT)
+    if partial or last != state['start'] + (steps - 1) * state['freq']:
+        raise ValueError(f"{csv_path} does not end on the checkpointed hour; regenerate it without --append")
+    return state, steps
+
+
+def truncate_to_checkpoint(csv_path, state):
+    """Cut the rows an interrupted append left after the checkpoint (state from resume_point)"""
+    if os.path.getsize(csv_path) > state['bytes']:
+        print(f"  Truncating {csv_path.name} to its checkpoint (an earlier append was interrupted)")
+        os.truncate(csv_path, state['bytes'])
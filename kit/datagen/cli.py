@@ -0,0 +1,519 @@
+"""
+Command-line driver: writes every dataset to csv (plus optional columnar and
+rollup siblings) under DATA_DIR, skipping datasets whose inputs did not
+change since the last build (datagen.buildcache)
+"""
+
+import argparse
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for --engine numpy and --columnar
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is only needed for --columnar parquet
+    pa = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is only needed for --compress zstd
+    zstandard = None
+
+from .buildcache import BuildCache, dataset_key
+from .checkpoint import resume_point, save_checkpoint, truncate_to_checkpoint
+from .database import SqliteSink, close_database, csv_blocks, open_database
+from .downsample import LTTB_LEVELS, DownsampleSink
+from .datasets import (
+    COMPLAINT_SCHEMA, CONSUMPTION_SCHEMA, CUSTOMER_SCHEMA, ENERGY_ROLLUP, ENERGY_SCHEMA, HOUR, MAINTENANCE_SCHEMA,
+    NETWORK_ROLLUP, NETWORK_SCHEMA, QUALITY_ROLLUP, QUALITY_SCHEMA, SEED, billing_months, complaint_records,
+    customer_records, default_end, facilities, generate_customer_consumption, generate_energy_usage,
+    generate_network_performance, generate_water_quality, load_scenario, maintenance_records, monitoring_stations,
+    pressure_zones, start_date,
+)
+from .joins import ComplaintIndexSink, JoinIndexSink
+from .labels import LabelSink
+from .metrics import PHASES, PROFILED, DatasetMetrics, profile_stats
+from .partitions import PartitionSink
+from .scenarios import DEFAULT_SCENARIO
+from .seekindex import CustomerIndexSink, TimeIndexSink, index_path, load_index
+from .shards import (
+    NUMPY_CUSTOMER_SHARD_SIZE, customer_shards, drop_rows, render_labeled_shard, render_shard, row_blocks, run_shards,
+    time_shards,
+)
+from .sinks import CODECS, CompressedCsvSink, CsvSink, NpzSink, ParquetSink, RollupSink, write_blocks
+from .vectorized import (
+    generate_customer_consumption_numpy, generate_energy_usage_numpy, generate_network_performance_numpy,
+    generate_water_quality_numpy,
+)
+
+# Output directory
+DATA_DIR = Path("data")
+
+# Customer accounts at --scale 1
+CUSTOMERS = 5000
+
+# --partition layout per csv: (time column, entity column) under month=/<entity>=
+PARTITION_BY = {
+    'water-quality-monitoring.csv': ('timestamp', 'station'),
+    'distribution-network-performance.csv': ('timestamp', 'zone'),
+    'energy-usage.csv': ('timestamp', 'facility'),
+    'maintenance-records.csv': ('maintenance_date', 'asset_type'),
+    'customer-consumption.csv': ('billing_date', 'customer_type'),
+    'customer-complaints.csv': ('complaint_date', 'location'),
+}
+
+# --labels key columns per csv with injected anomalies: (time column, entity column)
+LABEL_KEYS = {
+    'water-quality-monitoring.csv': ('timestamp', 'station'),
+    'distribution-network-performance.csv': ('timestamp', 'zone'),
+    'energy-usage.csv': ('timestamp', 'facility'),
+    'customer-consumption.csv': ('billing_date', 'customer_id'),
+}
+
+# --sqlite index per csv's table
+SQLITE_INDEXES = {
+    'water-quality-monitoring.csv': ('station', 'timestamp'),
+    'distribution-network-performance.csv': ('zone', 'timestamp'),
+    'energy-usage.csv': ('facility', 'timestamp'),
+    'maintenance-records.csv': ('asset_id', 'maintenance_date'),
+    'customer-consumption.csv': ('customer_id', 'billing_period'),
+    'customer-complaints.csv': ('customer_id', 'complaint_date'),
+    'customers.csv': ('customer_id',),
+}
+
+
+def with_progress(blocks, unit, step, metrics):
+    """Pass (size, block) pairs through as blocks, reporting progress every `step` units of size"""
+    done = 0
+    for size, block in blocks:
+        yield block
+        before, done = done, done + size
+        if done // step > before // step:
+            metrics.progress(done, unit)
+
+
+def report_phases(metrics):
+    """Record a finished dataset's metrics and print its throughput and phase breakdown"""
+    summary = metrics.finish()
+    phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in summary['phases'].items())
+    print(f"  {summary['rows_per_sec']:,.0f} rows/s, {summary['bytes_per_sec'] / 2**20:.1f} MiB/s "
+          f"in {summary['seconds']:.2f}s ({phases})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic water utility datasets")
+    parser.add_argument(
+        "--engine", choices=["python", "numpy"], default="python",
+        help="row-by-row reference generators or vectorized NumPy engine for the hourly and "
+             "customer-consumption data"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="scale factor for the customer base: 5,000 x SCALE accounts (e.g. 1000 for 5 million)"
+    )
+    parser.add_argument(
+        "--chunk-rows", type=int, default=10000,
+        help="rows buffered per write for the date-sorted datasets; hourly data is bounded by shard size"
+    )
+    parser.add_argument("--seed", type=int, default=SEED, help="root seed every dataset/shard stream is derived from")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="worker processes; output is byte-identical for any worker count"
+    )
+    parser.add_argument(
+        "--columnar", choices=["parquet", "npz"],
+        help="also write typed columnar files (dictionary-encoded categories, boolean flags, int64 epoch timestamps)"
+    )
+    parser.add_argument(
+        "--rollups", action="store_true",
+        help="also write daily/monthly per-station, zone and facility rollups (<dataset>.daily.csv, .monthly.csv)"
+    )
+    parser.add_argument(
+        "--downsample", nargs="*", type=int, metavar="POINTS",
+        help="also write LTTB-downsampled hourly series per station, zone and facility metric for charts, one "
+             f"<dataset>.lttb-POINTS.csv per point budget (default: {' '.join(map(str, LTTB_LEVELS))})"
+    )
+    parser.add_argument(
+        "--labels", action="store_true",
+        help="also write ground-truth anomaly labels (<dataset>.labels.csv): every reading a scenario rule or an "
+             "injected customer anomaly changed"
+    )
+    parser.add_argument(
+        "--compress", nargs="+", choices=list(CODECS), default=[],
+        help="also write compressed csv siblings (<dataset>.csv.gz for nginx gzip_static, .xz, .zst) while generating"
+    )
+    parser.add_argument(
+        "--partition", action="store_true",
+        help="also write each dataset Hive-style as <dataset>/month=YYYY-MM/<entity>=<value>/part.csv "
+             "with a _manifest.json"
+    )
+    parser.add_argument(
+        "--sqlite", type=Path,
+        help="also bulk-load every dataset into this SQLite database, indexed and with daily/monthly rollup views"
+    )
+    parser.add_argument(
+        "--index", action="store_true",
+        help="also write byte-offset seek indexes (<dataset>.index.json) for the hourly and customer-consumption csv"
+    )
+    parser.add_argument(
+        "--metrics", type=Path,
+        help="write per-dataset progress and phase timings (generate, format, write, compress) as JSON lines"
+    )
+    parser.add_argument(
+        "--profile", nargs="+", choices=PHASES, default=[],
+        help="run the given phases under cProfile (in this process) and save profile-<phase>.prof"
+    )
+    parser.add_argument(
+        "--end", type=datetime.datetime.fromisoformat, default=default_end(start_date),
+        help="end of the generated window, exclusive (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--scenario", type=Path, default=DEFAULT_SCENARIO,
+        help="JSON file of anomaly rules for the hourly datasets (default: the built-in demo issues)"
+    )
+    parser.add_argument(
+        "--cache", type=Path,
+        help="shared build cache directory: datasets built before from the same inputs are hard-linked from it, "
+             "new builds are added to it"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="regenerate every dataset, even those unchanged since the last build"
+    )
+    parser.add_argument(
+        "--append", action="store_true",
+        help="extend the existing hourly csv files up to --end from their checkpoints instead of rebuilding everything"
+    )
+    args = parser.parse_args()
+    if (args.engine == "numpy" or args.columnar or args.rollups or args.downsample is not None) and np is None:
+        parser.error("--engine numpy, --columnar, --rollups and --downsample require NumPy (pip install numpy)")
+    if args.downsample is not None and any(points < 3 for points in args.downsample):
+        parser.error("--downsample point budgets must be at least 3")
+    if args.columnar == "parquet" and pa is None:
+        parser.error("--columnar parquet requires pyarrow (pip install pyarrow)")
+    if "zstd" in args.compress and zstandard is None:
+        parser.error("--compress zstd requires zstandard (pip install zstandard)")
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if round(CUSTOMERS * args.scale) < 1:
+        parser.error("--scale must leave at least one customer")
+    if args.end <= start_date:
+        parser.error(f"--end must be after {start_date}")
+    if args.append and (args.columnar or args.rollups or args.downsample is not None or args.labels or args.compress
+                        or args.partition or args.sqlite):
+        parser.error("--append only extends the csv files; rebuild without it for --columnar, --rollups, "
+                     "--downsample, --labels, --compress, --partition and --sqlite")
+    try:
+        scenario = load_scenario(args.scenario)
+    except (OSError, ValueError) as e:
+        parser.error(f"--scenario {args.scenario}: {e}")
+
+    DATA_DIR.mkdir(exist_ok=True)
+    end_date = args.end
+    num_customers = round(CUSTOMERS * args.scale)
+    # rollups and downsampled series are computed from the typed columns
+    columnar = args.columnar is not None or args.rollups or args.downsample is not None
+    downsample_levels = tuple(args.downsample or LTTB_LEVELS) if args.downsample is not None else None
+    if args.profile:
+        # Profilers only see this process, so shards are generated in it
+        if args.workers > 1:
+            print("Profiling: generating in a single process (--workers ignored)")
+        args.workers = 1
+        PROFILED.update(args.profile)
+    executor = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    cache = BuildCache(DATA_DIR, args.cache)
+    db = open_database(args.sqlite) if args.sqlite else None
+    report = open(args.metrics, 'w') if args.metrics else None
+    in_flight = 2 * args.workers
+
+    def sinks(filename, schema, rollup=None, index=None):
+        """Output sinks for one dataset: the csv plus its optional siblings (compressed, columnar, rollups,
+        downsampled series, labels, seek index, partitions, database); the customer dimension has no time
+        column to partition by
+
+        `index` makes the seek index sink for the csv path when --index is given.
+        """
+        path = DATA_DIR / filename
+        result = [CsvSink(path, schema, append=args.append)]
+        result += [CompressedCsvSink(path, schema, codec) for codec in args.compress]
+        if args.columnar == "parquet":
+            result.append(ParquetSink(path.with_suffix('.parquet'), schema))
+        elif args.columnar == "npz":
+            result.append(NpzSink(path.with_suffix('.npz'), schema))
+        if args.rollups and rollup is not None:
+            result.append(RollupSink(path, rollup))
+        if downsample_levels is not None and rollup is not None:
+            result.append(DownsampleSink(path, rollup, downsample_levels))
+        if args.labels and filename in LABEL_KEYS:
+            result.append(LabelSink(path, *LABEL_KEYS[filename]))
+        if args.index and index is not None:
+            result.append(index(path))
+        if args.partition and filename in PARTITION_BY:
+            result.append(PartitionSink(path, schema, *PARTITION_BY[filename]))
+        if db is not None:
+            result.append(SqliteSink(db, path, schema, SQLITE_INDEXES[filename], rollup))
+        return result
+
+    def joins(filename, sink):
+        """The join index sink of a customer csv (datagen.joins), when NumPy is there to write it"""
+        return [] if np is None else [sink(DATA_DIR / filename)]
+
+    # Hourly datasets: (csv file, generator, schema, entities, rollup, engine)
+    hourly_datasets = [
+        ('water-quality-monitoring.csv',
+         generate_water_quality_numpy if args.engine == "numpy" else generate_water_quality,
+         QUALITY_SCHEMA, monitoring_stations, QUALITY_ROLLUP, args.engine),
+        ('distribution-network-performance.csv',
+         generate_network_performance_numpy if args.engine == "numpy" else generate_network_performance,
+         NETWORK_SCHEMA, pressure_zones, NETWORK_ROLLUP, args.engine),
+        ('energy-usage.csv', generate_energy_usage_numpy if args.engine == "numpy" else generate_energy_usage,
+         ENERGY_SCHEMA, facilities, ENERGY_ROLLUP, args.engine),
+    ]
+
+    # Where each hourly csv resumes: (window start, first missing hour). Every
+    # checkpoint is validated before anything is written.
+    resume = {filename: (start_date, 0) for filename, *_ in hourly_datasets}
+    if args.append:
+        states = {}
+        for filename, _, _, entities, _, engine in hourly_datasets:
+            try:
+                state, steps = resume_point(DATA_DIR / filename, args.seed, engine, entities, scenario.digest)
+                if args.index:
+                    load_index(DATA_DIR / filename, state['bytes'])
+            except (OSError, ValueError) as e:
+                parser.error(str(e))
+            states[filename] = state
+            resume[filename] = (state['start'], steps)
+        for filename, state in states.items():
+            truncate_to_checkpoint(DATA_DIR / filename, state)
+            if not args.index:  # an index left as it is would no longer match the grown csv
+                index_path(DATA_DIR / filename).unlink(missing_ok=True)
+
+    def hourly(filename, generator, schema, entities, rollup, engine):
+        """Write the hours of an hourly dataset missing from its csv, in time order, and checkpoint it"""
+        start, resume_step = resume[filename]
+        shards = [(first, n) for first, n in time_shards(start, end_date, HOUR) if first + n > resume_step]
+        if engine == "numpy":
+            tasks = [(entities, start, first, n, args.seed, columnar, HOUR, scenario, args.labels)
+                     for first, n in shards]
+            blocks = run_shards(generator, tasks, executor, in_flight)
+        else:
+            tasks = [(generator, schema, columnar, entities, start, first, n, args.seed, HOUR, scenario)
+                     for first, n in shards]
+            blocks = run_shards(render_labeled_shard if args.labels else render_shard, tasks, executor, in_flight)
+        if shards and shards[0][0] < resume_step:
+            # The csv ends inside this shard: replay it from its seed and keep only the new hours
+            skip = (resume_step - shards[0][0]) * len(entities)
+            blocks = (drop_rows(block, skip if i == 0 else 0) for i, block in enumerate(blocks))
+        sizes = [first + n - max(first, resume_step) for first, n in shards]
+        index = partial(TimeIndexSink, schema=schema, entities=entities, append=args.append)
+        metrics = DatasetMetrics(filename, report)
+        count = write_blocks(with_progress(zip(sizes, blocks), "hours of data", 1000, metrics),
+                             sinks(filename, schema, rollup, index), metrics)
+        report_phases(metrics)
+        save_checkpoint(DATA_DIR / filename, start, max(end_date, start + resume_step * HOUR), HOUR, args.seed, engine,
+                        entities, scenario.digest, resume_step * len(entities) + count)
+        return count
+
+    # Build parameters every dataset's cache key includes (datagen.buildcache)
+    build_params = {
+        'seed': args.seed, 'start': start_date, 'end': end_date, 'columnar': args.columnar, 'compress': args.compress,
+        'partition': args.partition,
+        'numpy': np.__version__ if np is not None and (args.engine == "numpy" or columnar) else None,
+        'pyarrow': pa.__version__ if args.columnar == "parquet" else None,
+        'zstandard': zstandard.__version__ if "zstd" in args.compress else None,
+    }
+
+    def build(filename, schema, make, rollup=None, **params):
+        """Write a dataset with make() unless its files for these inputs are in place or cached; returns its rows"""
+        key = dataset_key(filename, {**build_params, **params})
+        hit = None if args.force else cache.restore(filename, key)
+        if hit is not None:
+            rows, source = hit
+            print("  Unchanged since the last build, skipped" if source == 'unchanged'
+                  else f"  Unchanged, linked from the build cache {args.cache}")
+            if db is not None:  # the database is not part of the cached outputs; load the csv as it is
+                path = DATA_DIR / filename
+                write_blocks(csv_blocks(path), [SqliteSink(db, path, schema, SQLITE_INDEXES[filename], rollup)])
+            return rows
+        cache.clear(filename)  # unlinks rather than overwrites files shared with the cache
+        rows = make()
+        cache.store(filename, key, rows)
+        return rows
+
+    def build_hourly(dataset):
+        filename, _, schema, _, rollup, engine = dataset
+        return build(filename, schema, partial(hourly, *dataset), rollup, engine=engine, rollups=args.rollups,
+                     downsample=downsample_levels, labels=args.labels, index=args.index, scenario=scenario.digest)
+
+    def finish():
+        """Shut the workers down, close the metrics report and save/print the requested profiles"""
+        if executor is not None:
+            executor.shutdown()
+        if db is not None:
+            close_database(db)
+            print(f"\nDatabase written to {args.sqlite}")
+        if report is not None:
+            report.close()
+            print(f"\nMetrics written to {args.metrics}")
+        for phase in args.profile:
+            stats = profile_stats(phase)
+            if stats is None:
+                continue
+            stats.dump_stats(f"profile-{phase}.prof")
+            print(f"\nProfile of the {phase} phase (profile-{phase}.prof), top functions by own time:")
+            stats.sort_stats('tottime').print_stats(10)
+
+    if args.append:
+        print(f"Appending hourly data up to {end_date}...")
+        counts = []
+        for number, dataset in enumerate(hourly_datasets, 1):
+            print(f"\n{number}. Extending {dataset[0]}...")
+            cache.detach(dataset[0])
+            counts.append(hourly(*dataset))
+            print(f"  Appended {counts[-1]:,} records to {dataset[0]}")
+        finish()
+        print(f"\nAppended {sum(counts):,} records in {DATA_DIR}/")
+        return
+
+    print("Generating synthetic water utility datasets...")
+
+    # Dataset 1: Water Quality Monitoring (8 months of hourly data, ~5,760 records per station)
+    print("\n1. Generating water-quality-monitoring.csv...")
+    quality_count = build_hourly(hourly_datasets[0])
+    print(f"  Created water-quality-monitoring.csv with {quality_count:,} records")
+
+    # Dataset 2: Distribution Network Performance (8 months of hourly data)
+    print("\n2. Generating distribution-network-performance.csv...")
+    network_count = build_hourly(hourly_datasets[1])
+    print(f"  Created distribution-network-performance.csv with {network_count:,} records")
+
+    # Dataset 3: Energy Usage (8 months of hourly data)
+    print("\n3. Generating energy-usage.csv...")
+    energy_count = build_hourly(hourly_datasets[2])
+    print(f"  Created energy-usage.csv with {energy_count:,} records")
+
+    # Dataset 4: Maintenance Records (fleet sizes come from the dataset stream,
+    # each asset's history from its own stream; streamed in date order)
+    print("\n4. Generating maintenance-records.csv...")
+
+    def maintenance():
+        metrics = DatasetMetrics('maintenance-records.csv', report)
+        count = write_blocks(
+            row_blocks(maintenance_records(start=start_date, end=end_date, seed=args.seed), MAINTENANCE_SCHEMA,
+                       columnar, args.chunk_rows),
+            sinks('maintenance-records.csv', MAINTENANCE_SCHEMA), metrics
+        )
+        report_phases(metrics)
+        return count
+
+    maintenance_count = build('maintenance-records.csv', MAINTENANCE_SCHEMA, maintenance)
+    print(f"  Created maintenance-records.csv with {maintenance_count:,} records")
+
+    # Dataset 5: Customer Consumption (monthly data for 5000 x --scale customers
+    # over 8 months, sharded by customer id range)
+    print("\n5. Generating customer-consumption.csv...")
+    months = billing_months(start_date, end_date)
+
+    def consumption():
+        if args.engine == "numpy":
+            shards = customer_shards(num_customers, NUMPY_CUSTOMER_SHARD_SIZE)
+            tasks = [(first, n, months, args.seed, columnar, args.labels) for first, n in shards]
+            blocks = run_shards(generate_customer_consumption_numpy, tasks, executor, in_flight)
+        else:
+            shards = customer_shards(num_customers)
+            tasks = [(generate_customer_consumption, CONSUMPTION_SCHEMA, columnar, first, n, months, args.seed)
+                     for first, n in shards]
+            blocks = run_shards(render_labeled_shard if args.labels else render_shard, tasks, executor, in_flight)
+        metrics = DatasetMetrics('customer-consumption.csv', report)
+        count = write_blocks(
+            with_progress(zip([n for _, n in shards], blocks), "customers", max(500, num_customers // 10), metrics),
+            sinks('customer-consumption.csv', CONSUMPTION_SCHEMA,
+                  index=partial(CustomerIndexSink, schema=CONSUMPTION_SCHEMA, months=months)), metrics
+        )
+        report_phases(metrics)
+        return count
+
+    consumption_count = build('customer-consumption.csv', CONSUMPTION_SCHEMA, consumption, engine=args.engine,
+                              labels=args.labels, index=args.index, customers=num_customers)
+    print(f"  Created customer-consumption.csv with {consumption_count:,} records")
+
+    # Dataset 6: Customer Complaints (2000 complaints over 8 months)
+    print("\n6. Generating customer-complaints.csv...")
+
+    def complaints():
+        metrics = DatasetMetrics('customer-complaints.csv', report)
+        count = write_blocks(
+            row_blocks(complaint_records(2000, start_date, end_date, args.seed, num_customers), COMPLAINT_SCHEMA,
+                       columnar, args.chunk_rows),
+            sinks('customer-complaints.csv', COMPLAINT_SCHEMA) + joins('customer-complaints.csv', ComplaintIndexSink),
+            metrics
+        )
+        report_phases(metrics)
+        return count
+
+    complaint_count = build('customer-complaints.csv', COMPLAINT_SCHEMA, complaints, customers=num_customers,
+                            joins=np is not None)
+    print(f"  Created customer-complaints.csv with {complaint_count:,} records")
+
+    # Customer dimension (type, zone and nearest station of every customer
+    # consumption and complaints reference) and its join indexes into them
+    print("\n7. Generating customers.csv...")
+
+    def customers():
+        metrics = DatasetMetrics('customers.csv', report)
+        count = write_blocks(
+            row_blocks(customer_records(num_customers, args.seed), CUSTOMER_SCHEMA, columnar, args.chunk_rows),
+            sinks('customers.csv', CUSTOMER_SCHEMA) + joins('customers.csv', partial(JoinIndexSink, months=months)),
+            metrics
+        )
+        report_phases(metrics)
+        return count
+
+    customer_count = build('customers.csv', CUSTOMER_SCHEMA, customers, customers=num_customers,
+                           joins=np is not None)
+    print(f"  Created customers.csv with {customer_count:,} records")
+    if np is None:
+        print("  Join indexes (customers.joins.npz, customer-complaints.joins.npz) skipped: they require NumPy")
+
+    finish()
+
+    # ========================================================================
+    # Summary
+    # ========================================================================
+    total_count = (quality_count + network_count + energy_count + maintenance_count + consumption_count
+                   + complaint_count + customer_count)
+
+    print("\n" + "="*70)
+    print("DATASET GENERATION COMPLETE")
+    print("="*70)
+    print(f"\nGenerated 7 synthetic datasets in {DATA_DIR}/")
+    print(f"\n1. water-quality-monitoring.csv: {quality_count:,} records")
+    print(f"2. distribution-network-performance.csv: {network_count:,} records")
+    print(f"3. energy-usage.csv: {energy_count:,} records")
+    print(f"4. maintenance-records.csv: {maintenance_count:,} records")
+    print(f"5. customer-consumption.csv: {consumption_count:,} records")
+    print(f"6. customer-complaints.csv: {complaint_count:,} records")
+    print(f"7. customers.csv: {customer_count:,} records")
+    print(f"\nTotal records: {total_count:,}")
+    print("\nKey features embedded in datasets:")
+    print("- Realistic time-series patterns (hourly/daily/seasonal)")
+    print("- Quality exceedances and compliance issues")
+    print("- NRW/water loss problems (varying by zone)")
+    print("- Energy inefficiencies and peak demand issues")
+    print("- Asset failures and maintenance patterns")
+    print("- Customer anomalies (leaks, billing issues)")
+    print("- Geographic clustering of problems")
+    print("- Customer dimension with join indexes into consumption and complaints")
+    print("- Incident investigation scenarios (Aug 15 turbidity event)")
+    print("\nDatasets are ready for facilis.ai demo prompts!")
+
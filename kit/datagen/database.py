@@ -0,0 +1,125 @@
+"""
+Bulk-loaded SQLite output (--sqlite): every dataset as a table of one database
+
+Each dataset's table (water_quality_monitoring, ...) is dropped and
+reloaded while the csv streams: Block rows go in with executemany, in
+transactions of COMMIT_ROWS rows, on a WAL-journaled connection. Indexes
+are built once the table is loaded, and the hourly tables get
+<table>_daily and <table>_monthly views with the same columns as the
+--rollups csv files, computed by SQLite:
+
+    SELECT period, nrw_volume_percent FROM distribution_network_performance_monthly WHERE zone = 'Zone-C-South'
+
+Values are stored as csv renders them (empty fields as NULL); REAL columns
+convert them to numbers, ISO timestamps stay TEXT and sort as such. SQLite
+rounds ties away from zero, so a view value can differ from the rollup csv
+in its last digit.
+"""
+
+import csv
+import sqlite3
+from itertools import islice
+
+from .shards import Block
+
+# Rows inserted per transaction
+COMMIT_ROWS = 200000
+
+# Lines per Block when a table is loaded from an existing csv
+LOAD_ROWS = 20000
+
+SQL_TYPES = {'timestamp': 'TEXT', 'category': 'TEXT', 'string': 'TEXT', 'float': 'REAL', 'flag': 'TEXT'}
+
+
+def table_name(path):
+    """water_quality_monitoring for .../water-quality-monitoring.csv"""
+    return path.stem.replace('-', '_')
+
+
+def open_database(path):
+    """Connection for bulk loading: WAL journal, transactions managed by the sinks"""
+    db = sqlite3.connect(path, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("PRAGMA cache_size=-65536")  # 64 MiB, mostly for the index builds
+    return db
+
+
+def close_database(db):
+    """Refresh the planner statistics and fold the WAL back into the database file"""
+    db.execute("ANALYZE")
+    db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    db.close()
+
+
+def rollup_view(table, rollup, granularity):
+    """CREATE VIEW statement of a daily or monthly rollup with the RollupSink csv columns"""
+    period = f"substr(timestamp, 1, {10 if granularity == 'daily' else 7})"
+    columns = [f"{period} AS period", rollup.entity, "COUNT(*) AS readings"]
+    for column in rollup.stats:
+        columns += [
+            f"COUNT({column}) AS {column}_count", f"ROUND(TOTAL({column}), 3) AS {column}_sum",
+            f"ROUND(MIN({column}), 3) AS {column}_min", f"ROUND(MAX({column}), 3) AS {column}_max",
+            f"ROUND(AVG({column}), 4) AS {column}_avg",
+        ]
+    for flag in rollup.rates:
+        columns += [f"SUM({flag} = 'Yes') AS {flag}_yes",
+                    f"ROUND(100.0 * SUM({flag} = 'Yes') / COUNT(*), 2) AS {flag}_rate"]
+    for name, (numerator, denominator) in rollup.ratios.items():
+        columns.append(f"ROUND(100 * TOTAL({numerator}) / NULLIF(TOTAL({denominator}), 0), 2) AS {name}")
+    if rollup.split is not None:
+        category, values, summed = rollup.split
+        for value in values:
+            for column in summed:
+                name = f"{column}_{value.lower().replace('-', '_')}"
+                columns.append(f"ROUND(TOTAL(CASE WHEN {category} = '{value}' THEN {column} END), 2) AS {name}")
+    select = ",\n    ".join(columns)
+    return (f"CREATE VIEW {table}_{granularity} AS SELECT\n    {select}\n"
+            f"FROM {table} GROUP BY period, {rollup.entity} ORDER BY period, {rollup.entity}")
+
+
+class SqliteSink:
+    """Loads Block csv rows into a dataset's table, then indexes it and creates its rollup views"""
+
+    def __init__(self, db, path, schema, index, rollup=None):
+        self.db = db
+        self.table = table_name(path)
+        self.columns = list(schema)
+        self.index = index
+        self.rollup = rollup
+        db.execute(f"DROP TABLE IF EXISTS {self.table}")
+        for granularity in ('daily', 'monthly'):
+            db.execute(f"DROP VIEW IF EXISTS {self.table}_{granularity}")
+        db.execute(f"CREATE TABLE {self.table} ("
+                   + ", ".join(f"{name} {SQL_TYPES[kind]}" for name, kind in schema.items()) + ")")
+        self.insert = f"INSERT INTO {self.table} VALUES ({', '.join('?' * len(self.columns))})"
+        self.pending = 0  # rows in the open transaction
+        db.execute("BEGIN")
+
+    def write(self, block):
+        lines = block.text.split('\r\n')
+        lines.pop()
+        self.db.executemany(self.insert, ([value or None for value in row] for row in csv.reader(lines)))
+        self.pending += block.rows
+        if self.pending >= COMMIT_ROWS:
+            self.db.execute("COMMIT")
+            self.db.execute("BEGIN")
+            self.pending = 0
+
+    def close(self):
+        self.db.execute("COMMIT")
+        self.db.execute(f"CREATE INDEX {self.table}_{'_'.join(self.index)} ON {self.table} ({', '.join(self.index)})")
+        if self.rollup is not None:
+            for granularity in ('daily', 'monthly'):
+                self.db.execute(rollup_view(self.table, self.rollup, granularity))
+
+
+def csv_blocks(path, chunk_rows=LOAD_ROWS):
+    """Blocks of an existing csv file's rows, for loading datasets that were not regenerated"""
+    with open(path, newline='') as f:
+        next(f)  # header
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                return
+            yield Block(len(lines), ''.join(lines), None)
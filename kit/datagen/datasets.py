@@ -0,0 +1,878 @@
+"""
+Row generators for the synthetic water utility datasets: six fact datasets
+plus the customer dimension consumption and complaints reference
+
+Each dataset is exposed as a lazy iterator of row dicts (iter_water_quality,
+iter_network_performance, ...). Nothing is generated until rows are pulled,
+and time series are produced one week-long shard at a time, so taking the
+first rows with itertools.islice only pays for the first shard.
+
+Underneath, the generators yield plain tuples in their schema's column order
+(the csv driver hands them to csv.writer as they are); the iter_* functions
+turn them into dicts with as_dicts().
+"""
+
+import datetime
+import heapq
+import random
+from collections import namedtuple
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
+
+from .scenarios import DEFAULT_SCENARIO, Scenario
+from .shards import customer_shards, derive_seed, time_shards
+from .timeaxis import HOUR, time_axis
+
+# Set random seed for reproducibility
+SEED = 42
+
+start_date = datetime.datetime(2024, 1, 1, 0, 0)
+
+# The demo window: 8 months (240 days) of data from start_date
+DEFAULT_DAYS = 240
+
+# Daily/monthly rollup of an hourly dataset per entity: `stats` columns get
+# count/sum/min/max/avg, `rates` flags get yes-counts and % rates, `ratios`
+# are 100 * sum(numerator) / sum(denominator), and `split` sums columns per
+# value of a category column: (category column, values, summed columns).
+Rollup = namedtuple('Rollup', 'entity stats rates ratios split', defaults=((), (), {}, None))
+
+# 'Yes'/'No' flag text indexed by a bool
+FLAG = ('No', 'Yes')
+
+# The hourly datasets scale past their built-in entities with replicas:
+# "<name>/2", "<name>/3", ... share <name>'s characteristics (a station's
+# chlorine level, a zone's base flow, a facility's kind) but draw from their
+# own seed streams, and scenario rules only name the built-in entities.
+REPLICA = '/'
+
+
+def replicas(entities, count):
+    """The first `count` of entities, then replicas of each of them in the same order"""
+    return [
+        entities[i % len(entities)] + (f"{REPLICA}{i // len(entities) + 1}" if i >= len(entities) else '')
+        for i in range(count)
+    ]
+
+
+def entity_number(entities, entity):
+    """1-based position in `entities` of an entity, or of the one it replicates"""
+    return entities.index(entity.split(REPLICA, 1)[0]) + 1
+
+
+def as_dicts(rows, schema):
+    """Lazily turn tuple rows into dicts keyed by the schema's columns"""
+    columns = tuple(schema)
+    for row in rows:
+        yield dict(zip(columns, row))
+
+
+# ============================================================================
+# Dataset 1: Water Quality Monitoring
+# ============================================================================
+monitoring_stations = [
+    "Station-01-Downtown", "Station-02-Industrial", "Station-03-Residential-North",
+    "Station-04-Residential-South", "Station-05-Coastal", "Station-06-Airport",
+    "Station-07-Hospital", "Station-08-University", "Station-09-Mall",
+    "Station-10-Port", "Station-11-Suburb-East", "Station-12-Suburb-West"
+]
+
+QUALITY_SCHEMA = {
+    'timestamp': 'timestamp', 'station': 'category', 'chlorine_mg_l': 'float', 'ph': 'float',
+    'turbidity_ntu': 'float', 'temperature_c': 'float', 'conductivity_us_cm': 'float',
+    'chlorine_compliant': 'flag', 'ph_compliant': 'flag', 'turbidity_compliant': 'flag', 'overall_compliant': 'flag'
+}
+
+QUALITY_ROLLUP = Rollup(
+    entity='station',
+    stats=['chlorine_mg_l', 'ph', 'turbidity_ntu', 'temperature_c', 'conductivity_us_cm'],
+    rates=['chlorine_compliant', 'ph_compliant', 'turbidity_compliant', 'overall_compliant'],
+)
+
+# Base values scenario rules can act on, in the generator's order
+QUALITY_SIGNALS = ('chlorine', 'ph', 'turbidity', 'temperature', 'conductivity')
+
+
+def generate_water_quality(stations, start, first_step, num_steps, seed, freq=HOUR, scenario=None, labels=None):
+    """Yield water quality readings, one QUALITY_SCHEMA tuple per station per time step
+
+    A `labels` list receives a (timestamp, station, signal, rule) tuple for
+    every scenario rule that changed a reading.
+    """
+    rngs = [random.Random(derive_seed(seed, 'water-quality', station, first_step)) for station in stations]
+    station_ids = [entity_number(monitoring_stations, station) for station in stations]
+    ticks = time_axis(start, first_step, num_steps, freq)
+    plans = (scenario or load_scenario()).plan('water-quality', stations, ticks)
+
+    for tick, plan in zip(ticks, plans):
+        for station_id, station, rng, rules in zip(station_ids, stations, rngs, plan):
+            # Base values with station-specific characteristics
+            base_chlorine = 1.2 + (station_id * 0.1) + rng.gauss(0, 0.15)
+            base_ph = 7.3 + rng.gauss(0, 0.15)
+            base_turbidity = 0.5 + rng.gauss(0, 0.3)
+            base_temp = 22 + 5 * abs(rng.gauss(0, 1))
+            base_conductivity = 450 + rng.gauss(0, 30)
+
+            # Add time-of-day patterns
+            hour = tick.hour
+            if 6 <= hour <= 9:  # Morning rush
+                base_chlorine -= 0.1
+                base_turbidity += 0.2
+            elif 18 <= hour <= 21:  # Evening rush
+                base_chlorine -= 0.15
+                base_turbidity += 0.3
+
+            # Add day-of-week patterns (lower usage on Friday/Saturday)
+            if tick.weekend:
+                base_chlorine += 0.1
+                base_turbidity -= 0.1
+
+            # Add seasonal patterns (summer = higher temp, lower quality)
+            if tick.summer:
+                base_temp += 5
+                base_turbidity += 0.3
+                base_conductivity += 20
+
+            # Inject realistic quality issues (Station 12 chronic low chlorine,
+            # Station 2 turbidity spikes, the Aug 15 events, ...: see scenarios.json)
+            if rules:
+                values = [base_chlorine, base_ph, base_turbidity, base_temp, base_conductivity]
+                for rule in rules:
+                    if rule.apply(values, rng, tick) and labels is not None:
+                        labels.append((tick.text, station, rule.signal, rule.name))
+                base_chlorine, base_ph, base_turbidity, base_temp, base_conductivity = values
+
+            # Ensure realistic ranges
+            chlorine = max(0.0, min(5.0, base_chlorine))
+            ph = max(6.0, min(9.0, base_ph))
+            turbidity = max(0.0, min(20.0, base_turbidity))
+            temperature = max(10.0, min(35.0, base_temp))
+            conductivity = max(200.0, min(1000.0, base_conductivity))
+
+            # Compliance flags
+            chlorine_ok = 0.2 <= chlorine <= 4.0
+            ph_ok = 6.5 <= ph <= 8.5
+            turbidity_ok = turbidity < 5.0
+
+            yield (
+                tick.text, station, round(chlorine, 3), round(ph, 2), round(turbidity, 2), round(temperature, 1),
+                round(conductivity, 1), FLAG[chlorine_ok], FLAG[ph_ok], FLAG[turbidity_ok],
+                FLAG[chlorine_ok and ph_ok and turbidity_ok],
+            )
+
+
+# ============================================================================
+# Dataset 2: Distribution Network Performance
+# ============================================================================
+pressure_zones = [
+    "Zone-A-Downtown", "Zone-B-North", "Zone-C-South", "Zone-D-East",
+    "Zone-E-West", "Zone-F-Industrial", "Zone-G-Coastal", "Zone-H-Hills"
+]
+
+NETWORK_SCHEMA = {
+    'timestamp': 'timestamp', 'zone': 'category', 'flow_rate_gpm': 'float', 'pressure_psi': 'float',
+    'billed_consumption_gpm': 'float', 'nrw_gpm': 'float', 'nrw_percent': 'float', 'pressure_compliant': 'flag'
+}
+
+NETWORK_ROLLUP = Rollup(
+    entity='zone',
+    stats=['flow_rate_gpm', 'pressure_psi', 'billed_consumption_gpm', 'nrw_gpm', 'nrw_percent'],
+    rates=['pressure_compliant'],
+    ratios={'nrw_volume_percent': ('nrw_gpm', 'flow_rate_gpm')},
+)
+
+
+# Base values scenario rules can act on, in the generator's order
+NETWORK_SIGNALS = ('flow', 'pressure', 'consumption')
+
+
+def generate_network_performance(zones, start, first_step, num_steps, seed, freq=HOUR, scenario=None, labels=None):
+    """Yield distribution network readings, one NETWORK_SCHEMA tuple per zone per time step
+
+    A `labels` list receives a (timestamp, zone, signal, rule) tuple for every
+    scenario rule that changed a reading.
+    """
+    rngs = [random.Random(derive_seed(seed, 'network-performance', zone, first_step)) for zone in zones]
+    zone_ids = [entity_number(pressure_zones, zone) for zone in zones]
+    ticks = time_axis(start, first_step, num_steps, freq)
+    plans = (scenario or load_scenario()).plan('network-performance', zones, ticks)
+
+    for tick, plan in zip(ticks, plans):
+        for zone_id, zone, rng, rules in zip(zone_ids, zones, rngs, plan):
+            # Base values
+            base_flow = 500 + (zone_id * 100) + rng.gauss(0, 50)
+            base_pressure = 55 + rng.gauss(0, 5)
+            base_consumption = base_flow * 0.75  # Assume 25% NRW average
+
+            # Time-of-day patterns
+            hour = tick.hour
+            if 6 <= hour <= 9:  # Morning peak
+                base_flow *= 1.4
+                base_consumption *= 1.5
+                base_pressure -= 8
+            elif 18 <= hour <= 21:  # Evening peak
+                base_flow *= 1.3
+                base_consumption *= 1.4
+                base_pressure -= 6
+            elif 0 <= hour <= 5:  # Minimum night flow
+                base_flow *= 0.4
+                base_consumption *= 0.3
+                base_pressure += 5
+
+            # Day-of-week patterns
+            if tick.weekend:  # Weekend
+                base_flow *= 0.85
+                base_consumption *= 0.80
+
+            # Seasonal patterns
+            if tick.summer:  # Summer - higher consumption
+                base_flow *= 1.25
+                base_consumption *= 1.30
+
+            # Zone-specific NRW, the Zone-C-South leak and pressure issues (see scenarios.json)
+            if rules:
+                values = [base_flow, base_pressure, base_consumption]
+                for rule in rules:
+                    if rule.apply(values, rng, tick) and labels is not None:
+                        labels.append((tick.text, zone, rule.signal, rule.name))
+                base_flow, base_pressure, base_consumption = values
+
+            # Ensure realistic ranges
+            flow_rate = max(0, base_flow)
+            pressure = max(20, min(100, base_pressure))
+            consumption = max(0, min(flow_rate, base_consumption))
+            nrw_pct = ((flow_rate - consumption) / flow_rate * 100) if flow_rate > 0 else 0
+
+            yield (
+                tick.text, zone, round(flow_rate, 1), round(pressure, 1), round(consumption, 1),
+                round(flow_rate - consumption, 1), round(nrw_pct, 2), FLAG[40 <= pressure <= 80],
+            )
+
+
+# ============================================================================
+# Dataset 3: Energy Usage
+# ============================================================================
+facilities = [
+    "Main-Treatment-Plant", "North-Pumping-Station", "South-Pumping-Station",
+    "Desalination-Plant", "Booster-Station-1", "Booster-Station-2",
+    "Admin-Building", "Laboratory", "Operations-Center"
+]
+
+ENERGY_SCHEMA = {
+    'timestamp': 'timestamp', 'facility': 'category', 'energy_consumption_kwh': 'float', 'energy_cost_usd': 'float',
+    'energy_rate_per_kwh': 'float', 'rate_period': 'category', 'water_produced_gallons': 'float',
+    'energy_efficiency_gal_per_kwh': 'float'
+}
+
+ENERGY_ROLLUP = Rollup(
+    entity='facility',
+    stats=['energy_consumption_kwh', 'energy_cost_usd', 'water_produced_gallons', 'energy_efficiency_gal_per_kwh'],
+    split=('rate_period', ['Peak', 'Mid', 'Off-Peak'], ['energy_consumption_kwh', 'energy_cost_usd']),
+)
+
+
+# Base values scenario rules can act on, in the generator's order
+ENERGY_SIGNALS = ('energy',)
+
+
+def generate_energy_usage(facility_names, start, first_step, num_steps, seed, freq=HOUR, scenario=None,
+                          labels=None):
+    """Yield energy readings, one ENERGY_SCHEMA tuple per facility per time step
+
+    A `labels` list receives a (timestamp, facility, signal, rule) tuple for
+    every scenario rule that changed a reading.
+    """
+    rngs = [random.Random(derive_seed(seed, 'energy-usage', facility, first_step)) for facility in facility_names]
+    ticks = time_axis(start, first_step, num_steps, freq)
+    plans = (scenario or load_scenario()).plan('energy-usage', facility_names, ticks)
+
+    for tick, plan in zip(ticks, plans):
+        for facility, rng, rules in zip(facility_names, rngs, plan):
+            kind = facility.split(REPLICA, 1)[0]  # a replica runs like the facility it copies
+
+            # Base energy consumption (kW)
+            if "Treatment" in facility or "Desalination" in facility:
+                base_energy = 1200 + rng.gauss(0, 80)
+            elif "Pumping" in facility or "Booster" in facility:
+                base_energy = 450 + rng.gauss(0, 40)
+            else:  # Admin buildings
+                base_energy = 25 + rng.gauss(0, 5)
+
+            # Time-of-day patterns (follows water demand)
+            hour = tick.hour
+            if 6 <= hour <= 9:  # Morning peak
+                base_energy *= 1.5
+            elif 18 <= hour <= 21:  # Evening peak
+                base_energy *= 1.4
+            elif 0 <= hour <= 5:  # Night
+                base_energy *= 0.6
+
+            # Admin buildings have different patterns
+            if kind in ["Admin-Building", "Laboratory", "Operations-Center"]:
+                if 8 <= hour <= 17:  # Business hours
+                    base_energy *= 3.0
+                else:
+                    base_energy *= 0.3
+
+            # Weekend patterns
+            if tick.weekend:
+                if kind in ["Admin-Building", "Laboratory"]:
+                    base_energy *= 0.2
+                else:
+                    base_energy *= 0.85
+
+            # Seasonal patterns (summer cooling)
+            if tick.summer:
+                if kind in ["Admin-Building", "Laboratory", "Operations-Center"]:
+                    base_energy *= 1.8  # AC load
+                else:
+                    base_energy *= 1.15  # Higher production
+
+            # Energy rate (time-of-use)
+            energy_rate = tick.energy_rate
+
+            # Inefficiency issues (North-Pumping-Station, desalination drift: see scenarios.json)
+            if rules:
+                values = [base_energy]
+                for rule in rules:
+                    if rule.apply(values, rng, tick) and labels is not None:
+                        labels.append((tick.text, facility, rule.signal, rule.name))
+                base_energy, = values
+
+            # Calculate metrics
+            energy_kwh = max(0, base_energy)
+            energy_cost = energy_kwh * energy_rate
+
+            # Estimate water production for production facilities
+            if "Treatment" in facility or "Desalination" in facility:
+                water_produced = energy_kwh * 0.5  # gallons per kWh
+            elif "Pumping" in facility or "Booster" in facility:
+                water_produced = energy_kwh * 1.2
+            else:
+                water_produced = 0
+
+            energy_efficiency = water_produced / energy_kwh if energy_kwh > 0 and water_produced > 0 else 0
+
+            yield (
+                tick.text, facility, round(energy_kwh, 2), round(energy_cost, 2), round(energy_rate, 3),
+                tick.rate_period,
+                round(water_produced, 1) if water_produced > 0 else None,
+                round(energy_efficiency, 3) if energy_efficiency > 0 else None,
+            )
+
+
+# ============================================================================
+# Dataset 4: Maintenance Records
+# ============================================================================
+asset_types = ["Pump", "Valve", "Motor", "Pipe-Section", "Chlorinator", "Filter", "Sensor", "Meter"]
+maintenance_types = ["Preventive", "Corrective", "Emergency", "Inspection", "Calibration"]
+failure_modes = ["Bearing-Failure", "Seal-Leak", "Corrosion", "Electrical-Fault", "Blockage",
+                 "Wear", "Calibration-Drift", "Software-Error", "Mechanical-Break"]
+
+MAINTENANCE_SCHEMA = {
+    'asset_id': 'category', 'asset_type': 'category', 'install_date': 'timestamp', 'age_years': 'float',
+    'maintenance_date': 'timestamp', 'maintenance_type': 'category', 'failure_mode': 'category',
+    'downtime_hours': 'float', 'cost_usd': 'float', 'parts_replaced': 'flag', 'priority': 'category',
+    'completed': 'category'
+}
+
+# Sort key of the maintenance records (ISO dates sort as strings)
+maintenance_date = itemgetter(list(MAINTENANCE_SCHEMA).index('maintenance_date'))
+
+
+def generate_asset_events(asset_type, asset_number, start, end, seed):
+    """Lazily yield one asset's completed maintenance events (MAINTENANCE_SCHEMA tuples), oldest first
+
+    Each asset draws from its own seed stream, so its history does not depend
+    on how far the other assets' generators have been advanced.
+    """
+    rng = random.Random(derive_seed(seed, 'maintenance-records', asset_type, asset_number))
+    asset_id = f"{asset_type}-{asset_number:04d}"
+
+    # Asset characteristics
+    install_date = start - datetime.timedelta(days=rng.randint(365, 3650))
+    age_years = (start - install_date).days / 365
+    install_text = install_date.date().isoformat()
+
+    # Generate maintenance history
+    num_events = rng.randint(3, 20)
+    last_maintenance = install_date
+
+    for event_num in range(num_events):
+        # Time since last maintenance
+        days_since = rng.randint(30, 180)
+        event_date = last_maintenance + datetime.timedelta(days=days_since)
+
+        if event_date > end:
+            break
+
+        # Maintenance type probabilities
+        if days_since < 60:
+            maint_type = rng.choices(maintenance_types, weights=[10, 40, 40, 5, 5])[0]
+        elif days_since < 120:
+            maint_type = rng.choices(maintenance_types, weights=[60, 30, 5, 3, 2])[0]
+        else:
+            maint_type = rng.choices(maintenance_types, weights=[70, 20, 5, 3, 2])[0]
+
+        # Older assets have more issues
+        if age_years > 10:
+            if rng.random() < 0.3:
+                maint_type = "Corrective"
+            if rng.random() < 0.1:
+                maint_type = "Emergency"
+
+        # Failure mode (if applicable)
+        failure_mode = rng.choice(failure_modes) if maint_type in ["Corrective", "Emergency"] else None
+
+        # Downtime
+        if maint_type == "Emergency":
+            downtime = rng.uniform(4, 48)
+        elif maint_type == "Corrective":
+            downtime = rng.uniform(1, 12)
+        elif maint_type == "Preventive":
+            downtime = rng.uniform(0.5, 4)
+        else:
+            downtime = rng.uniform(0.25, 2)
+
+        # Cost
+        if maint_type == "Emergency":
+            cost = rng.uniform(5000, 25000)
+        elif maint_type == "Corrective":
+            cost = rng.uniform(1000, 8000)
+        elif maint_type == "Preventive":
+            cost = rng.uniform(200, 1500)
+        else:
+            cost = rng.uniform(100, 500)
+
+        # Parts replaced
+        parts_replaced = rng.choice([True, False]) if maint_type in ["Corrective", "Emergency"] else False
+
+        yield (
+            asset_id, asset_type, install_text, round(age_years + (event_date - start).days / 365, 1),
+            event_date.date().isoformat(), maint_type, failure_mode, round(downtime, 1), round(cost, 2),
+            FLAG[parts_replaced],
+            'Critical' if maint_type == "Emergency" else ('High' if maint_type == "Corrective" else 'Normal'),
+            'Yes',
+        )
+
+        last_maintenance = event_date
+
+
+def generate_pending_maintenance(types, num_assets, end, rng):
+    """Return preventive work orders scheduled 10-40 days after `end`"""
+    pending = []
+    for i in range(50):
+        asset_id = f"{rng.choice(types)}-{rng.randint(1, num_assets + 1):04d}"
+        scheduled_date = end + datetime.timedelta(days=rng.randint(10, 40))
+
+        pending.append((
+            asset_id, asset_id.split('-')[0], None, None, scheduled_date.date().isoformat(), 'Preventive', None,
+            None, None, None, 'Normal', 'Scheduled',
+        ))
+    return pending
+
+
+# ============================================================================
+# Customer Dimension (customers.csv, referenced by Datasets 5 and 6)
+# ============================================================================
+customer_types = ["Residential", "Commercial", "Industrial", "Government"]
+
+CUSTOMER_SCHEMA = {
+    'customer_id': 'string', 'customer_type': 'category', 'zone': 'category', 'nearest_station': 'category'
+}
+
+# A customer's type, pressure zone and nearest monitoring station
+CustomerProfile = namedtuple('CustomerProfile', 'customer_type zone nearest_station')
+
+# Customers drawn from one seed stream: a profile only depends on the
+# customer's id (and the seed), so any one can be looked up on its own
+PROFILE_BLOCK = 100
+
+# Customer mix in customer_types order (cumulative weights)
+TYPE_WEIGHTS = list(accumulate([70, 20, 7, 3]))
+
+# Customers per zone follow the zone's base flow (500 + 100 x zone number)
+ZONE_WEIGHTS = list(accumulate(500 + 100 * number for number in range(1, len(pressure_zones) + 1)))
+
+# Monitoring stations inside each pressure zone; a customer's nearest station is one of its zone's
+ZONE_STATIONS = {
+    "Zone-A-Downtown": ["Station-01-Downtown", "Station-07-Hospital", "Station-09-Mall"],
+    "Zone-B-North": ["Station-03-Residential-North", "Station-08-University"],
+    "Zone-C-South": ["Station-04-Residential-South"],
+    "Zone-D-East": ["Station-06-Airport", "Station-11-Suburb-East"],
+    "Zone-E-West": ["Station-12-Suburb-West"],
+    "Zone-F-Industrial": ["Station-02-Industrial", "Station-10-Port"],
+    "Zone-G-Coastal": ["Station-05-Coastal"],
+    "Zone-H-Hills": ["Station-12-Suburb-West"],
+}
+
+
+@lru_cache(maxsize=4096)
+def profile_block(seed, first_customer):
+    """Profiles of the PROFILE_BLOCK customers from first_customer on"""
+    rng = random.Random(derive_seed(seed, 'customers', first_customer))
+    kinds = rng.choices(customer_types, cum_weights=TYPE_WEIGHTS, k=PROFILE_BLOCK)
+    zones = rng.choices(pressure_zones, cum_weights=ZONE_WEIGHTS, k=PROFILE_BLOCK)
+    return tuple(CustomerProfile(kind, zone, rng.choice(ZONE_STATIONS[zone])) for kind, zone in zip(kinds, zones))
+
+
+def customer_profile(customer, seed):
+    """Profile of customer number `customer` (CUST-00001 is 1)"""
+    first = (customer - 1) // PROFILE_BLOCK * PROFILE_BLOCK + 1
+    return profile_block(seed, first)[customer - first]
+
+
+def customer_profiles(first_customer, num_customers, seed):
+    """Profiles of customers first_customer .. first_customer + num_customers - 1"""
+    first = (first_customer - 1) // PROFILE_BLOCK * PROFILE_BLOCK + 1
+    profiles = []
+    for block in range(first, first_customer + num_customers, PROFILE_BLOCK):
+        profiles += profile_block(seed, block)
+    return profiles[first_customer - first:first_customer - first + num_customers]
+
+
+def customer_records(num_customers=5000, seed=SEED):
+    """Lazily yield the customer dimension (CUSTOMER_SCHEMA tuples) of customers 1..num_customers"""
+    for first_customer, count in customer_shards(num_customers):
+        for customer, profile in enumerate(customer_profiles(first_customer, count, seed), first_customer):
+            yield (f"CUST-{customer:05d}",) + profile
+
+
+# ============================================================================
+# Dataset 5: Customer Consumption
+# ============================================================================
+
+# Label names of the anomalies injected into the billing records, in the order they apply
+CONSUMPTION_ANOMALIES = ('residential-leak', 'declining-consumption')
+
+CONSUMPTION_SCHEMA = {
+    'customer_id': 'string', 'customer_type': 'category', 'billing_date': 'timestamp', 'billing_period': 'category',
+    'consumption_gallons': 'float', 'bill_amount_usd': 'float', 'payment_status': 'category',
+    'rate_per_1000_gal': 'float'
+}
+
+
+def generate_customer_consumption(first_customer, num_customers, months, seed, labels=None):
+    """Yield monthly billing records (CONSUMPTION_SCHEMA tuples) customer by customer for (year, month) periods
+
+    A `labels` list receives a (billing_date, customer_id, 'consumption',
+    CONSUMPTION_ANOMALIES name) tuple for every injected anomaly.
+    """
+    rng = random.Random(derive_seed(seed, 'customer-consumption', first_customer))
+    periods = [(month, f"{year}-{month:02d}") for year, month in months]
+    profiles = customer_profiles(first_customer, num_customers, seed)
+
+    for customer_id, profile in enumerate(profiles, first_customer):
+        customer = f"CUST-{customer_id:05d}"
+        customer_type = profile.customer_type  # from the customer dimension
+
+        # Base consumption by type (gallons/month)
+        if customer_type == "Residential":
+            base_consumption = rng.uniform(3000, 12000)
+        elif customer_type == "Commercial":
+            base_consumption = rng.uniform(15000, 50000)
+        elif customer_type == "Industrial":
+            base_consumption = rng.uniform(100000, 500000)
+        else:  # Government
+            base_consumption = rng.uniform(20000, 80000)
+
+        for month, period in periods:
+            billing_day = rng.randint(1, 28)
+
+            # Monthly consumption with variations
+            consumption = base_consumption * rng.uniform(0.8, 1.2)
+
+            # Seasonal adjustment (summer higher)
+            if month in [6, 7, 8]:
+                consumption *= rng.uniform(1.3, 1.6)
+
+            # Inject anomalies
+            # 1. Some residential customers have leaks
+            if customer_type == "Residential" and rng.random() < 0.03:
+                consumption *= rng.uniform(2.5, 5.0)  # Major leak
+                if labels is not None:
+                    labels.append((f"{period}-{billing_day:02d}", customer, 'consumption', CONSUMPTION_ANOMALIES[0]))
+
+            # 2. Some customers have declining consumption (conservation/vacancy)
+            if rng.random() < 0.05:
+                consumption *= rng.uniform(0.2, 0.5)
+                if labels is not None:
+                    labels.append((f"{period}-{billing_day:02d}", customer, 'consumption', CONSUMPTION_ANOMALIES[1]))
+
+            # Calculate bill
+            if customer_type == "Residential":
+                rate = 2.50  # $ per 1000 gallons
+            elif customer_type == "Commercial":
+                rate = 3.00
+            elif customer_type == "Industrial":
+                rate = 2.80
+            else:
+                rate = 2.20
+
+            bill_amount = (consumption / 1000) * rate + 15.00  # Base fee
+
+            # Payment status
+            payment_status = rng.choices(
+                ["Paid", "Pending", "Overdue"],
+                weights=[85, 10, 5]
+            )[0]
+
+            yield (
+                customer, customer_type, f"{period}-{billing_day:02d}", period, round(consumption, 0),
+                round(bill_amount, 2), payment_status, rate,
+            )
+
+
+# ============================================================================
+# Dataset 6: Customer Complaints
+# ============================================================================
+complaint_types = [
+    "High-Bill", "Low-Pressure", "Water-Quality", "Billing-Error", "Leak-Reported",
+    "Service-Interruption", "Meter-Issue", "Customer-Service", "Connection-Request", "Other"
+]
+
+priorities = ["Low", "Medium", "High", "Critical"]
+statuses = ["Open", "In-Progress", "Resolved", "Closed"]
+
+COMPLAINT_SCHEMA = {
+    'complaint_id': 'string', 'customer_id': 'string', 'complaint_date': 'timestamp', 'complaint_type': 'category',
+    'priority': 'category', 'status': 'category', 'location': 'category', 'resolution_date': 'timestamp',
+    'resolution_hours': 'float', 'customer_satisfied': 'category'
+}
+
+# Sort key of the complaint tickets
+complaint_date_of = itemgetter(list(COMPLAINT_SCHEMA).index('complaint_date'))
+
+# Customers drawn at most when looking for one in a complaint cluster
+CLUSTER_TRIES = 50
+
+
+def clustered_customer(rng, num_customers, seed, wanted):
+    """A customer number whose profile satisfies wanted(profile), or the last one drawn after CLUSTER_TRIES"""
+    for _ in range(CLUSTER_TRIES):
+        customer = rng.randint(1, num_customers)
+        if wanted(customer_profile(customer, seed)):
+            break
+    return customer
+
+
+def generate_complaints(num_complaints, start, end, seed, num_customers=5000):
+    """Return complaint tickets (COMPLAINT_SCHEMA tuples) sorted by complaint date"""
+    rng = random.Random(derive_seed(seed, 'customer-complaints'))
+    complaint_data = []
+
+    for complaint_id in range(1, num_complaints + 1):
+        # Complaint date
+        days_offset = rng.randint(0, (end - start).days)
+        complaint_date = start + datetime.timedelta(days=days_offset)
+
+        # Complaint type
+        complaint_type = rng.choices(
+            complaint_types,
+            weights=[25, 15, 12, 10, 8, 10, 5, 5, 7, 3]
+        )[0]
+
+        # Priority
+        if complaint_type in ["Service-Interruption", "Water-Quality"]:
+            priority = rng.choices(priorities, weights=[5, 20, 40, 35])[0]
+        elif complaint_type in ["High-Bill", "Low-Pressure", "Leak-Reported"]:
+            priority = rng.choices(priorities, weights=[10, 40, 40, 10])[0]
+        else:
+            priority = rng.choices(priorities, weights=[40, 40, 15, 5])[0]
+
+        # Status based on age
+        age_days = (end - complaint_date).days
+        if age_days < 2:
+            status = "Open"
+        elif age_days < 5:
+            status = rng.choice(["Open", "In-Progress"])
+        elif age_days < 15:
+            status = rng.choice(["In-Progress", "Resolved"])
+        else:
+            status = rng.choices(statuses, weights=[2, 5, 20, 73])[0]
+
+        # Resolution time
+        if status in ["Resolved", "Closed"]:
+            if priority == "Critical":
+                resolution_hours = rng.uniform(1, 12)
+            elif priority == "High":
+                resolution_hours = rng.uniform(4, 48)
+            elif priority == "Medium":
+                resolution_hours = rng.uniform(24, 120)
+            else:
+                resolution_hours = rng.uniform(48, 240)
+
+            resolution_date = complaint_date + datetime.timedelta(hours=resolution_hours)
+        else:
+            resolution_hours = None
+            resolution_date = None
+
+        # Customer info, with geographic clustering of complaints
+        if complaint_type == "Low-Pressure" and rng.random() < 0.4:
+            customer = clustered_customer(  # Pressure issues zone
+                rng, num_customers, seed, lambda profile: profile.zone == "Zone-H-Hills"
+            )
+        elif complaint_type == "Water-Quality" and rng.random() < 0.3:
+            customer = clustered_customer(
+                rng, num_customers, seed,
+                lambda profile: profile.nearest_station in ("Station-02-Industrial", "Station-12-Suburb-West")
+            )
+        else:
+            customer = rng.randint(1, num_customers)
+        customer_id = f"CUST-{customer:05d}"
+
+        # Location: the customer's nearest station for water quality, its pressure zone otherwise
+        profile = customer_profile(customer, seed)
+        location = profile.nearest_station if complaint_type == "Water-Quality" else profile.zone
+
+        complaint_data.append((
+            f"COMP-{complaint_id:05d}", customer_id, complaint_date.isoformat(' ', 'seconds'), complaint_type,
+            priority, status, location,
+            resolution_date.isoformat(' ', 'seconds') if resolution_date else None,
+            round(resolution_hours, 1) if resolution_hours else None,
+            rng.choice(['Yes', 'No', 'Pending']) if status in ["Resolved", "Closed"] else None,
+        ))
+
+    # Sort by date
+    complaint_data.sort(key=complaint_date_of)
+    return complaint_data
+
+
+# ============================================================================
+# Scenarios
+# ============================================================================
+# Datasets scenario rules can target: name -> (entities, signals)
+SCENARIO_DATASETS = {
+    'water-quality': (monitoring_stations, QUALITY_SIGNALS),
+    'network-performance': (pressure_zones, NETWORK_SIGNALS),
+    'energy-usage': (facilities, ENERGY_SIGNALS),
+}
+
+
+@lru_cache(maxsize=None)
+def load_scenario(path=DEFAULT_SCENARIO):
+    """Compile a scenario file; the default one holds the demo's built-in issues"""
+    return Scenario.from_file(path, SCENARIO_DATASETS)
+
+
+# ============================================================================
+# Lazy dataset iterators
+# ============================================================================
+def default_end(start, end=None):
+    """End of the generated window: `end` if given, else DEFAULT_DAYS after start"""
+    return start + datetime.timedelta(days=DEFAULT_DAYS) if end is None else end
+
+
+def _entities(selected, known, kind):
+    """Validate an entity selection against the known names (or their replicas), defaulting to all of them"""
+    if selected is None:
+        return list(known)
+    selected = [selected] if isinstance(selected, str) else list(selected)
+    unknown = [name for name in selected if name.split(REPLICA, 1)[0] not in known]
+    if unknown:
+        raise ValueError(f"unknown {kind}: {', '.join(unknown)}")
+    return selected
+
+
+def _time_series(generator, schema, entities, start, end, seed, freq, scenario):
+    scenario = load_scenario() if scenario is None else scenario
+    for first_step, num_steps in time_shards(start, end, freq):
+        yield from as_dicts(generator(entities, start, first_step, num_steps, seed, freq, scenario), schema)
+
+
+def iter_water_quality(stations=None, start=start_date, end=None, seed=SEED, freq=HOUR, scenario=None):
+    """Lazily yield water quality rows for [start, end) in time order, all stations by default
+
+    `scenario` is a compiled scenario (load_scenario(path)); None uses the
+    built-in demo issues.
+    """
+    stations = _entities(stations, monitoring_stations, "stations")
+    return _time_series(
+        generate_water_quality, QUALITY_SCHEMA, stations, start, default_end(start, end), seed, freq, scenario
+    )
+
+
+def iter_network_performance(zones=None, start=start_date, end=None, seed=SEED, freq=HOUR, scenario=None):
+    """Lazily yield distribution network rows for [start, end) in time order, all zones by default"""
+    zones = _entities(zones, pressure_zones, "pressure zones")
+    return _time_series(
+        generate_network_performance, NETWORK_SCHEMA, zones, start, default_end(start, end), seed, freq, scenario
+    )
+
+
+def iter_energy_usage(facility_names=None, start=start_date, end=None, seed=SEED, freq=HOUR, scenario=None):
+    """Lazily yield energy rows for [start, end) in time order, all facilities by default"""
+    facility_names = _entities(facility_names, facilities, "facilities")
+    return _time_series(
+        generate_energy_usage, ENERGY_SCHEMA, facility_names, start, default_end(start, end), seed, freq, scenario
+    )
+
+
+def maintenance_plan(types=None, start=start_date, end=None, seed=SEED, fleet_scale=1):
+    """Per-asset generate_asset_events tasks plus the pending work orders, in date order
+
+    Fleet sizes are always drawn for every asset type, so an asset keeps its id
+    whichever types are selected; fleet_scale multiplies them.
+    """
+    types = _entities(types, asset_types, "asset types")
+    end = default_end(start, end)
+    rng = random.Random(derive_seed(seed, 'maintenance-records'))
+    fleet_sizes = [max(1, round(rng.randint(80, 150) * fleet_scale)) for _ in asset_types]
+    first_ids = [1 + sum(fleet_sizes[:i]) for i in range(len(asset_types))]
+    tasks = [(asset_type, asset_number, start, end, seed)
+             for asset_type, first_id, size in zip(asset_types, first_ids, fleet_sizes) if asset_type in types
+             for asset_number in range(first_id, first_id + size)]
+    pending = generate_pending_maintenance(types, sum(fleet_sizes), end, rng)
+    pending.sort(key=maintenance_date)
+    return tasks, pending
+
+
+def maintenance_records(types=None, start=start_date, end=None, seed=SEED, fleet_scale=1):
+    """Lazily yield maintenance records (MAINTENANCE_SCHEMA tuples) sorted by maintenance date
+
+    Every asset's history is already in date order, so the per-asset generators
+    (and the pending work orders) are merged through a heap holding one record
+    per asset; memory grows with the number of assets, not of events. Records
+    on the same date come out in asset order, pending work orders last.
+    """
+    tasks, pending = maintenance_plan(types, start, end, seed, fleet_scale)
+    histories = [generate_asset_events(*task) for task in tasks]
+    yield from heapq.merge(*histories, pending, key=maintenance_date)
+
+
+def iter_maintenance_records(types=None, start=start_date, end=None, seed=SEED, fleet_scale=1):
+    """Lazily yield maintenance records sorted by maintenance date, all asset types by default"""
+    return as_dicts(maintenance_records(types, start, end, seed, fleet_scale), MAINTENANCE_SCHEMA)
+
+
+def billing_months(start, end):
+    """(year, month) billing periods from start's month through the last one beginning before end"""
+    months = []
+    year, month = start.year, start.month
+    while datetime.datetime(year, month, 1) < end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def iter_customers(num_customers=5000, seed=SEED):
+    """Lazily yield the customer dimension of customers 1..num_customers"""
+    return as_dicts(customer_records(num_customers, seed), CUSTOMER_SCHEMA)
+
+
+def iter_customer_consumption(num_customers=5000, start=start_date, end=None, seed=SEED):
+    """Lazily yield monthly billing records for customers 1..num_customers, customer by customer"""
+    months = billing_months(start, default_end(start, end))
+    for first_customer, count in customer_shards(num_customers):
+        yield from as_dicts(generate_customer_consumption(first_customer, count, months, seed), CONSUMPTION_SCHEMA)
+
+
+def complaint_records(num_complaints=2000, start=start_date, end=None, seed=SEED, num_customers=5000):
+    """Lazily yield complaint tickets (COMPLAINT_SCHEMA tuples) sorted by complaint date"""
+    yield from generate_complaints(num_complaints, start, default_end(start, end), seed, num_customers)
+
+
+def iter_customer_complaints(num_complaints=2000, start=start_date, end=None, seed=SEED, num_customers=5000):
+    """Lazily yield complaint tickets sorted by complaint date"""
+    return as_dicts(complaint_records(num_complaints, start, end, seed, num_customers), COMPLAINT_SCHEMA)
@@ -0,0 +1,385 @@
+"""
+Anomaly detector benchmark against the ground-truth labels
+
+Every (entity, signal) series of the hourly datasets is generated in this
+process exactly as generate-datasets.py writes it (same seed, window and
+scenario), streamed reading by reading through each detector and scored
+against the labels the generators report (the rows of --labels):
+
+- precision and recall over readings: flagged readings that are labeled,
+  labeled readings that were flagged
+- events: runs of consecutive labeled hours of one series; an event is
+  detected when a reading inside it is flagged, and its latency-to-detect is
+  the hours from its first reading to that flag
+- readings/sec: detector updates per second on one core, which with
+  --target-rate (readings/sec in production) sizes the detection workers
+
+The point detectors (zscore, ewma, seasonal) catch spikes and excursions;
+gradual leaks, drifts from a `from` date and windowed level shifts are what
+cusum is for. Out of scope, and left out of the scores (the rules are listed
+under 'unscored' in the results):
+
+- chronic rules: an entity's standing offset or ratio (such as
+  Zone-A-Downtown's over-pressure), and drifts without a `from` date (the
+  Desalination-Plant's efficiency drift), which start with the window. Every
+  reading of the entity carries them, so there is no normal baseline to
+  depart from: they are what a detector learns, and labeled from the first
+  hour they would count as one window-long event
+- floor rules (Zone-H-Hills' low service pressure): the replacement
+  readings sit inside the signal's own range, so no detector on the series
+  alone separates them
+- the customer consumption anomalies: monthly billing series of a few
+  readings per customer, too short for a per-series detector to learn
+
+Results are also broken down per scenario rule and written to a JSON file:
+
+    python benchmark-detectors.py --output detect.json
+    python benchmark-detectors.py --detectors ewma seasonal --threshold 3 --target-rate 2000000
+
+A detector is a class whose instances watch one series: update(value) takes
+its readings in time order and returns whether the reading is anomalous.
+Adding one to DETECTORS makes it available here.
+"""
+
+import argparse
+import datetime
+import json
+import math
+import platform
+import statistics
+import time
+from collections import deque
+from pathlib import Path
+
+from .datasets import (
+    ENERGY_SCHEMA, HOUR, NETWORK_SCHEMA, QUALITY_SCHEMA, SEED, default_end, facilities, generate_energy_usage,
+    generate_network_performance, generate_water_quality, load_scenario, monitoring_stations, pressure_zones,
+    start_date,
+)
+from .scenarios import DEFAULT_SCENARIO, Drift, Floor, Offset, Ratio
+from .shards import time_shards
+
+
+class RollingZScore:
+    """Flags readings more than `threshold` standard deviations from the mean of the previous `window` readings"""
+
+    def __init__(self, window=168, threshold=4.0, warmup=24):
+        self.values = deque()
+        self.window = window
+        self.threshold = threshold
+        self.warmup = warmup
+        self.total = self.squares = 0.0
+
+    def update(self, value):
+        n = len(self.values)
+        flagged = False
+        if n >= self.warmup:
+            mean = self.total / n
+            variance = self.squares / n - mean * mean
+            flagged = (value - mean) ** 2 > self.threshold ** 2 * variance
+        if n == self.window:
+            old = self.values.popleft()
+            self.total -= old
+            self.squares -= old * old
+        self.values.append(value)
+        self.total += value
+        self.squares += value * value
+        return flagged
+
+
+class Ewma:
+    """Flags readings more than `threshold` exponentially weighted standard deviations from the EWMA"""
+
+    def __init__(self, alpha=0.05, threshold=4.0, warmup=24):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.seen = 0
+        self.mean = None
+        self.variance = 0.0
+
+    def update(self, value):
+        self.seen += 1
+        if self.mean is None:
+            self.mean = value
+            return False
+        deviation = value - self.mean
+        flagged = self.seen > self.warmup and deviation * deviation > self.threshold ** 2 * self.variance
+        increment = self.alpha * deviation
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + deviation * increment)
+        return flagged
+
+
+class SeasonalBaseline:
+    """Flags readings more than `threshold` standard deviations from the EWMA of the same hour of the week
+
+    The baseline is learned per slot of `period` readings (daily and weekly
+    patterns alike); the residual variance is shared by all slots.
+    """
+
+    def __init__(self, period=168, alpha=0.2, threshold=4.0, variance_alpha=0.01):
+        self.period = period
+        self.alpha = alpha
+        self.threshold = threshold
+        self.variance_alpha = variance_alpha
+        self.means = [None] * period
+        self.variance = 0.0
+        self.step = 0
+
+    def update(self, value):
+        slot = self.step % self.period
+        self.step += 1
+        mean = self.means[slot]
+        if mean is None:
+            self.means[slot] = value
+            return False
+        residual = value - mean
+        flagged = self.step > 2 * self.period and residual * residual > self.threshold ** 2 * self.variance
+        self.means[slot] = mean + self.alpha * residual
+        self.variance += self.variance_alpha * (residual * residual - self.variance)
+        return flagged
+
+
+class Cusum:
+    """Flags sustained level shifts and trends: two-sided CUSUM of the residuals from a seasonal baseline
+
+    The baseline (mean of the same hour of the week) and residual variance are
+    learned over the first `learn` periods, then follow the series slowly, so
+    a step or a gradual leak accumulates in the sums (less `slack` standard
+    deviations a reading) long before the baseline absorbs it. Readings are
+    flagged while a sum exceeds `threshold` standard deviations; sums are
+    capped at twice that, so flags stop soon after the level comes back. An
+    alarm that lasts `accept` readings is taken as the new normal (a seasonal
+    step such as summer demand) and the baseline is learned again.
+    """
+
+    def __init__(self, period=168, alpha=0.05, slack=0.5, threshold=8.0, learn=2, variance_alpha=0.01, accept=336):
+        self.period = period
+        self.alpha = alpha
+        self.slack = slack
+        self.threshold = threshold
+        self.learn = learn
+        self.variance_alpha = variance_alpha
+        self.accept = accept
+        self._restart()
+
+    def _restart(self):
+        self.means = [None] * self.period
+        self.variance = 0.0
+        self.step = 0
+        self.high = self.low = 0.0
+        self.alarm = 0
+
+    def update(self, value):
+        slot = self.step % self.period
+        cycle = self.step // self.period
+        self.step += 1
+        mean = self.means[slot]
+        if mean is None:
+            self.means[slot] = value
+            return False
+        residual = value - mean
+        if cycle < self.learn:
+            self.means[slot] = mean + residual / (cycle + 1)
+            self.variance += (residual * residual - self.variance) / self.step
+            return False
+        z = residual / math.sqrt(self.variance) if self.variance > 0 else 0.0
+        self.high = min(max(0.0, self.high + z - self.slack), 2 * self.threshold)
+        self.low = min(max(0.0, self.low - z - self.slack), 2 * self.threshold)
+        self.means[slot] = mean + self.alpha * residual
+        self.variance += self.variance_alpha * (residual * residual - self.variance)
+        flagged = self.high > self.threshold or self.low > self.threshold
+        self.alarm = self.alarm + 1 if flagged else 0
+        if self.alarm >= self.accept:
+            self._restart()
+        return flagged
+
+
+DETECTORS = {'zscore': RollingZScore, 'ewma': Ewma, 'seasonal': SeasonalBaseline, 'cusum': Cusum}
+
+# dataset -> (generator, schema, entities, {scenario signal: csv column})
+STREAMS = {
+    'water-quality': (generate_water_quality, QUALITY_SCHEMA, monitoring_stations, {
+        'chlorine': 'chlorine_mg_l', 'ph': 'ph', 'turbidity': 'turbidity_ntu', 'temperature': 'temperature_c',
+        'conductivity': 'conductivity_us_cm',
+    }),
+    'network-performance': (generate_network_performance, NETWORK_SCHEMA, pressure_zones, {
+        'flow': 'flow_rate_gpm', 'pressure': 'pressure_psi', 'consumption': 'billed_consumption_gpm',
+    }),
+    'energy-usage': (generate_energy_usage, ENERGY_SCHEMA, facilities, {'energy': 'energy_consumption_kwh'}),
+}
+
+
+def unscored(rule):
+    """Why a rule's labels are left out of the scores ('chronic' or 'floor'), or None when they are scored"""
+    if isinstance(rule, Floor):
+        return 'floor'
+    if isinstance(rule, (Offset, Ratio, Drift)) and not rule.windowed:
+        return 'chronic'
+    return None
+
+
+def load_streams(dataset, start, end, seed, scenario):
+    """{(entity, signal): (readings, {step: [rule, ...]})} of one hourly dataset, unscored rules left out"""
+    generator, schema, entities, columns = STREAMS[dataset]
+    positions = {signal: list(schema).index(column) for signal, column in columns.items()}
+    left_out = {rule.name for rule in scenario.rules if unscored(rule)}
+    streams = {(entity, signal): ([], {}) for entity in entities for signal in columns}
+    steps = {}  # timestamp -> step
+    for first, n in time_shards(start, end, HOUR):
+        labels = []
+        for row in generator(entities, start, first, n, seed, HOUR, scenario, labels):
+            steps.setdefault(row[0], len(steps))
+            for signal, position in positions.items():
+                streams[row[1], signal][0].append(row[position])
+        for timestamp, entity, signal, rule in labels:
+            if rule not in left_out and signal in columns:
+                streams[entity, signal][1].setdefault(steps[timestamp], []).append(rule)
+    return streams
+
+
+def events(steps):
+    """(first, last) step of every run of consecutive steps"""
+    runs = []
+    for step in sorted(steps):
+        if runs and step == runs[-1][1] + 1:
+            runs[-1][1] = step
+        else:
+            runs.append([step, step])
+    return runs
+
+
+def detections(runs, flags):
+    """Latency (in steps) to the first flag inside each run that has one"""
+    latencies = []
+    for first, last in runs:
+        hit = next((step for step in range(first, last + 1) if flags[step]), None)
+        if hit is not None:
+            latencies.append(hit - first)
+    return latencies
+
+
+def latency_summary(latencies):
+    if not latencies:
+        return None
+    return {'mean': round(statistics.fmean(latencies), 2), 'median': statistics.median(latencies),
+            'max': max(latencies)}
+
+
+def score(streams, make):
+    """Run a fresh detector from make() over every stream and score its flags against the labels"""
+    readings = flagged = true_positives = labeled = 0
+    seconds = 0.0
+    latencies, num_events = [], 0
+    rules = {}  # rule -> [labeled readings, flagged, event latencies, events]
+    for values, labels in streams.values():
+        update = make().update
+        began = time.perf_counter()
+        flags = [update(value) for value in values]
+        seconds += time.perf_counter() - began
+        readings += len(values)
+        flagged += sum(flags)
+        labeled += len(labels)
+        true_positives += sum(flags[step] for step in labels)
+        runs = events(labels)
+        num_events += len(runs)
+        latencies += detections(runs, flags)
+        by_rule = {}
+        for step, names in labels.items():
+            for name in names:
+                by_rule.setdefault(name, []).append(step)
+        for name, steps in by_rule.items():
+            entry = rules.setdefault(name, [0, 0, [], 0])
+            entry[0] += len(steps)
+            entry[1] += sum(flags[step] for step in steps)
+            runs = events(steps)
+            entry[2] += detections(runs, flags)
+            entry[3] += len(runs)
+    return {
+        'readings': readings, 'seconds': round(seconds, 4), 'readings_per_sec': round(readings / seconds, 1),
+        'flagged': flagged, 'labeled': labeled,
+        'precision': round(true_positives / flagged, 4) if flagged else None,
+        'recall': round(true_positives / labeled, 4) if labeled else None,
+        'events': num_events, 'detected': len(latencies), 'latency_hours': latency_summary(latencies),
+        'rules': {
+            name: {'labeled': count, 'recall': round(hits / count, 4), 'events': runs, 'detected': len(found),
+                   'latency_hours': latency_summary(found)}
+            for name, (count, hits, found, runs) in sorted(rules.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark anomaly detectors against the generated ground truth")
+    parser.add_argument("--datasets", nargs="+", choices=list(STREAMS), default=list(STREAMS), help="datasets to run")
+    parser.add_argument(
+        "--detectors", nargs="+", choices=list(DETECTORS), default=list(DETECTORS), help="detectors to run"
+    )
+    parser.add_argument(
+        "--threshold", type=float,
+        help="flagging threshold in standard deviations for every detector (default: each detector's own)"
+    )
+    parser.add_argument(
+        "--target-rate", type=float,
+        help="production readings/sec to size detection workers for (one core per worker)"
+    )
+    parser.add_argument("--seed", type=int, default=SEED, help="root seed of the generated data")
+    parser.add_argument(
+        "--end", type=datetime.datetime.fromisoformat, default=default_end(start_date),
+        help="end of the generated window, exclusive (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--scenario", type=Path, default=DEFAULT_SCENARIO,
+        help="JSON file of anomaly rules (default: the built-in demo issues)"
+    )
+    parser.add_argument("--output", type=Path, default=Path("detect-results.json"), help="JSON results file to write")
+    args = parser.parse_args()
+    if args.threshold is not None and args.threshold <= 0:
+        parser.error("--threshold must be positive")
+    if args.target_rate is not None and args.target_rate <= 0:
+        parser.error("--target-rate must be positive")
+    if args.end <= start_date:
+        parser.error(f"--end must be after {start_date}")
+    try:
+        scenario = load_scenario(args.scenario)
+    except (OSError, ValueError) as e:
+        parser.error(f"--scenario {args.scenario}: {e}")
+    params = {} if args.threshold is None else {'threshold': args.threshold}
+
+    results = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'end': args.end.isoformat(sep=' '),
+        'scenario': scenario.digest,
+        'params': params,
+        'target_rate': args.target_rate,
+        'unscored': {rule.name: unscored(rule) for rule in scenario.rules
+                     if rule.dataset in args.datasets and unscored(rule)},
+        'cases': [],
+    }
+    print(f"{'dataset':<20} {'detector':<9} {'readings':>9} {'readings/s':>11} {'precision':>9} {'recall':>7} "
+          f"{'events':>11} {'latency h':>9}" + (f" {'workers':>7}" if args.target_rate else ""))
+    for dataset in args.datasets:
+        streams = load_streams(dataset, start_date, args.end, args.seed, scenario)
+        for name in args.detectors:
+            case = {'dataset': dataset, 'detector': name, **score(streams, lambda: DETECTORS[name](**params))}
+            if args.target_rate:
+                case['workers'] = math.ceil(args.target_rate / case['readings_per_sec'])
+            results['cases'].append(case)
+            precision = "-" if case['precision'] is None else f"{case['precision']:.3f}"
+            recall = "-" if case['recall'] is None else f"{case['recall']:.3f}"
+            latency = "-" if case['latency_hours'] is None else f"{case['latency_hours']['median']:g}"
+            print(f"{dataset:<20} {name:<9} {case['readings']:>9,} {case['readings_per_sec']:>11,.0f} "
+                  f"{precision:>9} {recall:>7} {case['detected']:>5}/{case['events']:<5} {latency:>9}"
+                  + (f" {case['workers']:>7}" if args.target_rate else ""))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    if results['unscored']:
+        print("\nNot scored (see the module docstring): "
+              + ", ".join(f"{name} ({reason})" for name, reason in results['unscored'].items()))
+    print(f"\nResults written to {args.output} (per-rule recall and latency under 'rules')")
@@ -0,0 +1,99 @@
+"""
+Visually downsampled series for chart rendering (--downsample)
+
+Every numeric column of an hourly dataset (its rollup stats) is reduced per
+station, zone or facility with Largest-Triangle-Three-Buckets, which keeps
+the points that shape the line (spikes included) rather than averaging them
+away. Each point budget gets its own csv next to the dataset, so a chart
+loads one fixed-size series whatever the window length:
+
+    <name>.lttb-500.csv, <name>.lttb-2000.csv, <name>.lttb-10000.csv
+
+with columns timestamp, <entity>, metric, value, ordered by entity, metric
+and time. A series with no more points than the budget is written whole.
+"""
+
+import csv
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for --downsample
+    np = None
+
+# Default point budgets of the pyramid
+LTTB_LEVELS = (500, 2000, 10000)
+
+
+def lttb(x, y, threshold):
+    """Indices of the `threshold` points Largest-Triangle-Three-Buckets keeps of the series (x, y)
+
+    The first and last points are always kept; the others are split into
+    threshold - 2 buckets, and each bucket keeps the point forming the largest
+    triangle with the point kept before it and the average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.intp) + 1  # bucket i is [edges[i], edges[i + 1])
+    counts = np.diff(edges)
+    next_x = np.append(np.add.reduceat(x[:-1], edges[:-1])[1:] / counts[1:], x[-1])
+    next_y = np.append(np.add.reduceat(y[:-1], edges[:-1])[1:] / counts[1:], y[-1])
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    kept = 0
+    for bucket, (lo, hi, cx, cy) in enumerate(zip(edges[:-1].tolist(), edges[1:].tolist(),
+                                                   next_x.tolist(), next_y.tolist()), 1):
+        ax, ay = x[kept], y[kept]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        kept = lo + int(area.argmax())
+        selected[bucket] = kept
+    return selected
+
+
+class DownsampleSink:
+    """Collects an hourly dataset's typed columns per entity and writes its LTTB pyramid at close"""
+
+    def __init__(self, path, rollup, levels=LTTB_LEVELS):
+        self.path = path
+        self.entity = rollup.entity
+        self.metrics = list(rollup.stats)
+        self.levels = sorted(levels)
+        self.chunks = {}  # entity -> [(seconds, {metric: values}), ...]
+
+    def write(self, block):
+        columns = block.columns
+        entities = columns[self.entity][0]
+        seconds = columns['timestamp'][0]
+        for entity in dict.fromkeys(entities.tolist()):
+            rows = entities == entity
+            values = {metric: columns[metric][0][rows] for metric in self.metrics}
+            self.chunks.setdefault(entity, []).append((seconds[rows], values))
+
+    def _series(self):
+        """(entity, metric, seconds, values) per series, missing readings dropped"""
+        for entity in sorted(self.chunks):
+            chunks = self.chunks[entity]
+            seconds = np.concatenate([chunk[0] for chunk in chunks])
+            for metric in self.metrics:
+                values = np.concatenate([chunk[1][metric] for chunk in chunks])
+                present = ~np.isnan(values)
+                yield entity, metric, seconds[present], values[present]
+
+    def close(self):
+        files = {level: open(self.path.with_name(f"{self.path.stem}.lttb-{level}.csv"), 'w', newline='')
+                 for level in self.levels}
+        try:
+            writers = {level: csv.writer(f) for level, f in files.items()}
+            for writer in writers.values():
+                writer.writerow(['timestamp', self.entity, 'metric', 'value'])
+            for entity, metric, seconds, values in self._series():
+                x = seconds.astype(np.float64)
+                for level, writer in writers.items():
+                    kept = lttb(x, values, level)
+                    times = np.datetime_as_string(seconds[kept].astype('datetime64[s]')).tolist()
+                    writer.writerows((time.replace('T', ' '), entity, metric, value)
+                                     for time, value in zip(times, values[kept].tolist()))
+        finally:
+            for f in files.values():
+                f.close()
@@ -0,0 +1,278 @@
+"""
+High-frequency sensor telemetry: temporally correlated readings down to 1-second resolution
+
+Every station signal (chlorine, pH, ...), zone flow/pressure and facility
+power draw is a sensor whose reading is
+
+    level + hour-of-day profile + AR(1) drift + measurement noise
+
+The drift is an AR(1) process x[t] = phi * x[t-1] + e[t] with a
+per-signal correlation time tau (phi = exp(-resolution / tau)), scaled so
+its stationary spread is the signal's sigma: the same spread the hourly
+generators draw independently every hour, but now correlated in time.
+ar1_filter runs the recursion over whole arrays (a blocked scan, what
+scipy.signal.lfilter([1], [1, -phi], e) computes) instead of a Python loop.
+
+Each sensor draws from its own seed stream and is generated in time chunks
+that carry the filter state, so a sensor's series does not depend on how
+sensors are grouped over worker processes. Readings go to a float32
+(sensors x steps) values.npy next to sensors.csv and telemetry.json:
+
+    python generate-telemetry.py --resolution 1s --sensors 1000 --end 2024-01-08
+    meta, sensors, values = load_telemetry('data/telemetry')
+
+Throughput is bounded by NumPy's normal sampler (about 15 ns per float32
+draw) plus the float64 scan: roughly 10-30M points/s per core depending on
+the machine and the sensor mix, short of tens of millions per core (that
+would take a compiled kernel). Worker processes scale it with cores.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import math
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is required for the telemetry arrays
+    np = None
+
+from .datasets import SEED, default_end, facilities, monitoring_stations, pressure_zones, start_date
+from .metrics import PHASES, merge_timings, timed
+from .shards import derive_seed, run_shards
+
+OUTPUT_DIR = Path("data") / "telemetry"
+
+# Supported reading intervals
+RESOLUTIONS = {'1s': 1, '10s': 10, '1min': 60, '5min': 300, '15min': 900, '1h': 3600}
+
+# Time steps generated per sensor at once (the filter state carries over)
+CHUNK_STEPS = 2 ** 20
+
+# Sensors per worker task
+GROUP_SENSORS = 16
+
+# Largest phi ** -t the blocked scan divides by; bounds its rounding error
+SCAN_RANGE = 1e8
+
+# One sensor: level and hour-of-day profile (24 additive values) of its
+# reading, AR(1) drift spread (sigma) and correlation time (tau, seconds),
+# white measurement noise, and the range readings are clipped to
+Sensor = namedtuple('Sensor', 'name entity signal unit level profile sigma tau noise low high')
+
+
+def _profile(morning=0.0, evening=0.0, night=0.0):
+    """24 hourly offsets: morning peak 6-9h, evening peak 18-21h, night 0-5h"""
+    return tuple(morning if 6 <= hour <= 9 else evening if 18 <= hour <= 21 else night if hour <= 5 else 0.0
+                 for hour in range(24))
+
+
+def _base_sensors():
+    """One sensor per station signal, zone flow/pressure and facility power, with the hourly generators' levels"""
+    sensors = []
+    for station_id, station in enumerate(monitoring_stations, 1):
+        sensors += [
+            (station, 'chlorine_mg_l', 'mg/L', 1.2 + station_id * 0.1, _profile(-0.1, -0.15), 0.15, 6 * 3600, 0.01,
+             0.0, 5.0),
+            (station, 'ph', 'pH', 7.3, _profile(), 0.15, 12 * 3600, 0.01, 6.0, 9.0),
+            (station, 'turbidity_ntu', 'NTU', 0.5, _profile(0.2, 0.3), 0.3, 2 * 3600, 0.02, 0.0, 20.0),
+            (station, 'temperature_c', 'C', 26.0, _profile(), 3.0, 24 * 3600, 0.05, 10.0, 35.0),
+            (station, 'conductivity_us_cm', 'uS/cm', 450.0, _profile(), 30.0, 12 * 3600, 2.0, 200.0, 1000.0),
+        ]
+    for zone_id, zone in enumerate(pressure_zones, 1):
+        flow = 500.0 + zone_id * 100
+        sensors += [
+            (zone, 'flow_rate_gpm', 'gpm', flow, _profile(0.4 * flow, 0.3 * flow, -0.6 * flow), 50.0, 3600, 5.0,
+             0.0, math.inf),
+            (zone, 'pressure_psi', 'psi', 55.0, _profile(-8.0, -6.0, 5.0), 5.0, 3600, 0.3, 20.0, 100.0),
+        ]
+    for facility in facilities:
+        if "Treatment" in facility or "Desalination" in facility:
+            power, sigma = 1200.0, 80.0
+        elif "Pumping" in facility or "Booster" in facility:
+            power, sigma = 450.0, 40.0
+        else:  # Admin buildings
+            power, sigma = 25.0, 5.0
+        sensors.append((facility, 'power_kw', 'kW', power, _profile(0.5 * power, 0.4 * power, -0.4 * power), sigma,
+                        1800, sigma / 20, 0.0, math.inf))
+    return sensors
+
+
+def sensor_catalog(count=None):
+    """The first `count` sensors (all base sensors by default); past those, further replicas of every base sensor
+    (<entity>/<signal>/2, /3, ...) are added in the same order"""
+    base = _base_sensors()
+    count = len(base) if count is None else count
+    return [
+        Sensor(f"{entity}/{signal}/{i // len(base) + 1}", entity, signal, *rest)
+        for i, (entity, signal, *rest) in ((i, base[i % len(base)]) for i in range(count))
+    ]
+
+
+def ar1_filter(innovations, phi, state=0.0):
+    """x[t] = phi * x[t-1] + innovations[t] from x[-1] = state, as (float64 x, x[-1])
+
+    The series is cut into power-of-two blocks short enough that phi ** -t
+    stays within SCAN_RANGE; inside a block x is phi ** t * cumsum(innovations
+    / phi ** t), and each block then adds the decayed last value of the block
+    before it.
+    """
+    n = len(innovations)
+    span = min(n, 2 ** max(0, int(math.log2(math.log(SCAN_RANGE) / -math.log(phi)))))
+    blocks = -(-n // span)
+    if n == blocks * span:
+        x = innovations.astype(np.float64)
+    else:
+        x = np.zeros(blocks * span)
+        x[:n] = innovations
+    x = x.reshape(blocks, span)
+    powers = phi ** np.arange(span + 1)
+    x *= 1 / powers[:span]
+    np.cumsum(x, axis=1, out=x)
+    x *= powers[:span]
+    carries = np.empty(blocks)
+    carry = state
+    for block, last in enumerate(x[:, -1].tolist()):
+        carries[block] = carry
+        carry = powers[span] * carry + last
+    x += carries[:, None] * powers[1:]
+    x = x.ravel()[:n]
+    return x, x[-1]
+
+
+def generate_sensor(sensor, start, num_steps, resolution, seed, out):
+    """Write one sensor's readings for num_steps steps from `start` into the float32 row `out`
+
+    Innovations are float32 normal draws; the measurement noise is uniform
+    (like quantization) with a standard deviation of sensor.noise.
+    """
+    rng = np.random.default_rng(derive_seed(seed, 'telemetry', sensor.name))
+    phi = math.exp(-resolution / sensor.tau)
+    scale = np.float32(sensor.sigma * math.sqrt(1 - phi * phi))  # innovations giving a stationary spread of sigma
+    noise = np.float32(sensor.noise * math.sqrt(12))
+    state = sensor.sigma * rng.standard_normal()  # a stationary starting drift
+    # Level plus hour-of-day profile for every step of a day (every resolution
+    # divides an hour), repeated so any chunk is one slice of it
+    day = np.repeat(np.array(sensor.profile, dtype=np.float32) + np.float32(sensor.level), 3600 // resolution)
+    cycle = np.tile(day, -(-min(num_steps, CHUNK_STEPS) // len(day)) + 1)
+    offset = (start.hour * 3600 + start.minute * 60 + start.second) // resolution
+    for first in range(0, num_steps, CHUNK_STEPS):
+        n = min(CHUNK_STEPS, num_steps - first)
+        innovations = rng.standard_normal(n, dtype=np.float32)
+        innovations *= scale
+        drift, state = ar1_filter(innovations, phi, state)
+        values = out[first:first + n]
+        shift = (offset + first) % len(day)
+        np.add(drift, cycle[shift:shift + n], out=values, casting='same_kind')
+        measurement = rng.random(n, dtype=np.float32)
+        measurement -= np.float32(0.5)
+        measurement *= noise
+        values += measurement
+        np.clip(values, sensor.low, sensor.high, out=values)
+
+
+def generate_sensors(path, first_row, sensors, start, num_steps, resolution, seed):
+    """Generate a group of sensors into rows first_row.. of the values.npy at `path`; returns (points, timings)"""
+    timings = {}
+    values = np.load(path, mmap_mode='r+')
+    with timed(timings, 'generate'):
+        for row, sensor in enumerate(sensors, first_row):
+            generate_sensor(sensor, start, num_steps, resolution, seed, values[row])
+    with timed(timings, 'write'):
+        values.flush()
+    del values
+    return len(sensors) * num_steps, timings
+
+
+def load_telemetry(directory):
+    """(metadata, sensors, read-only (sensors x steps) memmap) of a generated telemetry directory"""
+    directory = Path(directory)
+    with open(directory / 'telemetry.json') as f:
+        meta = json.load(f)
+    with open(directory / 'sensors.csv', newline='') as f:
+        sensors = list(csv.DictReader(f))
+    return meta, sensors, np.load(directory / 'values.npy', mmap_mode='r')
+
+
+def timestamps(meta):
+    """datetime64[s] time axis of a telemetry directory's values"""
+    step = np.timedelta64(meta['resolution_seconds'], 's')
+    return np.datetime64(meta['start'], 's') + np.arange(meta['steps']) * step
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate high-frequency, temporally correlated sensor telemetry")
+    parser.add_argument("--resolution", choices=list(RESOLUTIONS), default="1min", help="reading interval")
+    parser.add_argument(
+        "--sensors", type=int,
+        help="number of sensors (default: one per station signal, zone flow/pressure and facility power); more "
+             "add replicas of those"
+    )
+    parser.add_argument(
+        "--start", type=datetime.datetime.fromisoformat, default=start_date,
+        help="first reading (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--end", type=datetime.datetime.fromisoformat,
+        help="end of the window, exclusive (default: the datasets' window end)"
+    )
+    parser.add_argument("--seed", type=int, default=SEED, help="root seed every sensor stream is derived from")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="worker processes; output is identical for any worker count"
+    )
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR, help="directory to write (default: %(default)s)")
+    args = parser.parse_args()
+    if np is None:
+        parser.error("telemetry generation requires NumPy (pip install numpy)")
+    if args.sensors is not None and args.sensors < 1:
+        parser.error("--sensors must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    end = default_end(args.start) if args.end is None else args.end
+    resolution = RESOLUTIONS[args.resolution]
+    num_steps = int((end - args.start).total_seconds()) // resolution
+    if num_steps < 1:
+        parser.error("--end must be at least one --resolution after --start")
+
+    sensors = sensor_catalog(args.sensors)
+    args.output.mkdir(parents=True, exist_ok=True)
+    with open(args.output / 'sensors.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['row', 'sensor', 'entity', 'signal', 'unit', 'level', 'sigma', 'tau_seconds', 'noise'])
+        writer.writerows((row, s.name, s.entity, s.signal, s.unit, s.level, s.sigma, s.tau, s.noise)
+                         for row, s in enumerate(sensors))
+    path = args.output / 'values.npy'
+    np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(len(sensors), num_steps)).flush()
+    meta = {'start': args.start.isoformat(sep=' '), 'resolution_seconds': resolution, 'steps': num_steps,
+            'sensors': len(sensors), 'seed': args.seed, 'dtype': 'float32', 'layout': 'sensors x steps'}
+    with open(args.output / 'telemetry.json', 'w') as f:
+        json.dump(meta, f, indent=2)
+        f.write('\n')
+
+    total = len(sensors) * num_steps
+    print(f"Generating {len(sensors):,} sensors x {num_steps:,} readings ({args.resolution}) = {total:,} points "
+          f"in {args.output}/...")
+    executor = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    tasks = [(path, first, sensors[first:first + GROUP_SENSORS], args.start, num_steps, resolution, args.seed)
+             for first in range(0, len(sensors), GROUP_SENSORS)]
+    began = time.perf_counter()
+    timings = {}
+    done = 0
+    for points, shard_timings in run_shards(generate_sensors, tasks, executor, 2 * args.workers):
+        before, done = done, done + points
+        merge_timings(timings, shard_timings)
+        if done * 10 // total > before * 10 // total:
+            print(f"  {done:,} / {total:,} points ({done / (time.perf_counter() - began):,.0f} points/s)")
+    if executor is not None:
+        executor.shutdown()
+    seconds = time.perf_counter() - began
+    phases = ", ".join(f"{phase} {timings[phase]:.2f}s" for phase in PHASES if phase in timings)
+    print(f"\nWrote {total:,} points in {seconds:.2f}s: {total / seconds:,.0f} points/s, "
+          f"{total / timings.get('generate', seconds):,.0f} points/s per core ({phases})")
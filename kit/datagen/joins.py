@@ -0,0 +1,133 @@
+"""
+Foreign-key join indexes of the customer dimension (<name>.joins.npz)
+
+customers.csv is the dimension customer consumption and complaints
+reference: every customer's type (consumption's customer_type), pressure
+zone and nearest monitoring station (a complaint's location). Join indexes
+are written with the csvs they point into, as sorted arrays, so
+cross-dataset KPIs are binary searches rather than nested scans:
+
+    customers.joins.npz            months     billing months ('YYYY-MM') of every customer
+                                   zones      zone names, sorted
+                                   offsets    zone i's customers are customers[offsets[i]:offsets[i + 1]]
+                                   customers  customer numbers (CUST-00042 is 42), by zone then number
+    customer-complaints.joins.npz  customers  customer numbers of the complaint rows, sorted
+                                   rows       complaint rows, ordered like customers (date order per customer)
+
+Row numbers count data rows from 0 (the header excluded), in csv order.
+customer-consumption.csv holds one row per customer and billing month in
+customer order, so customer n's rows are [(n - 1) * len(months), n *
+len(months)); with its seek index (--index) they are one byte range away
+(datagen.seekindex.read_slice).
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to write and read the join indexes
+    np = None
+
+from .datasets import COMPLAINT_SCHEMA, CUSTOMER_SCHEMA
+
+ZONE = list(CUSTOMER_SCHEMA).index('zone')
+COMPLAINT_CUSTOMER = list(COMPLAINT_SCHEMA).index('customer_id')
+
+
+def joins_path(path):
+    """<name>.joins.npz next to <name>.csv"""
+    return path.with_name(f"{path.stem}.joins.npz")
+
+
+def load_joins(csv_path):
+    """The join indexes saved with a csv, as {name: array}"""
+    path = joins_path(csv_path)
+    if not path.exists():
+        raise ValueError(f"{csv_path} has no join indexes ({path.name})")
+    with np.load(path) as arrays:
+        return dict(arrays)
+
+
+def customer_number(customer_id):
+    """42 for CUST-00042"""
+    return int(customer_id.split('-', 1)[1])
+
+
+def consumption_rows(customers, customer_id):
+    """range of customer-consumption.csv rows of a customer, given the customers.csv join indexes"""
+    months = len(customers['months'])
+    number = customer_number(customer_id)
+    return range((number - 1) * months, number * months)
+
+
+def complaint_rows(complaints, customer_id):
+    """customer-complaints.csv rows of a customer, given its join indexes"""
+    number = customer_number(customer_id)
+    first, end = np.searchsorted(complaints['customers'], [number, number + 1])
+    return complaints['rows'][first:end]
+
+
+def zone_customers(customers, zone):
+    """Customer numbers in a zone, given the customers.csv join indexes"""
+    at = np.searchsorted(customers['zones'], zone)
+    if at == len(customers['zones']) or customers['zones'][at] != zone:
+        raise ValueError(f"unknown zone {zone!r}")
+    return customers['customers'][customers['offsets'][at]:customers['offsets'][at + 1]]
+
+
+class _SortedIndex:
+    """Collects (key, value) arrays block by block; sorted() returns them ordered by key, then value"""
+
+    def __init__(self, path):
+        self.path = path
+        self.keys, self.values = [], []
+        self.rows = 0
+
+    def _lines(self, block):
+        lines = block.text.split('\r\n')
+        lines.pop()
+        first = self.rows
+        self.rows += len(lines)
+        return first, lines
+
+    def sorted(self, key_dtype):
+        keys = np.concatenate(self.keys) if self.keys else np.array([], dtype=key_dtype)
+        values = np.concatenate(self.values) if self.values else np.array([], dtype=np.int64)
+        order = np.lexsort((values, keys))
+        return keys[order], values[order]
+
+
+class ComplaintIndexSink(_SortedIndex):
+    """Records the complaint rows of each customer as customer-complaints.csv is written"""
+
+    def write(self, block):
+        first, lines = self._lines(block)
+        self.keys.append(np.array([customer_number(line.split(',')[COMPLAINT_CUSTOMER]) for line in lines],
+                                  dtype=np.int64))
+        self.values.append(np.arange(first, first + len(lines), dtype=np.int64))
+
+    def close(self):
+        customers, rows = self.sorted(np.int64)
+        np.savez_compressed(joins_path(self.path), customers=customers, rows=rows)
+
+
+class JoinIndexSink(_SortedIndex):
+    """Records the customers of each zone as customers.csv is written, with the billing months of consumption
+
+    `months` are the (year, month) billing months, one consumption row each
+    per customer.
+    """
+
+    def __init__(self, path, months):
+        super().__init__(path)
+        self.months = [f"{year}-{month:02d}" for year, month in months]
+
+    def write(self, block):
+        _, lines = self._lines(block)
+        fields = [line.split(',') for line in lines]
+        self.keys.append(np.array([row[ZONE] for row in fields], dtype=str))
+        self.values.append(np.array([customer_number(row[0]) for row in fields], dtype=np.int64))
+
+    def close(self):
+        zones, customers = self.sorted(str)
+        names, offsets = np.unique(zones, return_index=True)
+        np.savez_compressed(joins_path(self.path), months=np.array(self.months, dtype=str), zones=names,
+                            offsets=np.append(offsets, len(zones)), customers=customers)
@@ -0,0 +1,37 @@
+"""
+Ground-truth anomaly labels (--labels)
+
+Next to each dataset with injected anomalies, <name>.labels.csv lists every
+reading an anomaly changed, one line per (row, anomaly):
+
+    timestamp,station,signal,rule
+    2024-08-15 10:00:00,Station-01-Downtown,turbidity,aug15-turbidity-event
+
+The key columns are the dataset's own time and entity columns (billing_date
+and customer_id for customer consumption); `signal` is the base value the
+anomaly acted on and `rule` its scenario rule name (or CONSUMPTION_ANOMALIES
+name). Lines follow the csv's row order. Chronic rules (an entity's standing
+offset or ratio) label every row of their entities.
+"""
+
+import csv
+
+
+def labels_path(path):
+    """<name>.labels.csv next to <name>.csv"""
+    return path.with_name(f"{path.stem}.labels.csv")
+
+
+class LabelSink:
+    """Writes the label tuples each Block carries"""
+
+    def __init__(self, path, time_column, entity_column):
+        self.file = open(labels_path(path), 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([time_column, entity_column, 'signal', 'rule'])
+
+    def write(self, block):
+        self.writer.writerows(block.labels)
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,106 @@
+"""
+Per-phase timing, throughput counters and opt-in profiling for the csv driver
+
+Every dataset goes through four phases: generate (drawing rows), format
+(rendering them as csv text and typed columns), write (feeding the sinks)
+and compress (the compressed-sibling threads). Shards time their generate
+and format phases wherever they run, worker processes included, and return
+the timings with their Block; the writer and compression threads time
+theirs in the main process. Phase seconds are therefore summed over every
+process and thread, while `seconds` is the dataset's wall time.
+
+DatasetMetrics turns this into progress lines and one JSON-lines record per
+dataset (--metrics). Phases named in PROFILED run under a cProfile profiler
+per (phase, thread) in this process, merged by profile_stats().
+"""
+
+import cProfile
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+PHASES = ('generate', 'format', 'write', 'compress')
+
+# Phases to profile in this process (--profile) and their profilers, one per (phase, thread)
+PROFILED = set()
+PROFILERS = {}
+
+
+@contextmanager
+def timed(timings, phase):
+    """Add the time spent in the block to timings[phase], under the phase's profiler when it is profiled"""
+    profiler = None
+    if phase in PROFILED:
+        profiler = PROFILERS.setdefault((phase, threading.get_ident()), cProfile.Profile())
+        profiler.enable()
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - began
+        if profiler is not None:
+            profiler.disable()
+
+
+def merge_timings(total, timings):
+    for phase, seconds in (timings or {}).items():
+        total[phase] = total.get(phase, 0.0) + seconds
+
+
+def profile_stats(phase):
+    """pstats.Stats of everything profiled under a phase, or None if nothing was"""
+    profilers = [profiler for (name, _), profiler in PROFILERS.items() if name == phase]
+    return pstats.Stats(*profilers) if profilers else None
+
+
+class DatasetMetrics:
+    """Phase timings and row/byte counters of one dataset, reported as JSON lines"""
+
+    def __init__(self, dataset, report=None):
+        self.dataset = dataset
+        self.report = report  # open JSON-lines file, or None
+        self.timings = {}
+        self.rows = 0
+        self.bytes = 0
+        self.began = time.perf_counter()
+
+    def phase(self, name):
+        return timed(self.timings, name)
+
+    def block(self, block):
+        """Count a Block that reached the sinks, with the timings its shard recorded"""
+        self.rows += block.rows
+        text = block.text
+        self.bytes += len(text) if text.isascii() else len(text.encode())  # isascii() is O(1)
+        merge_timings(self.timings, block.timings)
+
+    def summary(self):
+        seconds = time.perf_counter() - self.began
+        return {
+            'dataset': self.dataset,
+            'seconds': round(seconds, 4),
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'rows_per_sec': round(self.rows / seconds, 1) if seconds else None,
+            'bytes_per_sec': round(self.bytes / seconds, 1) if seconds else None,
+            'phases': {phase: round(self.timings[phase], 4) for phase in PHASES if phase in self.timings},
+        }
+
+    def emit(self, event, **fields):
+        if self.report is not None:
+            self.report.write(json.dumps({'event': event, **self.summary(), **fields}) + '\n')
+            self.report.flush()
+
+    def progress(self, done, unit):
+        """Print and record a progress line with the throughput so far"""
+        summary = self.summary()
+        print(f"  Generated {done} {unit}... ({summary['rows_per_sec']:,.0f} rows/s, "
+              f"{summary['bytes_per_sec'] / 2**20:.1f} MiB/s)")
+        self.emit('progress', done=done, unit=unit)
+
+    def finish(self):
+        """Record the dataset's final counters and phase breakdown"""
+        self.emit('dataset')
+        return self.summary()
@@ -0,0 +1,145 @@
+"""
+Hive-style partitioned csv output (--partition)
+
+Next to <name>.csv, every row is also written under
+
+    <name>/month=<YYYY-MM>/<entity column>=<value>/part.csv
+
+(e.g. water-quality-monitoring/month=2024-08/station=Station-05-Coastal/part.csv),
+each part with its own header row and its rows in dataset order. Appends
+run on a thread pool, one file per task; appends to different parts overlap
+(across Blocks too), while each part waits for its previous append, so its
+rows stay in order.
+<name>/_manifest.json lists every partition with its row count and the first
+and last value of the time column, so readers can prune without opening
+parts:
+
+    prune('data/water-quality-monitoring', start='2024-08-15', end='2024-08-16')
+"""
+
+import csv
+import json
+import shutil
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+MANIFEST = '_manifest.json'
+PART = 'part.csv'
+
+# Hive's directory name for a null partition value
+DEFAULT_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+# Part files kept open at once; older ones are closed and reopened for appending
+MAX_OPEN_PARTS = 128
+
+
+def partition_dir(path):
+    """<name>/ next to <name>.csv"""
+    return path.with_suffix('')
+
+
+class PartitionSink:
+    """Splits Block csv text into month x entity part files and writes the manifest at close"""
+
+    def __init__(self, path, schema, time_column, entity_column, threads=None):
+        self.root = partition_dir(path)
+        if self.root.exists():  # an earlier build's partitions, complete or interrupted
+            shutil.rmtree(self.root)
+        self.root.mkdir(exist_ok=True)
+        self.columns = list(schema)
+        self.time_index = self.columns.index(time_column)
+        self.entity_index = self.columns.index(entity_column)
+        self.entity_column = entity_column
+        self.header = ','.join(self.columns) + '\r\n'
+        self.partitions = {}  # (month, entity) -> [rows, first, last]
+        self.files = OrderedDict()  # (month, entity) -> open part file, least recently used first
+        self.pending = {}  # (month, entity) -> its latest append submitted to the pool
+        self.pool = ThreadPoolExecutor(threads, thread_name_prefix=f"partition-{path.stem}")
+
+    def part_path(self, month, entity):
+        value = quote(entity, safe='') or DEFAULT_PARTITION
+        return self.root / f"month={month}" / f"{self.entity_column}={value}" / PART
+
+    def _file(self, key):
+        if key in self.files:
+            self.files.move_to_end(key)
+            return self.files[key]
+        if len(self.files) >= MAX_OPEN_PARTS:
+            oldest, f = self.files.popitem(last=False)
+            self._wait(oldest)  # the file to close may still have an append queued
+            f.close()
+        path = self.part_path(*key)
+        new = key not in self.partitions
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = self.files[key] = open(path, 'w' if new else 'a', newline='')
+        if new:
+            f.write(self.header)
+        return f
+
+    def write(self, block):
+        lines = block.text.split('\r\n')
+        lines.pop()
+        groups = defaultdict(list)
+        for line, fields in zip(lines, csv.reader(lines)):
+            time = fields[self.time_index]
+            groups[time[:7], fields[self.entity_index]].append((time, line))
+        # Files are opened here (the LRU is not thread-safe); the appends run in parallel
+        for key, rows in groups.items():
+            self._wait(key)
+            f = self._file(key)
+            times = [time for time, _ in rows]
+            entry = self.partitions.setdefault(key, [0, min(times), max(times)])
+            entry[0] += len(rows)
+            entry[1], entry[2] = min(entry[1], min(times)), max(entry[2], max(times))
+            self.pending[key] = self.pool.submit(f.write, ''.join(line + '\r\n' for _, line in rows))
+
+    def _wait(self, key):
+        """Finish the append queued for a part, if any"""
+        write = self.pending.pop(key, None)
+        if write is not None:
+            write.result()
+
+    def manifest(self):
+        partitions = [
+            {
+                'path': self.part_path(month, entity).relative_to(self.root).as_posix(),
+                'month': month, self.entity_column: entity, 'rows': rows, 'first': first, 'last': last,
+            }
+            for (month, entity), (rows, first, last) in sorted(self.partitions.items())
+        ]
+        return {
+            'columns': self.columns,
+            'partition_by': ['month', self.entity_column],
+            'time_column': self.columns[self.time_index],
+            'rows': sum(partition['rows'] for partition in partitions),
+            'partitions': partitions,
+        }
+
+    def close(self):
+        for key in list(self.pending):
+            self._wait(key)
+        self.pool.shutdown()
+        for f in self.files.values():
+            f.close()
+        with open(self.root / MANIFEST, 'w') as f:
+            json.dump(self.manifest(), f, indent=2)
+            f.write('\n')
+
+
+def prune(root, start=None, end=None, **equals):
+    """Manifest entries of the partitions under `root` that can hold rows in [start, end) matching `equals`
+
+    start/end compare with the time column as ISO strings, e.g. '2024-08-15';
+    `equals` filters on partition columns, e.g. station='Station-05-Coastal'.
+    """
+    root = Path(root)
+    with open(root / MANIFEST) as f:
+        manifest = json.load(f)
+    return [
+        dict(partition, path=root / partition['path'])
+        for partition in manifest['partitions']
+        if (start is None or partition['last'] >= start) and (end is None or partition['first'] < end)
+        and all(partition.get(column) == value for column, value in equals.items())
+    ]
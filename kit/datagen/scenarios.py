@@ -0,0 +1,243 @@
+"""
+Declarative anomaly scenarios for the hourly datasets
+
+A scenario file (JSON) lists rules, each acting on one signal of one dataset
+(the generator's base value before range clipping, e.g. water-quality
+`chlorine` or network-performance `flow`) for some or all of its entities,
+optionally only inside a dated window:
+
+    {"name": "aug15-ph-excursion", "kind": "excursion", "dataset": "water-quality",
+     "signal": "ph", "entities": ["Station-03-Residential-North"],
+     "from": "2024-08-15", "until": "2024-08-15", "hours": [14, 18], "set": [8.6, 9.2]}
+
+Kinds:
+
+- offset:    chronic shift, `add` a constant or `scale` by a factor
+- spike:     with `probability` per reading, `set` to (or `add`) uniform [lo, hi]
+- excursion: inside the window, `set` to (or `add`) uniform [lo, hi]
+- floor:     readings `below` a threshold are `set` to uniform [lo, hi]
+- ratio:     the signal becomes `of` (another signal) times `ratio`
+- leak:      progressive growth, `add` `per_day` for every day since `from`
+- drift:     `per_year` fractional growth since `from` (default: window start)
+
+Rules apply in file order. They are compiled once per shard: the python
+generators look up the rules that apply to an entity at a time step from a
+per-shard plan, so a reading only pays for the rules that touch it, and the
+NumPy engine applies every rule as a masked array operation over the shard
+(datagen.vectorized.apply_scenario). Either way every rule reports the
+readings it changed, which --labels records as ground truth.
+"""
+
+import datetime
+import hashlib
+import json
+from pathlib import Path
+
+DEFAULT_SCENARIO = Path(__file__).with_name('scenarios.json')
+
+
+class ScenarioError(ValueError):
+    """A scenario file that does not describe valid rules"""
+
+
+class Rule:
+    """One compiled rule; subclasses implement apply() on one reading's signal values, returning whether it
+    changed them"""
+
+    params = ()
+
+    def __init__(self, spec, signals):
+        self.name = spec['name']
+        self.dataset = spec['dataset']
+        self.signal = spec['signal']
+        self.index = signals.index(self.signal)
+        self.entities = None if spec.get('entities') is None else frozenset(spec['entities'])
+        self.first_date = datetime.date.fromisoformat(spec['from']) if 'from' in spec else datetime.date.min
+        self.last_date = datetime.date.fromisoformat(spec['until']) if 'until' in spec else datetime.date.max
+        self.first_hour, self.last_hour = spec.get('hours', (0, 23))
+        self.windowed = 'from' in spec or 'until' in spec or 'hours' in spec
+        for key in self.params:
+            setattr(self, key, spec[key])
+
+    def applies_to(self, entity):
+        return self.entities is None or entity in self.entities
+
+    def active(self, tick):
+        """Whether a time step falls inside the rule's window"""
+        return self.first_date <= tick.date <= self.last_date and self.first_hour <= tick.hour <= self.last_hour
+
+
+class Offset(Rule):
+    """Chronic shift: add a constant or scale by a factor"""
+
+    def __init__(self, spec, signals):
+        super().__init__(spec, signals)
+        self.add = spec.get('add')
+        self.scale = spec.get('scale')
+        if (self.add is None) == (self.scale is None):
+            raise ScenarioError(f"scenario rule {self.name!r}: offset needs exactly one of 'add' or 'scale'")
+
+    def apply(self, values, rng, tick):
+        if self.add is not None:
+            values[self.index] += self.add
+        else:
+            values[self.index] *= self.scale
+        return True
+
+
+class Uniform(Rule):
+    """Base for rules that set a signal to, or add to it, a uniform [lo, hi] draw"""
+
+    def __init__(self, spec, signals):
+        super().__init__(spec, signals)
+        if ('set' in spec) == ('add' in spec):
+            raise ScenarioError(f"scenario rule {self.name!r}: {spec['kind']} needs exactly one of 'set' or 'add'")
+        self.replace = 'set' in spec
+        self.low, self.high = spec['set'] if self.replace else spec['add']
+
+    def draw(self, values, rng):
+        if self.replace:
+            values[self.index] = rng.uniform(self.low, self.high)
+        else:
+            values[self.index] += rng.uniform(self.low, self.high)
+
+
+class Spike(Uniform):
+    """Random excursions with a per-reading probability"""
+
+    params = ('probability',)
+
+    def apply(self, values, rng, tick):
+        if rng.random() < self.probability:
+            self.draw(values, rng)
+            return True
+        return False
+
+
+class Excursion(Uniform):
+    """Every reading inside the dated window is set to or shifted by a uniform draw"""
+
+    def apply(self, values, rng, tick):
+        self.draw(values, rng)
+        return True
+
+
+class Floor(Uniform):
+    """Readings below a threshold are replaced (or shifted) by a uniform draw"""
+
+    params = ('below',)
+
+    def apply(self, values, rng, tick):
+        if values[self.index] < self.below:
+            self.draw(values, rng)
+            return True
+        return False
+
+
+class Ratio(Rule):
+    """The signal becomes another signal times a ratio (e.g. billed = flow * (1 - NRW))"""
+
+    params = ('ratio',)
+
+    def __init__(self, spec, signals):
+        super().__init__(spec, signals)
+        self.source = signals.index(spec['of'])
+
+    def apply(self, values, rng, tick):
+        values[self.index] = values[self.source] * self.ratio
+        return True
+
+
+class Leak(Rule):
+    """Progressive growth by a fixed amount per day since the window opened"""
+
+    params = ('per_day',)
+
+    def __init__(self, spec, signals):
+        super().__init__(spec, signals)
+        if 'from' not in spec:
+            raise ScenarioError(f"scenario rule {self.name!r}: leak needs a 'from' date")
+
+    def apply(self, values, rng, tick):
+        values[self.index] += (tick.date - self.first_date).days * self.per_day
+        return True
+
+
+class Drift(Rule):
+    """Fractional degradation per year since `from`, or since the window start"""
+
+    params = ('per_year',)
+
+    def days(self, tick):
+        return tick.days_elapsed if self.first_date == datetime.date.min else (tick.date - self.first_date).days
+
+    def apply(self, values, rng, tick):
+        values[self.index] *= 1 + (self.days(tick) / 365) * self.per_year
+        return True
+
+
+RULE_KINDS = {
+    'offset': Offset, 'spike': Spike, 'excursion': Excursion, 'floor': Floor,
+    'ratio': Ratio, 'leak': Leak, 'drift': Drift,
+}
+
+
+class Scenario:
+    """A compiled scenario file: its rules plus per-shard plans for the generators"""
+
+    def __init__(self, rules, digest):
+        self.rules = rules
+        self.digest = digest
+
+    @classmethod
+    def from_spec(cls, spec, datasets):
+        """Compile a parsed scenario; datasets maps dataset name -> (entities, signals)"""
+        rules = []
+        for number, rule in enumerate(spec.get('rules', []), 1):
+            rule = dict(rule)
+            rule.setdefault('name', f"rule-{number}")
+            kind = RULE_KINDS.get(rule.get('kind'))
+            if kind is None:
+                raise ScenarioError(f"scenario rule {rule['name']!r}: kind must be one of {', '.join(RULE_KINDS)}")
+            if rule.get('dataset') not in datasets:
+                raise ScenarioError(f"scenario rule {rule['name']!r}: dataset must be one of {', '.join(datasets)}")
+            entities, signals = datasets[rule['dataset']]
+            if rule.get('signal') not in signals or rule.get('of', rule['signal']) not in signals:
+                raise ScenarioError(f"scenario rule {rule['name']!r}: signals are {', '.join(signals)}")
+            unknown = [name for name in rule.get('entities') or () if name not in entities]
+            if unknown:
+                raise ScenarioError(f"scenario rule {rule['name']!r}: unknown entities {', '.join(unknown)}")
+            try:
+                rules.append(kind(rule, signals))
+            except ScenarioError:
+                raise
+            except (KeyError, TypeError, ValueError) as e:
+                raise ScenarioError(f"scenario rule {rule['name']!r}: missing or invalid parameter {e}") from None
+        digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+        return cls(rules, digest)
+
+    @classmethod
+    def from_file(cls, path, datasets):
+        with open(path) as f:
+            return cls.from_spec(json.load(f), datasets)
+
+    def plan(self, dataset, entities, ticks):
+        """Per time step, per entity: the tuple of rules to apply, in file order
+
+        Only the windows are evaluated per step (once, not per entity); the
+        per-entity rule tuples are built once per distinct set of open windows.
+        """
+        rules = [rule for rule in self.rules if rule.dataset == dataset]
+        per_entity = [[rule for rule in rules if rule.applies_to(entity)] for entity in entities]
+        windowed = [rule for rule in rules if rule.windowed]
+        plans, cache = [], {}
+        for tick in ticks:
+            key = tuple(rule.active(tick) for rule in windowed)
+            if key not in cache:
+                open_rules = {rule for rule, active in zip(windowed, key) if active}
+                cache[key] = tuple(
+                    tuple(rule for rule in entity_rules if not rule.windowed or rule in open_rules)
+                    for entity_rules in per_entity
+                )
+            plans.append(cache[key])
+        return plans
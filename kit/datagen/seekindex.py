@@ -0,0 +1,176 @@
+"""
+Byte-offset seek indexes written next to the csv files (<name>.index.json)
+
+The index sinks record where rows land while the csv is written, so no
+separate indexing pass is needed. The hourly files are time-major (every
+timestamp holds one row per entity, in the index's `entities` order), so a
+day or a month is one contiguous byte range holding every entity's rows.
+Customer consumption is customer-major (one row per billing month, in the
+index's `months` order), so the index keeps the offset of every GRANULE-th
+customer.
+
+byte_range(index, entity, period) gives the range to seek to (or to fetch
+with an HTTP Range request) for an entity and/or a day or month, plus which
+lines of it hold the entity's rows; read_slice() checks the index still
+covers the whole csv, does the seek and yields the row dicts:
+
+    rows = list(read_slice('data/water-quality-monitoring.csv', 'Station-12-Suburb-West', '2024-08-15'))
+
+Offsets are byte offsets; every indexed file is ASCII.
+"""
+
+import csv
+import json
+import os
+from collections import namedtuple
+from itertools import accumulate, groupby
+from operator import itemgetter
+from pathlib import Path
+
+# Customers per entry of the customer-consumption index
+GRANULE = 100
+
+# Where to find rows in an indexed csv: lines first, first + step, ... (count
+# of them) of the bytes [start, end)
+Slice = namedtuple('Slice', 'start end first step count')
+
+day_of = itemgetter(slice(0, 10))
+
+
+def index_path(csv_path):
+    """<name>.index.json next to <name>.csv"""
+    return csv_path.with_suffix('.index.json')
+
+
+def header_bytes(schema):
+    """Length of the csv header row CsvSink writes for a schema"""
+    return len(','.join(schema)) + 2
+
+
+def load_index(csv_path, size=None):
+    """The index saved with csv_path; with `size`, it must cover exactly that many bytes"""
+    path = index_path(csv_path)
+    if not path.exists():
+        raise ValueError(f"{csv_path} has no seek index ({path.name}); generate it once with --index")
+    with open(path) as f:
+        index = json.load(f)
+    if size is not None and index['bytes'] != size:
+        raise ValueError(f"{path.name} is stale ({csv_path.name} changed since it was indexed); "
+                         f"regenerate it without --append")
+    return index
+
+
+def save_index(csv_path, index):
+    with open(index_path(csv_path), 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+        f.write('\n')
+
+
+class TimeIndexSink:
+    """Records the byte range and row count of every day and month of a time-major csv"""
+
+    def __init__(self, path, schema, entities, append=False):
+        self.path = path
+        if append:
+            self.index = load_index(path, os.path.getsize(path))
+        else:
+            header = header_bytes(schema)
+            self.index = {'layout': 'time', 'entities': list(entities), 'header': header, 'bytes': header,
+                          'rows': 0, 'days': {}, 'months': {}}
+
+    def _extend(self, ranges, key, start, size, rows):
+        if key in ranges:  # a day or month continued from the previous block
+            ranges[key][1] += size
+            ranges[key][2] += rows
+        else:
+            ranges[key] = [start, start + size, rows]
+
+    def write(self, block):
+        lines = block.text.split('\r\n')
+        lines.pop()
+        index = self.index
+        for day, group in groupby(lines, key=day_of):
+            group = list(group)
+            size = sum(map(len, group)) + 2 * len(group)
+            self._extend(index['days'], day, index['bytes'], size, len(group))
+            self._extend(index['months'], day[:7], index['bytes'], size, len(group))
+            index['bytes'] += size
+        index['rows'] += len(lines)
+
+    def close(self):
+        save_index(self.path, self.index)
+
+
+class CustomerIndexSink:
+    """Records the byte offset of every GRANULE-th customer of a customer-major csv"""
+
+    def __init__(self, path, schema, months):
+        self.path = path
+        header = header_bytes(schema)
+        self.index = {'layout': 'customer', 'months': [f"{year}-{month:02d}" for year, month in months],
+                      'granule': GRANULE, 'header': header, 'bytes': header, 'rows': 0, 'customers': []}
+
+    def write(self, block):
+        lines = block.text.split('\r\n')
+        lines.pop()
+        index = self.index
+        every = GRANULE * len(index['months'])
+        offsets = list(accumulate((len(line) + 2 for line in lines), initial=index['bytes']))
+        index['customers'].extend(offsets[(-index['rows']) % every:len(lines):every])
+        index['bytes'] = offsets[-1]
+        index['rows'] += len(lines)
+
+    def close(self):
+        save_index(self.path, self.index)
+
+
+def _position(names, name, kind):
+    try:
+        return names.index(name)
+    except ValueError:
+        raise ValueError(f"unknown {kind} {name!r}") from None
+
+
+def byte_range(index, entity=None, period=None):
+    """Slice of an indexed csv holding an entity's rows for a day or month (either may be None for all)"""
+    if index['layout'] == 'time':
+        num_entities = len(index['entities'])
+        if period is None:
+            start, end, rows = index['header'], index['bytes'], index['rows']
+        else:
+            ranges = index['days'] if len(period) == 10 else index['months']
+            if period not in ranges:
+                raise ValueError(f"no rows for {period!r}")
+            start, end, rows = ranges[period]
+        if entity is None:
+            return Slice(start, end, 0, 1, rows)
+        return Slice(start, end, _position(index['entities'], entity, "entity"), num_entities, rows // num_entities)
+
+    months = index['months']
+    month = None if period is None else _position(months, period, "billing month")
+    num_customers = index['rows'] // len(months)
+    if entity is None:
+        if month is None:
+            return Slice(index['header'], index['bytes'], 0, 1, index['rows'])
+        return Slice(index['header'], index['bytes'], month, len(months), num_customers)
+    customer = int(entity.rsplit('-', 1)[1])
+    if not 1 <= customer <= num_customers:
+        raise ValueError(f"unknown customer {entity!r}")
+    granule, position = divmod(customer - 1, index['granule'])
+    offsets = index['customers']
+    start, end = offsets[granule], offsets[granule + 1] if granule + 1 < len(offsets) else index['bytes']
+    first = position * len(months)
+    if month is None:
+        return Slice(start, end, first, 1, len(months))
+    return Slice(start, end, first + month, 1, 1)
+
+
+def read_slice(csv_path, entity=None, period=None):
+    """Yield the row dicts of an entity for a day or month, reading only the indexed byte range"""
+    csv_path = Path(csv_path)
+    span = byte_range(load_index(csv_path, os.path.getsize(csv_path)), entity, period)
+    with open(csv_path, 'rb') as f:
+        fieldnames = next(csv.reader([f.readline().decode()]))
+        f.seek(span.start)
+        lines = f.read(span.end - span.start).decode().split('\r\n')
+    yield from csv.DictReader(lines[span.first::span.step][:span.count], fieldnames=fieldnames)
@@ -0,0 +1,109 @@
+"""
+Seed derivation, shard planning and rendering shared by every dataset
+"""
+
+import csv
+import hashlib
+import io
+from collections import deque, namedtuple
+from itertools import islice
+
+from .metrics import timed
+
+# Time-series datasets are generated in shards of a week of hourly steps and
+# customers in blocks of 500; every shard draws from its own seed stream, so
+# output never depends on how many workers produced it or which slice of it a
+# caller asked for.
+SHARD_STEPS = 7 * 24
+CUSTOMER_SHARD_SIZE = 500
+
+# The vectorized customer engine draws much larger blocks of accounts per shard
+# so millions of customers stay a few hundred tasks.
+NUMPY_CUSTOMER_SHARD_SIZE = 25000
+
+# A rendered slice of a dataset: row count, csv text, when columnar output is
+# requested {column: (typed array, validity mask or None)}, the seconds its
+# shard spent per phase ({'generate': ..., 'format': ...}, see datagen.metrics)
+# and, when labels are requested, the anomaly label tuples of its rows
+Block = namedtuple('Block', 'rows text columns timings labels', defaults=(None, None))
+
+
+def derive_seed(*keys):
+    """Stable 64-bit seed for a dataset/shard, independent of every other stream"""
+    digest = hashlib.sha256(":".join(map(str, keys)).encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def time_shards(start, end, freq):
+    """(first_step, num_steps) pairs covering [start, end) at `freq` spacing"""
+    num_steps = -((start - end) // freq)
+    return [(first, min(SHARD_STEPS, num_steps - first)) for first in range(0, num_steps, SHARD_STEPS)]
+
+
+def customer_shards(num_customers, size=CUSTOMER_SHARD_SIZE):
+    """(first_customer_id, num_customers) pairs covering customer ids 1..num_customers"""
+    return [(first, min(size, num_customers + 1 - first)) for first in range(1, num_customers + 1, size)]
+
+
+def render_rows(rows, schema, columnar):
+    """Render a list of tuple rows (in schema column order) as a Block"""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    columns = None
+    if columnar:
+        from .sinks import to_columns  # NumPy is only imported when typed columns are wanted
+        columns = to_columns(rows, schema)
+    return Block(len(rows), buf.getvalue(), columns)
+
+
+def render_shard(generator, schema, columnar, *params):
+    """Run one shard's row generator and render it as a Block"""
+    timings = {}
+    with timed(timings, 'generate'):
+        rows = list(generator(*params))
+    with timed(timings, 'format'):
+        block = render_rows(rows, schema, columnar)
+    return block._replace(timings=timings)
+
+
+def render_labeled_shard(generator, schema, columnar, *params):
+    """render_shard, also collecting the anomaly labels the generator reports (passed as its last argument)"""
+    labels = []
+    block = render_shard(generator, schema, columnar, *params, labels)
+    return block._replace(labels=labels)
+
+
+def drop_rows(block, num_rows):
+    """A Block without its first num_rows csv rows (typed columns are not kept)"""
+    if num_rows == 0:
+        return block
+    return Block(block.rows - num_rows, block.text.split('\r\n', num_rows)[num_rows], None, block.timings)
+
+
+def row_blocks(rows, schema, columnar, chunk_rows):
+    """Render an iterable of tuple rows as Blocks of at most chunk_rows rows"""
+    rows = iter(rows)
+    while True:
+        timings = {}
+        with timed(timings, 'generate'):
+            chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        with timed(timings, 'format'):
+            block = render_rows(chunk, schema, columnar)
+        yield block._replace(timings=timings)
+
+
+def run_shards(fn, tasks, executor=None, in_flight=1):
+    """Yield fn(*task) for each task in order, with at most in_flight shards pending"""
+    if executor is None:
+        for task in tasks:
+            yield fn(*task)
+        return
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(fn, *task))
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,383 @@
+"""
+Output sinks: csv (plain or compressed), typed columnar files (NPZ/Parquet)
+and daily/monthly rollups
+"""
+
+import csv
+import gzip
+import lzma
+import queue
+import shutil
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for --engine numpy and --columnar
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for --columnar parquet
+    pa = pq = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is only needed for --compress zstd
+    zstandard = None
+
+from .metrics import DatasetMetrics, merge_timings, timed
+
+# Rows per Parquet row group
+ROW_GROUP_ROWS = 65536
+
+# Compressed csv siblings: codec -> (suffix, level). The files are written once
+# and served many times (nginx gzip_static), so the levels favour size.
+CODECS = {'gzip': ('.gz', 9), 'xz': ('.xz', 6), 'zstd': ('.zst', 19)}
+
+# Blocks queued for a compression thread before the generator waits on it
+COMPRESS_QUEUE_BLOCKS = 8
+
+
+def to_columns(rows, schema):
+    """Convert tuple rows to typed arrays following a {column: kind} schema
+
+    Kinds: 'timestamp' (int64 epoch seconds), 'category' and 'string' (object
+    arrays, dictionary-encoded by the sinks for categories), 'flag' (bool from
+    'Yes'/'No') and 'float'. Columns containing None get a validity mask.
+    """
+    columns = {}
+    for i, (name, kind) in enumerate(schema.items()):
+        values = [row[i] for row in rows]
+        valid = np.array([v is not None for v in values]) if None in values else None
+        if kind == 'timestamp':
+            array = np.array(['NaT' if v is None else v for v in values], dtype='datetime64[s]').astype(np.int64)
+        elif kind == 'float':
+            array = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        elif kind == 'flag':
+            array = np.array(values, dtype=object) == 'Yes'
+        else:
+            array = np.array(values, dtype=object)
+        columns[name] = (array, valid)
+    return columns
+
+
+class CsvSink:
+    """Streams Block csv text to a file under a header row, or onto the end of an existing one"""
+
+    def __init__(self, path, schema, append=False):
+        self.file = open(path, 'a' if append else 'w', newline='')
+        if not append:
+            csv.writer(self.file).writerow(list(schema))
+
+    def write(self, block):
+        self.file.write(block.text)
+
+    def close(self):
+        self.file.close()
+
+
+def open_compressed(path, codec):
+    """Binary writer for a codec from CODECS; gzip members carry no timestamp so rebuilds are identical"""
+    level = CODECS[codec][1]
+    if codec == 'gzip':
+        return gzip.GzipFile(path, 'wb', compresslevel=level, mtime=0)
+    if codec == 'xz':
+        return lzma.open(path, 'wb', preset=level)
+    return zstandard.ZstdCompressor(level=level).stream_writer(open(path, 'wb'))
+
+
+class CompressedCsvSink:
+    """Streams the csv (header plus Block text) to <name>.csv.gz/.xz/.zst from a background thread
+
+    zlib, lzma and zstd release the GIL while compressing, so the thread
+    overlaps with generation; a bounded queue keeps at most
+    COMPRESS_QUEUE_BLOCKS blocks waiting for it.
+    """
+
+    def __init__(self, path, schema, codec):
+        self.file = open_compressed(path.with_name(path.name + CODECS[codec][0]), codec)
+        self.queue = queue.Queue(COMPRESS_QUEUE_BLOCKS)
+        self.error = None
+        self.timings = {}  # compress phase, timed in the thread
+        self.thread = threading.Thread(target=self._run, name=f"compress-{path.name}", daemon=True)
+        self.thread.start()
+        self.queue.put((','.join(schema) + '\r\n').encode())
+
+    def _run(self):
+        # After a failure the queue is still drained, so the generator never blocks; write()/close() re-raise
+        for data in iter(self.queue.get, None):
+            if self.error is None:
+                try:
+                    with timed(self.timings, 'compress'):
+                        self.file.write(data)
+                except Exception as e:
+                    self.error = e
+        try:
+            with timed(self.timings, 'compress'):
+                self.file.close()
+        except Exception as e:
+            self.error = self.error or e
+
+    def write(self, block):
+        if self.error is not None:
+            raise self.error
+        self.queue.put(block.text.encode())
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+class CategoryEncoder:
+    """Incremental dictionary encoding shared by every block of a column"""
+
+    def __init__(self):
+        self.index = {}
+
+    def encode(self, values, valid):
+        codes = np.full(len(values), -1, dtype=np.int32)
+        present = values if valid is None else values[valid]
+        uniques, inverse = np.unique(present.astype(str), return_inverse=True)
+        lookup = np.array([self.index.setdefault(v, len(self.index)) for v in uniques.tolist()], dtype=np.int32)
+        if valid is None:
+            codes[:] = lookup[inverse]
+        else:
+            codes[valid] = lookup[inverse]
+        return codes
+
+    @property
+    def categories(self):
+        return list(self.index)
+
+
+class NpzSink:
+    """Writes typed columns to an .npz archive without holding them in memory
+
+    Each column is streamed to a scratch file and zipped as <column>.npy at
+    close. Categories and strings are stored as int32 codes (-1 = null) plus
+    <column>.categories.npy; nullable columns also get <column>.valid.npy.
+    """
+
+    def __init__(self, path, schema):
+        self.path = path
+        self.schema = schema
+        self.scratch = tempfile.TemporaryDirectory(dir=path.parent, prefix='.npz-')
+        self.arrays = {}  # array name -> [file, dtype, length]
+        self.encoders = {name: CategoryEncoder() for name, kind in schema.items() if kind in ('category', 'string')}
+
+    def _append(self, name, array):
+        if name not in self.arrays:
+            self.arrays[name] = [open(Path(self.scratch.name) / name, 'w+b'), array.dtype, 0]
+        entry = self.arrays[name]
+        entry[0].write(np.ascontiguousarray(array).tobytes())
+        entry[2] += len(array)
+
+    def write(self, block):
+        for name, (array, valid) in block.columns.items():
+            if name in self.encoders:
+                array = self.encoders[name].encode(array, valid)
+            self._append(name, array)
+            valid_name = f"{name}.valid"
+            if valid is not None and valid_name not in self.arrays:
+                self._append(valid_name, np.ones(self.arrays[name][2] - len(array), dtype=bool))
+            if valid_name in self.arrays:
+                self._append(valid_name, np.ones(len(array), dtype=bool) if valid is None else valid)
+
+    def close(self):
+        with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for name, (f, dtype, length) in self.arrays.items():
+                header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (length,)}
+                with archive.open(f"{name}.npy", 'w', force_zip64=True) as out:
+                    np.lib.format.write_array_header_1_0(out, header)
+                    f.seek(0)
+                    shutil.copyfileobj(f, out)
+                f.close()
+            for name, encoder in self.encoders.items():
+                with archive.open(f"{name}.categories.npy", 'w') as out:
+                    np.lib.format.write_array(out, np.array(encoder.categories, dtype=str))
+        self.scratch.cleanup()
+
+
+class ParquetSink:
+    """Writes typed columns to Parquet in row groups of ROW_GROUP_ROWS rows
+
+    Categories are dictionary-encoded, flags are booleans and timestamps are
+    int64 epoch seconds.
+    """
+
+    ARROW_TYPES = {'timestamp': 'int64', 'float': 'float64', 'flag': 'bool_', 'string': 'string'}
+
+    def __init__(self, path, schema):
+        self.schema = schema
+        self.arrow_schema = pa.schema([
+            pa.field(name, pa.dictionary(pa.int32(), pa.string()) if kind == 'category'
+                     else getattr(pa, self.ARROW_TYPES[kind])(),
+                     metadata={'unit': 'epoch_s'} if kind == 'timestamp' else None)
+            for name, kind in schema.items()
+        ])
+        self.writer = pq.ParquetWriter(path, self.arrow_schema, compression='zstd')
+        self.encoders = {name: CategoryEncoder() for name, kind in schema.items() if kind == 'category'}
+        self.pending = []
+        self.pending_rows = 0
+
+    def write(self, block):
+        columns = {}
+        for name, (array, valid) in block.columns.items():
+            if name in self.encoders:
+                array = self.encoders[name].encode(array, valid)
+            columns[name] = (array, np.ones(len(array), dtype=bool) if valid is None else valid)
+        self.pending.append(columns)
+        self.pending_rows += block.rows
+        if self.pending_rows >= ROW_GROUP_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if not self.pending:
+            return
+        arrays = []
+        for field in self.arrow_schema:
+            values = np.concatenate([columns[field.name][0] for columns in self.pending])
+            mask = ~np.concatenate([columns[field.name][1] for columns in self.pending])
+            if field.name in self.encoders:
+                indices = pa.array(values, mask=mask)
+                arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(self.encoders[field.name].categories)))
+            else:
+                arrays.append(pa.array(values, type=field.type, mask=mask if mask.any() else None))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.arrow_schema))
+        self.pending = []
+        self.pending_rows = 0
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+class RollupSink:
+    """Accumulates daily and monthly per-entity rollups while a dataset streams
+
+    Blocks are reduced with NumPy group-bys and merged into running
+    count/sum/min/max state, so only one row per (period, entity) is kept.
+    Writes <name>.daily.csv and <name>.monthly.csv next to the dataset.
+    """
+
+    def __init__(self, path, rollup):
+        self.path = path
+        self.rollup = rollup
+        self.encoder = CategoryEncoder()
+        self.split_columns = [] if rollup.split is None else [
+            f"{column}_{value.lower().replace('-', '_')}" for value in rollup.split[1] for column in rollup.split[2]
+        ]
+        # State layout: readings, (count, sum, min, max) per stat, yes-count per rate, split sums
+        self.layout = (['readings'] + [f"{c}_{agg}" for c in rollup.stats for agg in ('count', 'sum', 'min', 'max')]
+                       + [f"{flag}_yes" for flag in rollup.rates] + self.split_columns)
+        self.is_min = np.array([name.endswith('_min') for name in self.layout])
+        self.is_max = np.array([name.endswith('_max') for name in self.layout])
+        self.state = {'daily': {}, 'monthly': {}}
+
+    def write(self, block):
+        columns = block.columns
+        codes = self.encoder.encode(*columns[self.rollup.entity])
+        seconds = columns['timestamp'][0]
+        periods = {
+            'daily': seconds // 86400,
+            'monthly': seconds.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64),
+        }
+        for granularity, period in periods.items():
+            groups, inverse = np.unique(period * 2 ** 20 + codes, return_inverse=True)
+            self._merge(granularity, groups, self._reduce(columns, inverse, len(groups)))
+
+    def _reduce(self, columns, inverse, n):
+        stats = [np.bincount(inverse, minlength=n).astype(np.float64)]
+        for column in self.rollup.stats:
+            values = columns[column][0]
+            present = ~np.isnan(values)
+            lo, hi = np.full(n, np.inf), np.full(n, -np.inf)
+            np.minimum.at(lo, inverse[present], values[present])
+            np.maximum.at(hi, inverse[present], values[present])
+            stats += [np.bincount(inverse, weights=present, minlength=n),
+                      np.bincount(inverse, weights=np.where(present, values, 0.0), minlength=n), lo, hi]
+        for flag in self.rollup.rates:
+            stats.append(np.bincount(inverse, weights=columns[flag][0], minlength=n))
+        if self.rollup.split is not None:
+            category, values, summed = self.rollup.split
+            for value in values:
+                selected = columns[category][0] == value
+                for column in summed:
+                    weights = np.where(selected, np.nan_to_num(columns[column][0]), 0.0)
+                    stats.append(np.bincount(inverse, weights=weights, minlength=n))
+        return np.column_stack(stats)
+
+    def _merge(self, granularity, groups, reduced):
+        state = self.state[granularity]
+        for group, row in zip(groups.tolist(), reduced):
+            previous = state.get(group)
+            if previous is None:
+                state[group] = row
+            else:
+                state[group] = np.where(self.is_min, np.minimum(previous, row),
+                                        np.where(self.is_max, np.maximum(previous, row), previous + row))
+
+    def _rows(self, granularity):
+        entities = self.encoder.categories
+        for group in sorted(self.state[granularity]):
+            period, code = divmod(group, 2 ** 20)
+            label = str(np.datetime64(period, 'D' if granularity == 'daily' else 'M'))
+            values = dict(zip(self.layout, self.state[granularity][group].tolist()))
+            readings = values['readings']
+            row = {'period': label, self.rollup.entity: entities[code], 'readings': int(readings)}
+            for column in self.rollup.stats:
+                count = values[f"{column}_count"]
+                row[f"{column}_count"] = int(count)
+                row[f"{column}_sum"] = round(values[f"{column}_sum"], 3)
+                row[f"{column}_min"] = round(values[f"{column}_min"], 3) if count else None
+                row[f"{column}_max"] = round(values[f"{column}_max"], 3) if count else None
+                row[f"{column}_avg"] = round(values[f"{column}_sum"] / count, 4) if count else None
+            for flag in self.rollup.rates:
+                row[f"{flag}_yes"] = int(values[f"{flag}_yes"])
+                row[f"{flag}_rate"] = round(100 * values[f"{flag}_yes"] / readings, 2)
+            for name, (numerator, denominator) in self.rollup.ratios.items():
+                total = values[f"{denominator}_sum"]
+                row[name] = round(100 * values[f"{numerator}_sum"] / total, 2) if total else None
+            for name in self.split_columns:
+                row[name] = round(values[name], 2)
+            yield row
+
+    def close(self):
+        for granularity in self.state:
+            rows = list(self._rows(granularity))
+            path = self.path.with_name(f"{self.path.stem}.{granularity}.csv")
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['period', self.rollup.entity])
+                writer.writeheader()
+                writer.writerows(rows)
+
+
+def write_blocks(blocks, sinks, metrics=None):
+    """Feed every Block to every sink and return the row count
+
+    With a DatasetMetrics, the time spent in the sinks is its write phase and
+    every Block (with its shard's timings) is counted there.
+    """
+    if metrics is None:
+        metrics = DatasetMetrics(None)
+    count = 0
+    try:
+        for block in blocks:
+            with metrics.phase('write'):
+                for sink in sinks:
+                    sink.write(block)
+            metrics.block(block)
+            count += block.rows
+    finally:
+        with metrics.phase('write'):
+            for sink in sinks:
+                sink.close()
+        for sink in sinks:
+            merge_timings(metrics.timings, getattr(sink, 'timings', None))
+    return count
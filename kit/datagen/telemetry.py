@@ -0,0 +1,363 @@
+"""
+Real-time telemetry simulator: replays the hourly station, zone and facility
+readings as a paced stream of JSON events
+
+Every (dataset, entity, replica) is a sensor channel with its own asyncio task
+pulling rows from the lazy dataset iterators and releasing them on a
+compressed clock (--hour-ms milliseconds per simulated hour). Events go
+through a bounded queue to a pool of senders:
+
+- http: batches POSTed as JSON arrays over keep-alive HTTP/1.1 connections
+  to --url, an ingest endpoint of your own (the platform backend has none):
+  each array element is one dataset row (its csv columns by name) plus
+  "channel" ("<dataset>/<entity>/<replica>"), and any status below 400
+  counts as delivered
+- tcp:  newline-delimited JSON over plain TCP connections
+- sse:  a local Server-Sent Events endpoint broadcasting to every client
+
+A full queue either blocks the channels (--on-full block, the default: the
+clock falls behind and send lag grows) or drops events (--on-full drop).
+Achieved events/sec, send lag (send completion minus scheduled time), queue
+depth, drops and errors are reported every --report-every seconds.
+
+    python stream-telemetry.py --transport http --url http://localhost:8000/ingest --hour-ms 10
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+from urllib.parse import urlsplit
+
+from .datasets import (
+    HOUR, SEED, facilities, iter_energy_usage, iter_network_performance, iter_water_quality, monitoring_stations,
+    pressure_zones, start_date,
+)
+from .shards import derive_seed
+
+# dataset name -> (lazy iterator, entities)
+CHANNELS = {
+    'water-quality': (iter_water_quality, monitoring_stations),
+    'network-performance': (iter_network_performance, pressure_zones),
+    'energy-usage': (iter_energy_usage, facilities),
+}
+
+# Unpaced or late channels yield to the event loop every this many events
+YIELD_EVERY = 64
+
+# Seconds to wait before retrying a connection that could not be reopened
+RECONNECT_DELAY = 0.5
+
+
+class Stats:
+    """Send counters and lags, reported per window and in total"""
+
+    def __init__(self):
+        self.sent = self.dropped = self.errors = 0
+        self.window_sent = 0
+        self.window_lags = []
+        self.lag_total = self.lag_max = 0.0
+
+    def record(self, lags):
+        self.sent += len(lags)
+        self.window_sent += len(lags)
+        self.window_lags.extend(lags)
+        self.lag_total += sum(lags)
+        self.lag_max = max(self.lag_max, max(lags))
+
+    def take_window(self):
+        """(events sent, lags) since the previous call"""
+        sent, lags = self.window_sent, self.window_lags
+        self.window_sent, self.window_lags = 0, []
+        return sent, lags
+
+
+def lag_summary(lags):
+    """p50/p95/max of a list of lags in seconds, formatted in ms"""
+    if not lags:
+        return "lag n/a"
+    lags = sorted(lags)
+    p50, p95 = lags[len(lags) // 2], lags[min(len(lags) - 1, int(len(lags) * 0.95))]
+    return f"lag p50 {p50 * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms, max {lags[-1] * 1000:.1f} ms"
+
+
+# ============================================================================
+# Transports
+# ============================================================================
+class TcpTransport:
+    """Newline-delimited JSON over one TCP connection"""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def send(self, payloads):
+        if self.reader.at_eof():
+            raise ConnectionResetError(f"{self.host}:{self.port} closed the connection")
+        self.writer.write(b''.join(payload + b'\n' for payload in payloads))
+        await self.writer.drain()  # backpressure: waits while the socket buffer is full
+        return True
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass  # already reset by the peer
+
+
+class HttpTransport:
+    """Batches POSTed as a JSON array over one keep-alive HTTP/1.1 connection"""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        self.netloc = parts.netloc
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ssl.create_default_context() if self.https else None
+        )
+
+    async def send(self, payloads):
+        body = b'[' + b','.join(payloads) + b']'
+        self.writer.write(
+            f"POST {self.path} HTTP/1.1\r\nHost: {self.netloc}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while (size := int((await self.reader.readline()).split(b';')[0], 16)):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        else:
+            await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+            await self.open()
+        return status < 400
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass  # already reset by the peer
+
+
+class SseServer:
+    """Local Server-Sent Events endpoint; every client gets its own bounded buffer
+
+    A client whose buffer is full misses the events (counted as dropped)
+    instead of stalling the stream for everyone else.
+    """
+
+    def __init__(self, host, port, client_buffer, stats):
+        self.host, self.port = host, port
+        self.client_buffer = client_buffer
+        self.stats = stats
+        self.clients = set()
+        self.connected = asyncio.Event()
+
+    async def open(self):
+        self.server = await asyncio.start_server(self.serve, self.host, self.port)
+        print(f"Waiting for an SSE client on http://{self.host}:{self.port}/ ...")
+        await self.connected.wait()
+
+    async def serve(self, reader, writer):
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: keep-alive\r\nAccess-Control-Allow-Origin: *\r\n\r\n")
+        buffer = asyncio.Queue(self.client_buffer)
+        self.clients.add(buffer)
+        self.connected.set()
+        try:
+            while True:
+                payloads = await buffer.get()
+                writer.write(b''.join(b'data: ' + payload + b'\n\n' for payload in payloads))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.discard(buffer)
+            writer.close()
+
+    async def send(self, payloads):
+        for buffer in list(self.clients):
+            if buffer.full():
+                self.stats.dropped += len(payloads)
+            else:
+                buffer.put_nowait(payloads)
+        return True
+
+    async def close(self):
+        self.server.close()
+
+
+# ============================================================================
+# Channels and senders
+# ============================================================================
+async def produce(rows, channel, queue, clock, step_seconds, on_full, stats):
+    """Release one channel's rows on the compressed clock into the queue"""
+    loop = asyncio.get_running_loop()
+    for step, row in enumerate(rows):
+        due = clock + step * step_seconds
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif step % YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+        event = (due, json.dumps(dict(row, channel=channel)).encode())
+        if on_full == 'drop':
+            if queue.full():
+                stats.dropped += 1
+            else:
+                queue.put_nowait(event)
+        else:
+            await queue.put(event)
+
+
+async def reconnect(transport):
+    """Replace a broken connection; a failed reopen is retried on the next send"""
+    await transport.close()
+    try:
+        await transport.open()
+    except OSError:
+        await asyncio.sleep(RECONNECT_DELAY)
+
+
+async def send_batches(transport, queue, batch, stats):
+    """Drain the queue through one transport, up to `batch` events per send"""
+    loop = asyncio.get_running_loop()
+    while True:
+        events = [await queue.get()]
+        while len(events) < batch and not queue.empty():
+            events.append(queue.get_nowait())
+        try:
+            ok = await transport.send([payload for _, payload in events])
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            ok = False
+            await reconnect(transport)
+        if ok:
+            now = loop.time()
+            stats.record([now - due for due, _ in events])
+        else:
+            stats.errors += len(events)
+        for _ in events:
+            queue.task_done()
+
+
+async def report(stats, queue, interval):
+    """Print events/sec, lag and queue depth every `interval` seconds"""
+    loop = asyncio.get_running_loop()
+    last = loop.time()
+    while True:
+        await asyncio.sleep(interval)
+        now = loop.time()
+        sent, lags = stats.take_window()
+        print(f"  {sent / (now - last):,.0f} events/s, {lag_summary(lags)}, queue {queue.qsize()}, "
+              f"dropped {stats.dropped:,}, errors {stats.errors:,}")
+        last = now
+
+
+async def simulate(args):
+    stats = Stats()
+    queue = asyncio.Queue(args.queue_size)
+    if args.transport == 'sse':
+        transports = [SseServer(args.host, args.port, args.client_buffer, stats)]
+    elif args.transport == 'tcp':
+        transports = [TcpTransport(args.host, args.port) for _ in range(args.connections)]
+    else:
+        transports = [HttpTransport(args.url) for _ in range(args.connections)]
+    for transport in transports:
+        await transport.open()
+
+    end = start_date + args.hours * HOUR
+    channels = []
+    for replica in range(args.replicas):
+        seed = args.seed if replica == 0 else derive_seed(args.seed, 'telemetry-replica', replica)
+        for name in args.datasets:
+            iterate, entities = CHANNELS[name]
+            channels += [
+                (iterate([entity], start_date, end, seed), f"{name}/{entity}/{replica}") for entity in entities
+            ]
+    print(f"Streaming {len(channels)} channels x {args.hours} hours over {args.transport} "
+          f"(1 simulated hour = {args.hour_ms:g} ms)")
+
+    loop = asyncio.get_running_loop()
+    clock = loop.time() + 0.1
+    senders = [asyncio.create_task(send_batches(transport, queue, args.batch, stats)) for transport in transports]
+    reporter = asyncio.create_task(report(stats, queue, args.report_every))
+    await asyncio.gather(*(produce(rows, channel, queue, clock, args.hour_ms / 1000, args.on_full, stats)
+                           for rows, channel in channels))
+    await queue.join()
+    elapsed = loop.time() - clock
+    for task in senders + [reporter]:
+        task.cancel()
+    for transport in transports:
+        await transport.close()
+
+    print(f"\nSent {stats.sent:,} events in {elapsed:.2f} s ({stats.sent / elapsed:,.0f} events/s); "
+          f"dropped {stats.dropped:,}, errors {stats.errors:,}")
+    if stats.sent:
+        print(f"Send lag: mean {stats.lag_total / stats.sent * 1000:.1f} ms, max {stats.lag_max * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream hourly water utility readings as paced real-time telemetry")
+    parser.add_argument("--transport", choices=["http", "tcp", "sse"], default="http")
+    parser.add_argument(
+        "--url", help="ingest endpoint to POST event batches to, required for --transport http (see the module docs)"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="server to connect to (tcp) or address to serve on (sse)")
+    parser.add_argument("--port", type=int, default=9000, help="port to connect to (tcp) or serve on (sse)")
+    parser.add_argument(
+        "--hour-ms", type=float, default=10.0,
+        help="wall-clock milliseconds per simulated hour; 0 streams as fast as the transport accepts"
+    )
+    parser.add_argument("--hours", type=int, default=8 * 30 * 24, help="simulated hours to stream per channel")
+    parser.add_argument("--datasets", nargs="+", choices=list(CHANNELS), default=list(CHANNELS))
+    parser.add_argument(
+        "--replicas", type=int, default=1,
+        help="copies of every channel, each from its own seed stream, to scale the number of concurrent sensors"
+    )
+    parser.add_argument("--connections", type=int, default=4, help="concurrent tcp/http connections")
+    parser.add_argument("--batch", type=int, default=100, help="most events per POST or socket write")
+    parser.add_argument("--queue-size", type=int, default=10000, help="events buffered between channels and senders")
+    parser.add_argument(
+        "--on-full", choices=["block", "drop"], default="block",
+        help="when the queue is full, hold the channels back (lag grows) or drop their events"
+    )
+    parser.add_argument("--client-buffer", type=int, default=1000, help="batches buffered per SSE client")
+    parser.add_argument("--report-every", type=float, default=1.0, help="seconds between progress reports")
+    parser.add_argument("--seed", type=int, default=SEED, help="root seed every dataset/shard stream is derived from")
+    args = parser.parse_args()
+    for name in ("hours", "replicas", "connections", "batch", "queue_size", "client_buffer"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+    if args.transport == "http" and args.url is None:
+        parser.error("--transport http requires --url")
+    if args.hour_ms < 0 or args.report_every <= 0:
+        parser.error("--hour-ms must not be negative and --report-every must be positive")
+
+    try:
+        asyncio.run(simulate(args))
+    except OSError as e:
+        parser.exit(1, f"{parser.prog}: {e}\n")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Precomputed time axis shared by the hourly generators
+
+The calendar fields every hourly dataset needs (formatted timestamp, date,
+hour, weekday, month and time-of-use rate period) are computed once per time
+step and cached per shard, instead of once per station/zone/facility row in
+each dataset. Scenario windows are evaluated against these ticks once per
+step as well (Scenario.plan).
+"""
+
+import datetime
+from collections import namedtuple
+from functools import lru_cache
+
+HOUR = datetime.timedelta(hours=1)
+
+# Shards kept in the time-axis cache (a year of hourly data is 53 shards)
+CACHED_SHARDS = 256
+
+# Time-of-use tariff: (period, rate per kWh) by hour of day
+PEAK, MID, OFF_PEAK = ('Peak', 0.18), ('Mid', 0.12), ('Off-Peak', 0.08)
+
+# One time step. `summer` is June-August and `weekend` Friday/Saturday;
+# `days_elapsed` counts days since the window start.
+Tick = namedtuple('Tick', [
+    'timestamp', 'text', 'date', 'hour', 'weekday', 'month', 'weekend', 'summer', 'rate_period', 'energy_rate',
+    'days_elapsed',
+])
+
+
+def rate_period(hour):
+    """(period, rate per kWh) of the time-of-use tariff for an hour of day"""
+    if 14 <= hour <= 20:  # Peak hours
+        return PEAK
+    if 6 <= hour < 14 or 20 < hour <= 23:  # Mid-peak
+        return MID
+    return OFF_PEAK
+
+
+@lru_cache(maxsize=CACHED_SHARDS)
+def time_axis(start, first_step, num_steps, freq=HOUR):
+    """Ticks for steps first_step .. first_step + num_steps - 1 of a window starting at `start`"""
+    ticks = []
+    for step in range(first_step, first_step + num_steps):
+        timestamp = start + step * freq
+        date, hour = timestamp.date(), timestamp.hour
+        weekday = timestamp.weekday()
+        period, rate = rate_period(hour)
+        ticks.append(Tick(
+            timestamp=timestamp,
+            text=timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            date=date,
+            hour=hour,
+            weekday=weekday,
+            month=timestamp.month,
+            weekend=weekday in (4, 5),
+            summer=timestamp.month in (6, 7, 8),
+            rate_period=period,
+            energy_rate=rate,
+            days_elapsed=(date - start.date()).days,
+        ))
+    return tuple(ticks)
@@ -0,0 +1,233 @@
+"""
+Scenario variants of the hourly datasets from a cached baseline (generate-variants.py)
+
+Variants share the signal model of the numpy engine (datagen.vectorized) and
+split it in two layers:
+
+- baseline: every entity's base signals (what scenario rules act on: levels,
+  noise and the daily, weekly and seasonal patterns), drawn once per
+  dataset, seed and window shard by shard into a (signals x steps x
+  entities) float64 .npy, next to the csv rows of the scenario-free dataset
+  and their byte offsets. Later runs memory-map them.
+- overlay: a scenario's rules, applied shard by shard to copies of the
+  entities they name. Each rule draws from a seed stream of its own, so it
+  injects the same incidents in every variant that has it. Only the
+  readings a rule changed are rendered; every other row is copied from the
+  baseline csv.
+
+    python generate-variants.py leak-june.json more-exceedances.json
+
+writes <output>/<scenario file stem>/<dataset>.csv (plus the --labels
+sidecars, see datagen.labels) for each scenario. A variant is byte for byte
+what generate-datasets.py --engine numpy writes for the same scenario, seed
+and window.
+"""
+
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import time
+from collections import namedtuple
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is required for the signal arrays
+    np = None
+
+from .datasets import (
+    HOUR, SEED, default_end, facilities, load_scenario, monitoring_stations, pressure_zones, start_date,
+)
+from .labels import labels_path
+from .shards import SHARD_STEPS, time_shards
+from .vectorized import (
+    HOURLY_MODELS, apply_scenario, base_rng, format_rows, scenario_labels, shard_calendar, timestamp_text,
+)
+
+OUTPUT_DIR = Path("data") / "variants"
+
+# Baseline files directory under the output directory (unless --baseline)
+BASELINE_DIR = '_baseline'
+
+# dataset -> (csv file, entities)
+DATASETS = {
+    'water-quality': ('water-quality-monitoring.csv', monitoring_stations),
+    'network-performance': ('distribution-network-performance.csv', pressure_zones),
+    'energy-usage': ('energy-usage.csv', facilities),
+}
+
+# A dataset's baseline: read-only (signals x steps x entities) values, whole
+# shards long, csv row bytes and row offsets
+Baseline = namedtuple('Baseline', 'values text offsets')
+
+
+def _rows(dataset, timestamps, hours, values, entities):
+    """csv lines of readings given their timestamps, hours of day, signals and entities"""
+    _, _, columns = HOURLY_MODELS[dataset]
+    return format_rows(timestamp_text(timestamps).tolist(), columns(values, hours, entities))
+
+
+# Modules next to this one that a baseline is drawn from: the signal model,
+# the entity lists and numbers, the shard seeds and the calendar
+BASELINE_MODULES = ('vectorized.py', 'datasets.py', 'shards.py', 'timeaxis.py')
+
+
+def baseline_key(dataset, start, end, seed):
+    """Hex sha256 of what a baseline depends on: the signal model, the window, the seed and NumPy's generators"""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for module in BASELINE_MODULES:
+        digest.update(Path(__file__).with_name(module).read_bytes())
+    params = {'dataset': dataset, 'start': start, 'end': end, 'seed': seed, 'numpy': np.__version__}
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def load_baseline(directory, dataset, start, end, seed):
+    """A dataset's baseline from `directory`, drawn and rendered there first if missing; (baseline, built)"""
+    _, entities = DATASETS[dataset]
+    _, base, _ = HOURLY_MODELS[dataset]
+    stem = directory / f"{dataset}-{baseline_key(dataset, start, end, seed)[:16]}"
+    paths = [stem.with_suffix('.npy'), stem.with_suffix('.csv'), stem.with_suffix('.offsets.npy')]
+    built = not all(path.exists() for path in paths)
+    if built:
+        directory.mkdir(parents=True, exist_ok=True)
+        shards = time_shards(start, end, HOUR)
+        # The same draws as the numpy engine's shards, padded to whole shards like them
+        values = np.concatenate([
+            np.stack(base(shard_calendar(start, first, SHARD_STEPS), entities, base_rng(seed, dataset, first)))
+            for first, _ in shards
+        ], axis=1)
+        num_steps = shards[-1][0] + shards[-1][1]
+        cal = shard_calendar(start, 0, num_steps)
+        lines = _rows(dataset, np.repeat(cal.timestamps, len(entities)), np.repeat(cal.hour, len(entities)),
+                      values[:, :num_steps].reshape(len(values), -1), entities * num_steps)
+        offsets = np.zeros(len(lines) + 1, dtype=np.int64)
+        np.cumsum([len(line) + 2 for line in lines], out=offsets[1:])  # rows are ASCII
+        # Written under temporary names and renamed, so a partial baseline is never loaded
+        staged = [path.with_name(f".{path.name}.{os.getpid()}") for path in paths]
+        with open(staged[0], 'wb') as f:
+            np.save(f, values)
+        with open(staged[1], 'w', newline='') as f:
+            f.write('\r\n'.join(lines) + '\r\n')
+        with open(staged[2], 'wb') as f:
+            np.save(f, offsets)
+        for temporary, path in zip(staged, paths):
+            os.replace(temporary, path)
+    with open(paths[1], 'rb') as f:
+        text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Baseline(np.load(paths[0], mmap_mode='r'), text, np.load(paths[2])), built
+
+
+def overlay(baseline, dataset, scenario, start, end, seed):
+    """Apply a scenario's rules for one dataset on top of its baseline
+
+    Returns the csv row numbers whose readings changed (ascending), their
+    rendered rows and their label tuples (see datagen.labels).
+    """
+    _, entities = DATASETS[dataset]
+    rules = [rule for rule in scenario.rules if rule.dataset == dataset]
+    touched = [col for col, entity in enumerate(entities) if any(rule.applies_to(entity) for rule in rules)]
+    names = [entities[col] for col in touched]
+    rows, lines, labels = [], [], []
+    for first, num_steps in time_shards(start, end, HOUR):
+        # Copies of the touched entities' signals only; the baseline stays read-only
+        signals = [np.array(values[first:first + SHARD_STEPS, touched]) for values in baseline.values]
+        cal = shard_calendar(start, first, SHARD_STEPS)
+        fired = []
+        apply_scenario(scenario, dataset, names, signals, cal, np.datetime64(start.date()), seed, first, fired)
+        changed = np.zeros((num_steps, len(touched)), dtype=bool)
+        for _, cols, mask in fired:
+            changed[:, cols] |= mask[:num_steps]
+        steps, at = np.nonzero(changed)
+        rows.append((first + steps) * len(entities) + np.array(touched, dtype=np.intp)[at])
+        lines += _rows(dataset, cal.timestamps[steps], cal.hour[steps], [values[steps, at] for values in signals],
+                       [names[col] for col in at.tolist()])
+        labels += scenario_labels(fired, num_steps, timestamp_text(cal.timestamps[:num_steps]).tolist(), names)
+    return np.concatenate(rows), lines, labels
+
+
+def write_variant(path, schema, baseline, changed, lines):
+    """The baseline csv with the changed rows replaced; returns the row count"""
+    text, offsets = baseline.text, baseline.offsets
+    with open(path, 'wb') as f:
+        f.write((','.join(schema) + '\r\n').encode())
+        done = 0
+        for row, line in zip(changed.tolist(), lines):
+            f.write(text[offsets[done]:offsets[row]])
+            f.write(line.encode() + b'\r\n')
+            done = row + 1
+        f.write(text[offsets[done]:])
+    return len(offsets) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate scenario variants of the hourly datasets on top of a cached baseline"
+    )
+    parser.add_argument(
+        "scenarios", nargs="+", type=Path,
+        help="scenario JSON files (see datagen/scenarios.py), one variant each"
+    )
+    parser.add_argument(
+        "--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS), help="hourly datasets to write"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=OUTPUT_DIR,
+        help="directory of the variants, one subdirectory per scenario file (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--baseline", type=Path,
+        help=f"directory of the cached baselines, shared by every variant (default: <output>/{BASELINE_DIR})"
+    )
+    parser.add_argument("--seed", type=int, default=SEED, help="root seed of the baseline and overlay streams")
+    parser.add_argument(
+        "--end", type=datetime.datetime.fromisoformat, default=default_end(start_date),
+        help="end of the generated window, exclusive (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--labels", action="store_true",
+        help="also write the ground-truth labels of each variant (<dataset>.labels.csv)"
+    )
+    args = parser.parse_args()
+    if np is None:
+        parser.error("variant generation requires NumPy (pip install numpy)")
+    if args.end <= start_date:
+        parser.error(f"--end must be after {start_date}")
+    stems = [path.stem for path in args.scenarios]
+    if len(set(stems)) < len(stems):
+        parser.error("scenario files must have distinct names (each names its variant directory)")
+    scenarios = []
+    for path in args.scenarios:
+        try:
+            scenarios.append(load_scenario(path))
+        except (OSError, ValueError) as e:
+            parser.error(f"{path}: {e}")
+
+    baseline_dir = args.output / BASELINE_DIR if args.baseline is None else args.baseline
+    baselines = {}
+    for dataset in args.datasets:
+        began = time.perf_counter()
+        baselines[dataset], built = load_baseline(baseline_dir, dataset, start_date, args.end, args.seed)
+        print(f"Baseline {dataset}: {'drew and rendered' if built else 'memory-mapped'} in "
+              f"{time.perf_counter() - began:.2f}s")
+
+    for stem, scenario in zip(stems, scenarios):
+        directory = args.output / stem
+        directory.mkdir(parents=True, exist_ok=True)
+        print(f"\nVariant {stem} ({directory}/)")
+        for dataset in args.datasets:
+            began = time.perf_counter()
+            filename, _ = DATASETS[dataset]
+            schema, _, _ = HOURLY_MODELS[dataset]
+            changed, lines, labels = overlay(baselines[dataset], dataset, scenario, start_date, args.end, args.seed)
+            count = write_variant(directory / filename, schema, baselines[dataset], changed, lines)
+            if args.labels:
+                with open(labels_path(directory / filename), 'w', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['timestamp', list(schema)[1], 'signal', 'rule'])
+                    writer.writerows(labels)
+            print(f"  {filename}: {len(changed):,} of {count:,} rows overlaid in {time.perf_counter() - began:.2f}s")
@@ -0,0 +1,521 @@
+"""
+Vectorized NumPy engine for the hourly datasets and customer consumption
+
+Draws whole (time steps x entities) and (customers x billing months) shards
+at once and formats them to the csv text of round() + str() (through lookup
+tables for clipped columns; round_fixed settles the halves np.rint would
+round apart from round()).
+
+The hourly signal model is split in layers that datagen.variants reuses:
+base signals (levels, noise and the daily, weekly and seasonal patterns),
+scenario rules (masked array versions of datagen.scenarios, each drawing
+from its own seed stream) and the csv columns rendered from the signals.
+"""
+
+import datetime
+from collections import namedtuple
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for --engine numpy
+    np = None
+
+from .datasets import (
+    CONSUMPTION_ANOMALIES, CONSUMPTION_SCHEMA, ENERGY_SCHEMA, FLAG, NETWORK_SCHEMA, QUALITY_SCHEMA, REPLICA,
+    customer_profiles, customer_types, entity_number, load_scenario, monitoring_stations, pressure_zones,
+)
+from .scenarios import Drift, Excursion, Floor, Leak, Offset, Ratio, Spike
+from .metrics import timed
+from .shards import NUMPY_CUSTOMER_SHARD_SIZE, SHARD_STEPS, Block, derive_seed
+from .timeaxis import HOUR, rate_period
+
+
+@lru_cache(maxsize=None)
+def _decimal_strings(lo, hi, decimals):
+    """Lookup table of str(round(x, decimals)) for every value in [lo, hi]."""
+    scale = 10 ** decimals
+    first, last = round(lo * scale), round(hi * scale)
+    return first, scale, np.array([str(k / scale) for k in range(first, last + 1)], dtype=object)
+
+
+# Scaled values this close to a half are rounded by round() itself
+TIE_TOLERANCE = 1e-6
+
+
+def round_fixed(values, decimals):
+    """round(x, decimals) * 10 ** decimals of a float array, as float integers
+
+    np.rint(values * scale) rounds the scaled binary product, which can land
+    on the other side of a half than round() does on the exact value (0.285
+    is stored below 28.5 / 100), so values within TIE_TOLERANCE of a half
+    are rounded with round().
+    """
+    scale = 10 ** decimals
+    scaled = values * scale
+    rounded = np.rint(scaled)
+    ties = np.abs(np.abs(scaled - rounded) - 0.5) < TIE_TOLERANCE
+    if ties.any():
+        rounded[ties] = np.rint(np.array([round(value, decimals) for value in values[ties].tolist()]) * scale)
+    return rounded
+
+
+def _format_fixed(values, lo, hi, decimals):
+    """Format clipped float arrays as csv strings matching round() + str()."""
+    first, scale, table = _decimal_strings(lo, hi, decimals)
+    return table[round_fixed(values, decimals).astype(np.intp) - first].tolist()
+
+
+def _draw_masked(rule, values, rng, mask, cols):
+    """Set or shift the masked readings of a (time x entity) sub-block by uniform draws, in row-major order"""
+    block = values[:, cols]
+    if rule.replace:
+        block[mask] = rng.uniform(rule.low, rule.high, mask.sum())
+    else:
+        block[mask] += rng.uniform(rule.low, rule.high, mask.sum())
+    values[:, cols] = block
+    return mask
+
+
+def _window(rows, cols):
+    """(time x entity) mask of every reading inside the rule's window"""
+    return np.broadcast_to(rows[:, None], (len(rows), len(cols)))
+
+
+def _offset(rule, signals, rng, rows, cols, days, start_day):
+    block = np.ix_(rows, cols)
+    if rule.add is not None:
+        signals[rule.index][block] += rule.add
+    else:
+        signals[rule.index][block] *= rule.scale
+    return _window(rows, cols)
+
+
+def _spike(rule, signals, rng, rows, cols, days, start_day):
+    mask = (rng.random((len(rows), len(cols))) < rule.probability) & rows[:, None]
+    return _draw_masked(rule, signals[rule.index], rng, mask, cols)
+
+
+def _excursion(rule, signals, rng, rows, cols, days, start_day):
+    block = np.ix_(rows, cols)
+    draws = rng.uniform(rule.low, rule.high, (rows.sum(), len(cols)))
+    if rule.replace:
+        signals[rule.index][block] = draws
+    else:
+        signals[rule.index][block] += draws
+    return _window(rows, cols)
+
+
+def _floor(rule, signals, rng, rows, cols, days, start_day):
+    mask = (signals[rule.index][:, cols] < rule.below) & rows[:, None]
+    return _draw_masked(rule, signals[rule.index], rng, mask, cols)
+
+
+def _ratio(rule, signals, rng, rows, cols, days, start_day):
+    block = np.ix_(rows, cols)
+    signals[rule.index][block] = signals[rule.source][block] * rule.ratio
+    return _window(rows, cols)
+
+
+def _leak(rule, signals, rng, rows, cols, days, start_day):
+    elapsed = (days - np.datetime64(rule.first_date)).astype(np.int64)
+    signals[rule.index][np.ix_(rows, cols)] += (elapsed * rule.per_day)[rows][:, None]
+    return _window(rows, cols)
+
+
+def _drift(rule, signals, rng, rows, cols, days, start_day):
+    origin = start_day if rule.first_date == datetime.date.min else np.datetime64(rule.first_date)
+    elapsed = (days - origin).astype(np.int64)
+    signals[rule.index][np.ix_(rows, cols)] *= (1 + (elapsed / 365) * rule.per_year)[rows][:, None]
+    return _window(rows, cols)
+
+
+# Masked array implementation of each scenario rule kind; each returns the
+# (time x rule entity) mask of the readings it changed
+ARRAY_RULES = {
+    Offset: _offset, Spike: _spike, Excursion: _excursion, Floor: _floor, Ratio: _ratio, Leak: _leak, Drift: _drift,
+}
+
+
+def rule_rng(seed, dataset, rule, first_step):
+    """A scenario rule's own draws in one shard, independent of every other rule and of the base signals"""
+    return np.random.default_rng(derive_seed(seed, 'scenario', dataset, rule.name, first_step))
+
+
+def apply_scenario(scenario, dataset, entities, signals, cal, start_day, seed, first_step, fired=None):
+    """Apply a scenario's rules for one dataset, in file order, to one shard's (time x entity) signal arrays in place
+
+    `cal` is the shard's calendar and `start_day` the window start, the origin
+    of drift rules. Every rule draws from rule_rng, so a rule injects the same
+    incidents whichever other rules run and on whichever copy of the signals
+    (datagen.variants applies them to the entities they name only). A `fired`
+    list receives (rule, entity columns, mask of the changed readings) per rule.
+    """
+    for rule in scenario.rules:
+        cols = [col for col, entity in enumerate(entities) if rule.applies_to(entity)]
+        if rule.dataset != dataset or not cols:
+            continue
+        rows = (cal.hour >= rule.first_hour) & (cal.hour <= rule.last_hour)
+        if rule.first_date != datetime.date.min:
+            rows &= cal.days >= np.datetime64(rule.first_date)
+        if rule.last_date != datetime.date.max:
+            rows &= cal.days <= np.datetime64(rule.last_date)
+        rng = rule_rng(seed, dataset, rule, first_step)
+        mask = ARRAY_RULES[type(rule)](rule, signals, rng, rows, cols, cal.days, start_day)
+        if fired is not None:
+            fired.append((rule, cols, mask))
+
+
+def scenario_labels(fired, num_steps, times, entities):
+    """Label tuples (time, entity, signal, rule) of the readings changed in the first num_steps steps
+
+    Ordered like the python generators report them: by step, entity, then rule.
+    """
+    found = []
+    for order, (rule, cols, mask) in enumerate(fired):
+        steps, at = np.nonzero(mask[:num_steps])
+        found += zip(steps.tolist(), np.asarray(cols)[at].tolist(), [order] * len(steps))
+    found.sort()
+    return [(times[step], entities[col], fired[order][0].signal, fired[order][0].name) for step, col, order in found]
+
+
+# ============================================================================
+# Hourly signal model, shared with datagen.variants
+# ============================================================================
+# A shard's time axis: datetime64[s] timestamps, datetime64[D] days, hour of
+# day and the weekend (Friday/Saturday) and summer (June-August) masks
+Calendar = namedtuple('Calendar', 'timestamps days hour weekend summer')
+
+# A float column rounded to `decimals`: `bounds` (lo, hi) of clipped values
+# lets it be formatted through a lookup table, and rows outside `valid` are
+# left empty (None in the python generators)
+Fixed = namedtuple('Fixed', 'values decimals bounds valid', defaults=(None, None))
+
+
+def shard_calendar(start, first_step, num_steps, freq=HOUR):
+    """Calendar of steps first_step .. first_step + num_steps - 1 of a window starting at `start`"""
+    step = np.timedelta64(int(freq.total_seconds()), 's')
+    timestamps = np.datetime64(start, 's') + (first_step + np.arange(num_steps)) * step
+    days = timestamps.astype('datetime64[D]')
+    hour = ((timestamps - days) // np.timedelta64(1, 'h')).astype(int)
+    weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    month = timestamps.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    return Calendar(timestamps, days, hour, np.isin(weekday, [4, 5]), np.isin(month, [6, 7, 8]))
+
+
+def timestamp_text(timestamps):
+    """csv text of datetime64[s] timestamps, as an object array"""
+    return np.char.replace(np.datetime_as_string(timestamps, unit='s'), 'T', ' ').astype(object)
+
+
+def base_rng(seed, dataset, first_step):
+    """The base signal draws of one shard of an hourly dataset"""
+    return np.random.default_rng(derive_seed(seed, f'{dataset}-numpy', first_step))
+
+
+def quality_base(cal, stations, rng):
+    """Base chlorine, pH, turbidity, temperature and conductivity (time x station) of one shard"""
+    station_ids = np.array([entity_number(monitoring_stations, station) for station in stations])
+    shape = (len(cal.hour), len(stations))
+
+    # Base values with station-specific characteristics
+    chlorine = 1.2 + station_ids * 0.1 + rng.normal(0, 0.15, shape)
+    ph = 7.3 + rng.normal(0, 0.15, shape)
+    turbidity = 0.5 + rng.normal(0, 0.3, shape)
+    temperature = 22 + 5 * np.abs(rng.normal(0, 1, shape))
+    conductivity = 450 + rng.normal(0, 30, shape)
+
+    # Time-of-day, day-of-week and seasonal patterns as broadcast adjustments
+    morning = (cal.hour >= 6) & (cal.hour <= 9)
+    evening = (cal.hour >= 18) & (cal.hour <= 21)
+    chlorine += (np.select([morning, evening], [-0.1, -0.15], 0.0) + np.where(cal.weekend, 0.1, 0.0))[:, None]
+    turbidity += (np.select([morning, evening], [0.2, 0.3], 0.0) - np.where(cal.weekend, 0.1, 0.0)
+                  + np.where(cal.summer, 0.3, 0.0))[:, None]
+    temperature += np.where(cal.summer, 5.0, 0.0)[:, None]
+    conductivity += np.where(cal.summer, 20.0, 0.0)[:, None]
+    return [chlorine, ph, turbidity, temperature, conductivity]
+
+
+def network_base(cal, zones, rng):
+    """Base flow, pressure and billed consumption (time x zone) of one shard"""
+    zone_ids = np.array([entity_number(pressure_zones, zone) for zone in zones])
+    shape = (len(cal.hour), len(zones))
+    flow = 500 + zone_ids * 100 + rng.normal(0, 50, shape)
+    pressure = 55 + rng.normal(0, 5, shape)
+    consumption = flow * 0.75  # Assume 25% NRW average
+
+    # Time-of-day (morning and evening peaks, minimum night flow), weekend and summer patterns
+    morning = (cal.hour >= 6) & (cal.hour <= 9)
+    evening = (cal.hour >= 18) & (cal.hour <= 21)
+    night = cal.hour <= 5
+    flow *= (np.select([morning, evening, night], [1.4, 1.3, 0.4], 1.0) * np.where(cal.weekend, 0.85, 1.0)
+             * np.where(cal.summer, 1.25, 1.0))[:, None]
+    consumption *= (np.select([morning, evening, night], [1.5, 1.4, 0.3], 1.0) * np.where(cal.weekend, 0.80, 1.0)
+                    * np.where(cal.summer, 1.30, 1.0))[:, None]
+    pressure += np.select([morning, evening, night], [-8.0, -6.0, 5.0], 0.0)[:, None]
+    return [flow, pressure, consumption]
+
+
+# Offices (a facility or the facility it replicates) run business hours, two of them weekdays only
+OFFICES = ("Admin-Building", "Laboratory", "Operations-Center")
+WEEKDAY_OFFICES = ("Admin-Building", "Laboratory")
+
+
+def _production(facility):
+    return "Treatment" in facility or "Desalination" in facility
+
+
+def _pumping(facility):
+    return "Pumping" in facility or "Booster" in facility
+
+
+def energy_base(cal, facility_names, rng):
+    """Base energy draw (kW, time x facility) of one shard"""
+    kinds = [name.split(REPLICA, 1)[0] for name in facility_names]
+    level = np.array([1200 if _production(kind) else 450 if _pumping(kind) else 25 for kind in kinds])
+    spread = np.array([80 if _production(kind) else 40 if _pumping(kind) else 5 for kind in kinds])
+    office = np.isin(kinds, OFFICES)
+    weekday_only = np.isin(kinds, WEEKDAY_OFFICES)
+    energy = level + spread * rng.normal(0, 1, (len(cal.hour), len(facility_names)))
+
+    # Time-of-day (follows water demand), office hours, weekend and summer (cooling, production) patterns
+    hour = cal.hour[:, None]
+    energy *= np.select([(hour >= 6) & (hour <= 9), (hour >= 18) & (hour <= 21), hour <= 5], [1.5, 1.4, 0.6], 1.0)
+    energy *= np.where(office, np.where((hour >= 8) & (hour <= 17), 3.0, 0.3), 1.0)
+    energy *= np.where(cal.weekend[:, None], np.where(weekday_only, 0.2, 0.85), 1.0)
+    energy *= np.where(cal.summer[:, None], np.where(office, 1.8, 1.15), 1.0)
+    return [energy]
+
+
+def quality_columns(values, hours, entities):
+    """QUALITY_SCHEMA columns (after the timestamp) of readings given their signals"""
+    chlorine = np.clip(values[0], 0.0, 5.0)
+    ph = np.clip(values[1], 6.0, 9.0)
+    turbidity = np.clip(values[2], 0.0, 20.0)
+    chlorine_ok = (chlorine >= 0.2) & (chlorine <= 4.0)
+    ph_ok = (ph >= 6.5) & (ph <= 8.5)
+    turbidity_ok = turbidity < 5.0
+    return [
+        entities, Fixed(chlorine, 3, (0.0, 5.0)), Fixed(ph, 2, (6.0, 9.0)), Fixed(turbidity, 2, (0.0, 20.0)),
+        Fixed(np.clip(values[3], 10.0, 35.0), 1, (10.0, 35.0)),
+        Fixed(np.clip(values[4], 200.0, 1000.0), 1, (200.0, 1000.0)),
+        chlorine_ok, ph_ok, turbidity_ok, chlorine_ok & ph_ok & turbidity_ok,
+    ]
+
+
+def network_columns(values, hours, entities):
+    """NETWORK_SCHEMA columns (after the timestamp) of readings given their signals"""
+    flow = np.maximum(0, values[0])
+    pressure = np.clip(values[1], 20, 100)
+    consumption = np.minimum(np.maximum(0, values[2]), flow)
+    nrw_percent = np.divide((flow - consumption) * 100, flow, out=np.zeros_like(flow), where=flow > 0)
+    return [
+        entities, Fixed(flow, 1), Fixed(pressure, 1, (20.0, 100.0)), Fixed(consumption, 1),
+        Fixed(flow - consumption, 1), Fixed(nrw_percent, 2), (pressure >= 40) & (pressure <= 80),
+    ]
+
+
+# Time-of-use tariff by hour of day
+TARIFF_PERIODS = [rate_period(hour)[0] for hour in range(24)]
+TARIFF_RATES = [rate_period(hour)[1] for hour in range(24)]
+
+
+def energy_columns(values, hours, entities):
+    """ENERGY_SCHEMA columns (after the timestamp) of readings given their signals"""
+    energy = np.maximum(0, values[0])
+    rate = np.array(TARIFF_RATES)[hours]
+    kinds = [name.split(REPLICA, 1)[0] for name in entities]
+    gallons_per_kwh = np.array([0.5 if _production(kind) else 1.2 if _pumping(kind) else 0.0 for kind in kinds])
+    water = energy * gallons_per_kwh
+    produced = water > 0
+    efficiency = np.divide(water, energy, out=np.zeros_like(water), where=produced)
+    return [
+        entities, Fixed(energy, 2), Fixed(energy * rate, 2), Fixed(rate, 3),
+        np.array(TARIFF_PERIODS, dtype=object)[hours].tolist(), Fixed(water, 1, valid=produced),
+        Fixed(efficiency, 3, valid=efficiency > 0),
+    ]
+
+
+def _text(column):
+    """csv text of one rendered column"""
+    if isinstance(column, Fixed):
+        if column.bounds is not None:
+            strings = _format_fixed(column.values, *column.bounds, column.decimals)
+        else:
+            strings = list(map(str, (round_fixed(column.values, column.decimals) / 10 ** column.decimals).tolist()))
+        if column.valid is not None:
+            strings = np.where(column.valid, np.array(strings, dtype=object), '').tolist()
+        return strings
+    if isinstance(column, np.ndarray):  # compliance flags
+        return np.array(FLAG, dtype=object)[column.astype(np.intp)].tolist()
+    return column
+
+
+def format_rows(times, columns):
+    """csv lines of rendered columns, after a column of timestamp text"""
+    return list(map(','.join, zip(times, *map(_text, columns))))
+
+
+def typed_columns(timestamps, columns, schema):
+    """{column: (typed array, validity mask or None)} of rendered columns (see sinks.to_columns)"""
+    typed = {}
+    for name, column in zip(schema, [timestamps.astype(np.int64)] + columns):
+        if isinstance(column, Fixed):
+            array = round_fixed(column.values, column.decimals) / 10 ** column.decimals
+            if column.valid is not None:
+                array[~column.valid] = np.nan
+            typed[name] = (array, column.valid)
+        elif isinstance(column, np.ndarray):
+            typed[name] = (column, None)
+        else:
+            typed[name] = (np.array(column, dtype=object), None)
+    return typed
+
+
+# dataset -> (schema, base signals(calendar, entities, rng), columns(values, hours, entities))
+HOURLY_MODELS = {
+    'water-quality': (QUALITY_SCHEMA, quality_base, quality_columns),
+    'network-performance': (NETWORK_SCHEMA, network_base, network_columns),
+    'energy-usage': (ENERGY_SCHEMA, energy_base, energy_columns),
+}
+
+
+def generate_hourly_numpy(dataset, entities, start, first_step, num_steps, seed, columnar=False, freq=HOUR,
+                          scenario=None, labels=False):
+    """Vectorized shard of an hourly dataset: renders a (time steps x entities) block as a Block
+
+    Values are always drawn for a whole shard and cut to num_steps, so a shard
+    cut short by the window end is a prefix of the full one and extending the
+    window (--append) reproduces a full rebuild. Base signals and each
+    scenario rule draw from seed streams of their own, which is what lets
+    datagen.variants rebuild the same rows from a scenario-free baseline.
+    With `labels`, the Block carries the scenario labels of its readings.
+    """
+    schema, base, columns = HOURLY_MODELS[dataset]
+    timings = {}
+    with timed(timings, 'generate'):
+        cal = shard_calendar(start, first_step, max(num_steps, SHARD_STEPS), freq)
+        signals = base(cal, entities, base_rng(seed, dataset, first_step))
+        fired = [] if labels else None
+        apply_scenario(scenario or load_scenario(), dataset, entities, signals, cal, np.datetime64(start.date()),
+                       seed, first_step, fired)
+
+    with timed(timings, 'format'):
+        timestamps = np.repeat(cal.timestamps[:num_steps], len(entities))
+        times = timestamp_text(cal.timestamps[:num_steps])
+        rendered = columns([signal[:num_steps].ravel() for signal in signals],
+                           np.repeat(cal.hour[:num_steps], len(entities)), list(entities) * num_steps)
+        text = '\r\n'.join(format_rows(np.repeat(times, len(entities)).tolist(), rendered)) + '\r\n'
+        typed = typed_columns(timestamps, rendered, schema) if columnar else None
+        found = scenario_labels(fired, num_steps, times.tolist(), entities) if labels else None
+
+    return Block(num_steps * len(entities), text, typed, timings, found)
+
+
+def generate_water_quality_numpy(stations, start, first_step, num_steps, seed, columnar=False, freq=HOUR,
+                                 scenario=None, labels=False):
+    """Vectorized Dataset 1 shard (generate_hourly_numpy)"""
+    return generate_hourly_numpy('water-quality', stations, start, first_step, num_steps, seed, columnar, freq,
+                                 scenario, labels)
+
+
+def generate_network_performance_numpy(zones, start, first_step, num_steps, seed, columnar=False, freq=HOUR,
+                                       scenario=None, labels=False):
+    """Vectorized Dataset 2 shard (generate_hourly_numpy)"""
+    return generate_hourly_numpy('network-performance', zones, start, first_step, num_steps, seed, columnar, freq,
+                                 scenario, labels)
+
+
+def generate_energy_usage_numpy(facility_names, start, first_step, num_steps, seed, columnar=False, freq=HOUR,
+                                scenario=None, labels=False):
+    """Vectorized Dataset 3 shard (generate_hourly_numpy)"""
+    return generate_hourly_numpy('energy-usage', facility_names, start, first_step, num_steps, seed, columnar, freq,
+                                 scenario, labels)
+
+
+# Per customer type, in customer_types order: base consumption range
+# (gallons/month) and rate ($ per 1000 gallons)
+BASE_LOW = [3000, 15000, 100000, 20000]
+BASE_HIGH = [12000, 50000, 500000, 80000]
+RATES = [2.50, 3.00, 2.80, 2.20]
+PAYMENT_STATUSES = ["Paid", "Pending", "Overdue"]
+
+
+def generate_customer_consumption_numpy(first_customer, num_customers, months, seed, columnar=False, labels=False):
+    """Vectorized Dataset 5 shard: renders a (customers x billing months) block as a Block
+
+    Values are always drawn for a whole NUMPY_CUSTOMER_SHARD_SIZE shard and cut
+    to num_customers, so a customer's rows only depend on its id (and the seed
+    and months), not on how many customers were requested. With `labels`, the
+    Block carries the labels of its injected anomalies.
+    """
+    timings = {}
+    with timed(timings, 'generate'):
+        rng = np.random.default_rng(derive_seed(seed, 'customer-consumption-numpy', first_customer))
+        drawn = max(num_customers, NUMPY_CUSTOMER_SHARD_SIZE)
+        shape = (drawn, len(months))
+        month = np.array([m for _, m in months])
+
+        # Customer type (from the customer dimension) and base consumption
+        type_index = {name: index for index, name in enumerate(customer_types)}
+        kind = np.array([type_index[profile.customer_type]
+                         for profile in customer_profiles(first_customer, drawn, seed)])
+        low, high = np.array(BASE_LOW, dtype=float)[kind], np.array(BASE_HIGH, dtype=float)[kind]
+        base = low + (high - low) * rng.random(drawn)
+
+        # Billing day, monthly variation and seasonal adjustment (summer higher)
+        day = rng.integers(1, 29, shape)
+        consumption = base[:, None] * rng.uniform(0.8, 1.2, shape)
+        consumption *= np.where(np.isin(month, [6, 7, 8]), rng.uniform(1.3, 1.6, shape), 1.0)
+
+        # Inject anomalies: residential leaks and declining consumption (conservation/vacancy)
+        leak = (kind == 0)[:, None] & (rng.random(shape) < 0.03)
+        consumption *= np.where(leak, rng.uniform(2.5, 5.0, shape), 1.0)
+        decline = rng.random(shape) < 0.05
+        consumption *= np.where(decline, rng.uniform(0.2, 0.5, shape), 1.0)
+
+        rate = np.array(RATES)[kind]
+        bill_amount = (consumption / 1000) * rate[:, None] + 15.00  # Base fee
+        payment = rng.choice(len(PAYMENT_STATUSES), size=shape, p=[0.85, 0.10, 0.05])
+
+    with timed(timings, 'format'):
+        kind, rate, day, consumption, bill_amount, payment = (
+            array[:num_customers] for array in (kind, rate, day, consumption, bill_amount, payment)
+        )
+        consumption, bill_amount = round_fixed(consumption, 0), round_fixed(bill_amount, 2) / 100
+
+        ids = np.arange(first_customer, first_customer + num_customers)
+        periods = np.array([f"{year}-{m:02d}" for year, m in months])
+        dates = np.char.add(np.char.add(periods, '-'), np.char.zfill(day.astype(str), 2))
+        type_names = np.array(customer_types, dtype=object)[kind]
+        columns = [
+            np.repeat(np.array([f"CUST-{i:05d}" for i in ids.tolist()], dtype=object), len(months)).tolist(),
+            np.repeat(type_names, len(months)).tolist(),
+            dates.ravel().tolist(),
+            np.tile(periods, num_customers).tolist(),
+            list(map(str, consumption.ravel().tolist())),
+            list(map(str, bill_amount.ravel().tolist())),
+            np.array(PAYMENT_STATUSES, dtype=object)[payment.ravel()].tolist(),
+            np.repeat(np.array(list(map(str, RATES)), dtype=object)[kind], len(months)).tolist(),
+        ]
+
+        text = '\r\n'.join(map(','.join, zip(*columns))) + '\r\n'
+
+        typed = None
+        if columnar:
+            values = [
+                np.array(columns[0], dtype=object), np.array(columns[1], dtype=object),
+                dates.ravel().astype('datetime64[s]').astype(np.int64), np.array(columns[3], dtype=object),
+                consumption.ravel(), bill_amount.ravel(), np.array(columns[6], dtype=object),
+                np.repeat(rate, len(months)),
+            ]
+            typed = {name: (array, None) for name, array in zip(CONSUMPTION_SCHEMA, values)}
+
+        found = None
+        if labels:
+            # Customer by customer, month by month, leak before decline, like the python generator
+            customer, period, anomaly = np.nonzero(np.stack([leak[:num_customers], decline[:num_customers]], axis=-1))
+            found = [(date, f"CUST-{first_customer + i:05d}", 'consumption', CONSUMPTION_ANOMALIES[a])
+                     for date, i, a in zip(dates[customer, period].tolist(), customer.tolist(), anomaly.tolist())]
+
+    return Block(num_customers * len(months), text, typed, timings, found)
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Generate high-frequency (down to 1-second), temporally correlated sensor
+telemetry for the stations, zones and facilities as a float32 array
+
+The generator lives in datagen.highfreq; see --help.
+"""
+
+from datagen.highfreq import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Generate scenario variants of the hourly datasets (different incidents on the
+same underlying signals) by overlaying each scenario file on a cached,
+memory-mapped baseline
+
+The generator lives in datagen.variants; see --help.
+"""
+
+from datagen.variants import main
+
+if __name__ == "__main__":
+    main()
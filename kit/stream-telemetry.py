@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Stream the hourly water utility readings as paced real-time telemetry
+(HTTP POST, TCP or Server-Sent Events) for load-testing the platform backend
+
+The simulator lives in datagen.telemetry; see --help.
+"""
+
+from datagen.telemetry import main
+
+if __name__ == "__main__":
+    main()
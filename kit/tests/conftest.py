@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+KIT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def run():
+    """run(directory, script, *args): a kit/ script's stdout, run with `directory` (created) as working directory"""
+    def run(directory, script, *args):
+        directory.mkdir(parents=True, exist_ok=True)
+        done = subprocess.run([sys.executable, str(KIT / script), *args], cwd=directory, check=True,
+                              capture_output=True, text=True)
+        return done.stdout
+    return run
@@ -0,0 +1,38 @@
+import os
+
+# A short window ending inside a shard, and a small customer base
+WINDOW = ['--end', '2024-01-20T05:00', '--scale', '0.05']
+
+
+def csvs(directory):
+    return {path.name: path.read_bytes() for path in sorted((directory / 'data').glob('*.csv'))}
+
+
+def test_build_cache_skips_and_relinks(tmp_path, run):
+    cache = tmp_path / 'cache'
+    run(tmp_path / 'a', 'generate-datasets.py', *WINDOW, '--cache', str(cache))
+    built = csvs(tmp_path / 'a')
+
+    # Unchanged inputs: every dataset is skipped
+    output = run(tmp_path / 'a', 'generate-datasets.py', *WINDOW, '--cache', str(cache))
+    assert output.count("Unchanged since the last build, skipped") == 7
+    assert csvs(tmp_path / 'a') == built
+
+    # A fresh data directory is linked from the cache
+    output = run(tmp_path / 'b', 'generate-datasets.py', *WINDOW, '--cache', str(cache))
+    assert output.count("linked from the build cache") == 7
+    assert csvs(tmp_path / 'b') == built
+    for name in built:
+        assert os.path.samefile(tmp_path / 'a' / 'data' / name, tmp_path / 'b' / 'data' / name)
+
+    # A forced rebuild replaces the links instead of writing through them
+    run(tmp_path / 'b', 'generate-datasets.py', *WINDOW, '--cache', str(cache), '--force')
+    assert csvs(tmp_path / 'b') == built
+    for name in built:
+        assert not os.path.samefile(tmp_path / 'a' / 'data' / name, tmp_path / 'b' / 'data' / name)
+    assert csvs(tmp_path / 'a') == built
+
+    # Changed inputs are rebuilt
+    output = run(tmp_path / 'a', 'generate-datasets.py', '--end', '2024-01-21', '--scale', '0.05',
+                 '--cache', str(cache))
+    assert "Unchanged" not in output
@@ -0,0 +1,17 @@
+import importlib.util
+
+import pytest
+
+HOURLY = ['water-quality-monitoring.csv', 'distribution-network-performance.csv', 'energy-usage.csv']
+
+ENGINES = ['python', pytest.param('numpy', marks=pytest.mark.skipif(
+    importlib.util.find_spec('numpy') is None, reason="--engine numpy needs NumPy"))]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_append_matches_full_rebuild(tmp_path, run, engine):
+    run(tmp_path / 'appended', 'generate-datasets.py', '--end', '2024-01-03T05:00', '--engine', engine)
+    run(tmp_path / 'appended', 'generate-datasets.py', '--end', '2024-01-20T05:00', '--engine', engine, '--append')
+    run(tmp_path / 'full', 'generate-datasets.py', '--end', '2024-01-20T05:00', '--engine', engine)
+    for name in HOURLY:
+        assert (tmp_path / 'appended' / 'data' / name).read_bytes() == (tmp_path / 'full' / 'data' / name).read_bytes()
@@ -0,0 +1,20 @@
+import importlib.util
+
+import pytest
+
+# A short window ending inside a shard, and a small customer base
+WINDOW = ['--end', '2024-01-20T05:00', '--scale', '0.05']
+
+ENGINES = ['python', pytest.param('numpy', marks=pytest.mark.skipif(
+    importlib.util.find_spec('numpy') is None, reason="--engine numpy needs NumPy"))]
+
+
+def csvs(directory):
+    return {path.name: path.read_bytes() for path in sorted((directory / 'data').glob('*.csv'))}
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_worker_count_does_not_change_output(tmp_path, run, engine):
+    run(tmp_path / 'one', 'generate-datasets.py', *WINDOW, '--engine', engine, '--workers', '1', '--labels')
+    run(tmp_path / 'four', 'generate-datasets.py', *WINDOW, '--engine', engine, '--workers', '4', '--labels')
+    assert csvs(tmp_path / 'one') == csvs(tmp_path / 'four')
@@ -0,0 +1,84 @@
+import csv
+import datetime
+import importlib.util
+
+import pytest
+
+from datagen.datasets import (
+    COMPLAINT_SCHEMA, CONSUMPTION_SCHEMA, CUSTOMER_SCHEMA, ENERGY_SCHEMA, MAINTENANCE_SCHEMA, NETWORK_SCHEMA,
+    QUALITY_SCHEMA,
+)
+
+np = pytest.importorskip("numpy")
+
+SCHEMAS = {
+    'water-quality-monitoring': QUALITY_SCHEMA, 'distribution-network-performance': NETWORK_SCHEMA,
+    'energy-usage': ENERGY_SCHEMA, 'maintenance-records': MAINTENANCE_SCHEMA, 'customers': CUSTOMER_SCHEMA,
+    'customer-consumption': CONSUMPTION_SCHEMA, 'customer-complaints': COMPLAINT_SCHEMA,
+}
+
+WINDOW = ['--end', '2024-01-03T05:00', '--scale', '0.05']
+
+FORMATS = ['npz', pytest.param('parquet', marks=pytest.mark.skipif(
+    importlib.util.find_spec('pyarrow') is None, reason="--columnar parquet needs pyarrow"))]
+
+
+def parse(text, kind):
+    """The typed value a csv field should be stored as"""
+    if text == '':
+        return None
+    if kind == 'timestamp':
+        return int(datetime.datetime.fromisoformat(text).replace(tzinfo=datetime.timezone.utc).timestamp())
+    if kind == 'float':
+        return float(text)
+    if kind == 'flag':
+        return text == 'Yes'
+    return text
+
+
+def expected_columns(path, schema):
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    return {name: [parse(row[name], kind) for row in rows] for name, kind in schema.items()}
+
+
+def npz_columns(path, schema):
+    """Decoded columns of an .npz archive, checking the dtype of each kind"""
+    archive = np.load(path)
+    columns = {}
+    for name, kind in schema.items():
+        array = archive[name]
+        valid = archive[f'{name}.valid'] if f'{name}.valid' in archive else np.ones(len(array), dtype=bool)
+        if kind in ('category', 'string'):  # both are dictionary-encoded, nulls as code -1
+            assert array.dtype == np.int32
+            assert (array[~valid] == -1).all()
+            categories = archive[f'{name}.categories'].tolist()
+            values = [categories[code] if code >= 0 else None for code in array.tolist()]
+        else:
+            assert array.dtype == {'timestamp': np.int64, 'float': np.float64, 'flag': np.bool_}[kind]
+            values = array.tolist()
+        columns[name] = [value if ok else None for value, ok in zip(values, valid.tolist())]
+    return columns
+
+
+def parquet_columns(path, schema):
+    """Decoded columns of a Parquet file, checking the Arrow type of each kind"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    types = {'timestamp': pa.int64(), 'float': pa.float64(), 'flag': pa.bool_(), 'string': pa.string(),
+             'category': pa.dictionary(pa.int32(), pa.string())}
+    for name, kind in schema.items():
+        assert table.schema.field(name).type == types[kind]
+    return {name: table.column(name).to_pylist() for name in schema}
+
+
+@pytest.mark.parametrize("engine", ['python', 'numpy'])
+@pytest.mark.parametrize("columnar", FORMATS)
+def test_columnar_matches_csv(tmp_path, run, engine, columnar):
+    run(tmp_path, 'generate-datasets.py', *WINDOW, '--engine', engine, '--columnar', columnar)
+    read = npz_columns if columnar == 'npz' else parquet_columns
+    for name, schema in SCHEMAS.items():
+        assert read(tmp_path / 'data' / f'{name}.{columnar}', schema) == \
+            expected_columns(tmp_path / 'data' / f'{name}.csv', schema), name
@@ -0,0 +1,31 @@
+import gzip
+import importlib.util
+import lzma
+
+import pytest
+
+WINDOW = ['--end', '2024-01-03T05:00', '--scale', '0.05']
+
+
+def zstd_decompress(path):
+    import zstandard
+
+    with zstandard.ZstdDecompressor().stream_reader(open(path, 'rb')) as f:
+        return f.read()
+
+
+CODECS = [
+    ('gzip', '.gz', lambda path: gzip.decompress(path.read_bytes())),
+    ('xz', '.xz', lambda path: lzma.decompress(path.read_bytes())),
+    pytest.param('zstd', '.zst', zstd_decompress, marks=pytest.mark.skipif(
+        importlib.util.find_spec('zstandard') is None, reason="--compress zstd needs zstandard")),
+]
+
+
+@pytest.mark.parametrize("codec, suffix, decompress", CODECS)
+def test_compressed_siblings_decompress_to_the_csv(tmp_path, run, codec, suffix, decompress):
+    run(tmp_path, 'generate-datasets.py', *WINDOW, '--compress', codec)
+    paths = sorted((tmp_path / 'data').glob('*.csv'))
+    assert len(paths) == 7
+    for path in paths:
+        assert decompress(path.with_name(path.name + suffix)) == path.read_bytes(), path.name
@@ -0,0 +1,66 @@
+import csv
+import sqlite3
+
+import pytest
+
+from datagen.database import SQL_TYPES, table_name
+from datagen.datasets import ENERGY_ROLLUP, NETWORK_ROLLUP, QUALITY_ROLLUP
+
+pytest.importorskip("numpy")  # --rollups needs NumPy
+
+ROLLUPS = {
+    'water-quality-monitoring': QUALITY_ROLLUP, 'distribution-network-performance': NETWORK_ROLLUP,
+    'energy-usage': ENERGY_ROLLUP,
+}
+
+# Spans two months and ends inside a day
+WINDOW = ['--end', '2024-02-03T05:00', '--scale', '0.05']
+
+
+def read(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+def decimals(column):
+    """Decimals a rollup column is rounded to"""
+    if column.endswith('_avg'):
+        return 4
+    if column.endswith(('_sum', '_min', '_max')):
+        return 3
+    return 2
+
+
+def test_tables_and_views_match_the_csv(tmp_path, run):
+    run(tmp_path, 'generate-datasets.py', *WINDOW, '--rollups', '--sqlite', 'utility.db')
+    db = sqlite3.connect(tmp_path / 'utility.db')
+    paths = sorted(path for path in (tmp_path / 'data').glob('*.csv') if path.suffixes == ['.csv'])
+    assert len(paths) == 7
+
+    # Every table holds its csv's rows, REAL columns as numbers and empty fields as NULL
+    for path in paths:
+        header, *rows = read(path)
+        table = table_name(path)
+        types = [column[2] for column in db.execute(f"PRAGMA table_info({table})")]
+        assert set(types) <= set(SQL_TYPES.values())
+        convert = [float if kind == 'REAL' else str for kind in types]
+        assert db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == len(rows)
+        assert db.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall() == [
+            tuple(None if value == '' else to(value) for to, value in zip(convert, row)) for row in rows
+        ]
+
+    # The views have the rollup csv columns, groups and (up to SQLite's rounding of ties) values
+    for name, rollup in ROLLUPS.items():
+        for granularity in ('daily', 'monthly'):
+            header, *rows = read(tmp_path / 'data' / f'{name}.{granularity}.csv')
+            cursor = db.execute(f"SELECT * FROM {table_name(tmp_path / f'{name}.csv')}_{granularity}")
+            assert [column[0] for column in cursor.description] == header
+            view = {row[:2]: row[2:] for row in cursor}
+            assert len(view) == len(rows)
+            for row in rows:
+                for column, text, value in zip(header[2:], row[2:], view[tuple(row[:2])]):
+                    if text == '':
+                        assert value is None, (name, column)
+                    else:
+                        assert value == pytest.approx(float(text), abs=1.01 * 10 ** -decimals(column)), (name, column)
+    db.close()
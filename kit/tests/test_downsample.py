@@ -0,0 +1,28 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from datagen.downsample import lttb
+
+
+@pytest.mark.parametrize("n, threshold", [(3, 3), (10, 4), (1000, 3), (1000, 500), (8761, 500), (100000, 2000)])
+def test_lttb_keeps_the_endpoints(n, threshold):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=np.float64)
+    y = np.cumsum(rng.normal(0, 1, n))
+    kept = lttb(x, y, threshold)
+    assert len(kept) == threshold
+    assert kept[0] == 0 and kept[-1] == n - 1
+    assert (np.diff(kept) > 0).all()
+
+
+def test_lttb_keeps_every_point_of_short_series():
+    x = np.arange(50, dtype=np.float64)
+    assert lttb(x, np.sin(x), 50).tolist() == list(range(50))
+    assert lttb(x, np.sin(x), 2).tolist() == list(range(50))
+
+
+def test_lttb_keeps_a_lone_peak():
+    y = np.zeros(10000)
+    y[4321] = 100.0
+    assert 4321 in lttb(np.arange(10000, dtype=np.float64), y, 100).tolist()
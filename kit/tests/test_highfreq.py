@@ -0,0 +1,31 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from datagen.highfreq import ar1_filter
+
+
+def sequential(innovations, phi, state):
+    x = np.empty(len(innovations))
+    for t, innovation in enumerate(innovations.tolist()):
+        state = phi * state + innovation
+        x[t] = state
+    return x
+
+
+@pytest.mark.parametrize("phi", [0.3, 0.9, 0.999, 0.99999])
+@pytest.mark.parametrize("n", [1, 1000, 4096, 100003])
+def test_blocked_scan_matches_sequential_loop(phi, n):
+    innovations = np.random.default_rng(n).normal(0, 1, n)
+    x, last = ar1_filter(innovations, phi, state=2.5)
+    expected = sequential(innovations, phi, 2.5)
+    np.testing.assert_allclose(x, expected, rtol=1e-9, atol=1e-9)
+    assert last == x[-1]
+
+
+def test_scan_carries_state_across_chunks():
+    innovations = np.random.default_rng(0).normal(0, 1, 50000)
+    whole, _ = ar1_filter(innovations, 0.995)
+    head, state = ar1_filter(innovations[:12345], 0.995)
+    tail, _ = ar1_filter(innovations[12345:], 0.995, state)
+    np.testing.assert_allclose(np.concatenate([head, tail]), whole, rtol=1e-9, atol=1e-9)
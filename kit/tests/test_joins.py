@@ -0,0 +1,42 @@
+import csv
+
+import pytest
+
+from datagen.joins import complaint_rows, consumption_rows, customer_number, load_joins, zone_customers
+
+pytest.importorskip("numpy")  # the join indexes are NumPy arrays
+
+# Two billing months and a small customer base
+WINDOW = ['--end', '2024-02-03T05:00', '--scale', '0.05']
+
+
+def read(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("engine", ['python', 'numpy'])
+def test_join_indexes_match_a_naive_join(tmp_path, run, engine):
+    run(tmp_path, 'generate-datasets.py', *WINDOW, '--engine', engine)
+    data = tmp_path / 'data'
+    customers, consumption, complaints = (
+        read(data / f'{name}.csv') for name in ('customers', 'customer-consumption', 'customer-complaints'))
+    dimension, tickets = load_joins(data / 'customers.csv'), load_joins(data / 'customer-complaints.csv')
+
+    assert dimension['months'].tolist() == sorted({row['billing_period'] for row in consumption})
+    zones = sorted({customer['zone'] for customer in customers})
+    assert dimension['zones'].tolist() == zones
+    for zone in zones:
+        assert zone_customers(dimension, zone).tolist() == [
+            customer_number(customer['customer_id']) for customer in customers if customer['zone'] == zone]
+    with pytest.raises(ValueError):
+        zone_customers(dimension, 'Zone-Z-Nowhere')
+
+    for customer in customers:
+        customer_id = customer['customer_id']
+        rows = list(consumption_rows(dimension, customer_id))
+        assert rows == [i for i, row in enumerate(consumption) if row['customer_id'] == customer_id]
+        assert {consumption[i]['customer_type'] for i in rows} == {customer['customer_type']}
+        assert complaint_rows(tickets, customer_id).tolist() == [
+            i for i, row in enumerate(complaints) if row['customer_id'] == customer_id]
+    assert sum(len(complaint_rows(tickets, customer['customer_id'])) for customer in customers) == len(complaints)
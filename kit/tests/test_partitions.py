@@ -0,0 +1,41 @@
+import csv
+import json
+
+from datagen.partitions import MANIFEST, PART, prune
+
+# Spans two months and ends inside a day
+WINDOW = ['--end', '2024-02-03T05:00', '--scale', '0.05']
+
+
+def test_manifest_matches_the_csv(tmp_path, run):
+    run(tmp_path, 'generate-datasets.py', *WINDOW, '--partition')
+    roots = sorted(path.parent for path in (tmp_path / 'data').glob(f'*/{MANIFEST}'))
+    assert len(roots) == 6  # every dataset but the customer dimension
+    for root in roots:
+        with open(root / MANIFEST) as f:
+            manifest = json.load(f)
+        text = root.with_suffix('.csv').read_bytes().decode()
+        header, *lines = text.split('\r\n')[:-1]
+        assert header.split(',') == manifest['columns']
+        time_index = manifest['columns'].index(manifest['time_column'])
+        entity_column = manifest['partition_by'][1]
+        entity_index = manifest['columns'].index(entity_column)
+
+        # Each part holds its month x entity rows in csv order
+        groups = {}
+        for line, fields in zip(lines, csv.reader(lines)):
+            groups.setdefault((fields[time_index][:7], fields[entity_index]), []).append((fields[time_index], line))
+        assert manifest['rows'] == len(lines)
+        assert [(p['month'], p[entity_column]) for p in manifest['partitions']] == sorted(groups)
+        for partition in manifest['partitions']:
+            rows = groups[partition['month'], partition[entity_column]]
+            times = [time for time, _ in rows]
+            assert (partition['rows'], partition['first'], partition['last']) == (len(rows), min(times), max(times))
+            part = (root / partition['path']).read_bytes().decode()
+            assert part == header + '\r\n' + ''.join(line + '\r\n' for _, line in rows)
+        assert len(list(root.glob(f'*/*/{PART}'))) == len(groups)
+
+    # Pruning keeps exactly the parts with rows in the range
+    root = tmp_path / 'data' / 'water-quality-monitoring'
+    kept = prune(root, start='2024-01-31 12:00', end='2024-02-01 06:00', station='Station-05-Coastal')
+    assert [partition['month'] for partition in kept] == ['2024-01', '2024-02']
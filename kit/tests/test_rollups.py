@@ -0,0 +1,79 @@
+import csv
+import math
+
+import pytest
+
+from datagen.datasets import ENERGY_ROLLUP, NETWORK_ROLLUP, QUALITY_ROLLUP
+
+pytest.importorskip("numpy")  # the rollups are NumPy group-bys
+
+ROLLUPS = {
+    'water-quality-monitoring': QUALITY_ROLLUP, 'distribution-network-performance': NETWORK_ROLLUP,
+    'energy-usage': ENERGY_ROLLUP,
+}
+
+# Spans two months and ends inside a day
+WINDOW = ['--end', '2024-02-03T05:00', '--scale', '0.05']
+
+def read(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def recompute(rows, rollup, period_length):
+    """{(period, entity): {column: unrounded value}} of the hourly csv rows, one reading at a time"""
+    groups = {}
+    for row in rows:
+        groups.setdefault((row['timestamp'][:period_length], row[rollup.entity]), []).append(row)
+    result = {}
+    for key, group in groups.items():
+        out = result[key] = {'readings': len(group)}
+        for column in rollup.stats:
+            values = [float(row[column]) for row in group if row[column] != '']
+            out.update({f"{column}_count": len(values), f"{column}_sum": math.fsum(values),
+                        f"{column}_min": min(values, default=None), f"{column}_max": max(values, default=None),
+                        f"{column}_avg": math.fsum(values) / len(values) if values else None})
+        for flag in rollup.rates:
+            yes = sum(row[flag] == 'Yes' for row in group)
+            out.update({f"{flag}_yes": yes, f"{flag}_rate": 100 * yes / len(group)})
+        for name, (numerator, denominator) in rollup.ratios.items():
+            total = out[f"{denominator}_sum"]
+            out[name] = 100 * out[f"{numerator}_sum"] / total if total else None
+        if rollup.split is not None:
+            category, values, summed = rollup.split
+            for value in values:
+                for column in summed:
+                    out[f"{column}_{value.lower().replace('-', '_')}"] = math.fsum(
+                        float(row[column] or 0) for row in group if row[category] == value)
+    return result
+
+
+def decimals(column):
+    """Decimals a rollup column is rounded to"""
+    if column.endswith('_avg'):
+        return 4
+    if column.endswith(('_sum', '_min', '_max')):
+        return 3
+    return 2
+
+
+@pytest.mark.parametrize("engine", ['python', 'numpy'])
+def test_rollups_match_a_recompute_from_the_csv(tmp_path, run, engine):
+    run(tmp_path, 'generate-datasets.py', *WINDOW, '--engine', engine, '--rollups')
+    for name, rollup in ROLLUPS.items():
+        rows = read(tmp_path / 'data' / f'{name}.csv')
+        for granularity, period_length in [('daily', 10), ('monthly', 7)]:
+            expected = recompute(rows, rollup, period_length)
+            written = read(tmp_path / 'data' / f'{name}.{granularity}.csv')
+            assert len(written) == len(expected)
+            for row in written:
+                values = expected[row.pop('period'), row.pop(rollup.entity)]
+                assert list(row) == list(values)
+                for column, text in row.items():
+                    value = values[column]
+                    if value is None:
+                        assert text == '', (name, column)
+                    elif isinstance(value, int):
+                        assert int(text) == value, (name, column)
+                    else:  # summed in another order, so it may round one step apart
+                        assert float(text) == pytest.approx(value, abs=1.01 * 10 ** -decimals(column)), (name, column)
@@ -0,0 +1,48 @@
+import csv
+
+import pytest
+
+from datagen.seekindex import index_path, read_slice
+
+# Spans two billing months and ends inside a day
+WINDOW = ['--end', '2024-02-03T05:00', '--scale', '0.05']
+
+
+def rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_read_slice_matches_filtering_the_csv(tmp_path, run):
+    run(tmp_path, 'generate-datasets.py', *WINDOW, '--index')
+    path = tmp_path / 'data' / 'water-quality-monitoring.csv'
+    every = rows(path)
+    for station, period in [('Station-12-Suburb-West', '2024-01-15'), ('Station-01-Downtown', '2024-02'),
+                            ('Station-01-Downtown', '2024-02-03'), (None, '2024-01-31'),
+                            ('Station-03-Residential-North', None)]:
+        expected = [row for row in every if station in (None, row['station'])
+                    and (period is None or row['timestamp'].startswith(period))]
+        assert expected and list(read_slice(path, station, period)) == expected
+
+    path = tmp_path / 'data' / 'customer-consumption.csv'
+    every = rows(path)
+    for customer, month in [('CUST-00001', None), ('CUST-00100', '2024-02'), ('CUST-00101', '2024-01'),
+                            (f"CUST-{len(every) // 2:05d}", None), (None, '2024-02')]:
+        expected = [row for row in every if customer in (None, row['customer_id'])
+                    and month in (None, row['billing_period'])]
+        assert expected and list(read_slice(path, customer, month)) == expected
+
+
+def test_stale_index_is_refused(tmp_path, run):
+    run(tmp_path, 'generate-datasets.py', '--end', '2024-01-03', '--index')
+    path = tmp_path / 'data' / 'energy-usage.csv'
+    with open(path, 'a') as f:
+        f.write('extra\r\n')
+    with pytest.raises(ValueError, match="stale"):
+        list(read_slice(path, 'Admin-Building', '2024-01-02'))
+
+    # --append without --index drops the indexes it would leave stale
+    run(tmp_path, 'generate-datasets.py', '--end', '2024-01-04', '--append')
+    assert not index_path(tmp_path / 'data' / 'water-quality-monitoring.csv').exists()
+    with pytest.raises(ValueError, match="no seek index"):
+        list(read_slice(tmp_path / 'data' / 'water-quality-monitoring.csv'))
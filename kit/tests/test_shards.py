@@ -0,0 +1,64 @@
+import pytest
+
+from datagen.datasets import (
+    HOUR, generate_energy_usage, generate_network_performance, generate_water_quality, monitoring_stations,
+    start_date,
+)
+from datagen.shards import SHARD_STEPS, customer_shards, derive_seed, time_shards
+
+# (dataset, python generator, entities with scenario rules among them)
+HOURLY = [
+    ('water-quality', generate_water_quality, monitoring_stations[:3] + ['Station-12-Suburb-West']),
+    ('network-performance', generate_network_performance, ['Zone-A-Downtown', 'Zone-C-South']),
+    ('energy-usage', generate_energy_usage, ['Desalination-Plant', 'Admin-Building']),
+]
+
+
+def test_derive_seed_is_stable_and_keyed():
+    assert derive_seed(42, 'water-quality', 'Station-01-Downtown', 0) == \
+        derive_seed(42, 'water-quality', 'Station-01-Downtown', 0)
+    seeds = {derive_seed(seed, dataset, step) for seed in (1, 42) for dataset in ('a', 'b') for step in (0, 168)}
+    assert len(seeds) == 8
+    assert derive_seed('a', 'b') != derive_seed('b', 'a')
+    assert 0 <= derive_seed(42) < 2 ** 64
+
+
+@pytest.mark.parametrize("hours", [1, SHARD_STEPS - 1, SHARD_STEPS, SHARD_STEPS + 1, 5 * SHARD_STEPS + 7])
+def test_time_shards_cover_the_window_on_fixed_boundaries(hours):
+    shards = time_shards(start_date, start_date + hours * HOUR, HOUR)
+    assert [first for first, _ in shards] == list(range(0, hours, SHARD_STEPS))
+    assert all(0 < n <= SHARD_STEPS for _, n in shards)
+    assert sum(n for _, n in shards) == hours
+
+
+def test_customer_shards_cover_every_customer():
+    shards = customer_shards(1234, 100)
+    assert [customer for first, n in shards for customer in range(first, first + n)] == list(range(1, 1235))
+
+
+# A shard depends only on the seed and its first step: cut short by the window
+# end it is a prefix of the full shard, which is what lets --append and any
+# worker count reproduce a full single-process build
+
+@pytest.mark.parametrize("dataset, generator, entities", HOURLY)
+def test_short_shard_is_a_prefix(dataset, generator, entities):
+    full_labels, short_labels = [], []
+    full = list(generator(entities, start_date, SHARD_STEPS, SHARD_STEPS, 42, labels=full_labels))
+    short = list(generator(entities, start_date, SHARD_STEPS, 10, 42, labels=short_labels))
+    assert short == full[:10 * len(entities)]
+    times = {row[0] for row in short}
+    assert short_labels == [label for label in full_labels if label[0] in times]
+    assert list(generator(entities, start_date, SHARD_STEPS, SHARD_STEPS, 7)) != full
+
+
+@pytest.mark.parametrize("dataset, generator, entities", HOURLY)
+def test_short_numpy_shard_is_a_prefix(dataset, generator, entities):
+    pytest.importorskip("numpy")
+    from datagen.vectorized import generate_hourly_numpy
+
+    full = generate_hourly_numpy(dataset, entities, start_date, SHARD_STEPS, SHARD_STEPS, 42, labels=True)
+    short = generate_hourly_numpy(dataset, entities, start_date, SHARD_STEPS, 10, 42, labels=True)
+    assert short.text.splitlines() == full.text.splitlines()[:10 * len(entities)]
+    times = {line[:19] for line in short.text.splitlines()}
+    assert short.labels == [label for label in full.labels if label[0] in times]
+    assert generate_hourly_numpy(dataset, entities, start_date, SHARD_STEPS, SHARD_STEPS, 7).text != full.text
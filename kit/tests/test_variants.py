@@ -0,0 +1,19 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+KIT = Path(__file__).resolve().parent.parent
+HOURLY = ['water-quality-monitoring', 'distribution-network-performance', 'energy-usage']
+
+
+def test_builtin_variant_matches_numpy_engine(tmp_path, run):
+    # A window ending inside a shard, so the padded last shard is covered too
+    end = "2024-01-20T05:00"
+    run(tmp_path, 'generate-datasets.py', '--engine', 'numpy', '--end', end, '--labels')
+    run(tmp_path, 'generate-variants.py', str(KIT / 'datagen' / 'scenarios.json'), '--end', end, '--labels')
+    data, variant = tmp_path / 'data', tmp_path / 'data' / 'variants' / 'scenarios'
+    for name in HOURLY:
+        assert (variant / f'{name}.csv').read_bytes() == (data / f'{name}.csv').read_bytes()
+        assert (variant / f'{name}.labels.csv').read_bytes() == (data / f'{name}.labels.csv').read_bytes()
@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from datagen.datasets import monitoring_stations, replicas, start_date
+from datagen.vectorized import _format_fixed, generate_water_quality_numpy, round_fixed
+
+# (lo, hi, decimals) of every formatted water-quality column
+COLUMNS = [(0.0, 5.0, 3), (6.0, 9.0, 2), (0.0, 20.0, 2), (10.0, 35.0, 1), (200.0, 1000.0, 1)]
+
+
+def dense_grid(lo, hi, decimals):
+    """Every half between representable values in [lo, hi], with its float neighbours"""
+    scale = 10 ** (decimals + 1)
+    halves = np.arange(round(lo * scale), round(hi * scale) + 1) / scale
+    return np.clip(np.concatenate([halves, np.nextafter(halves, np.inf), np.nextafter(halves, -np.inf)]), lo, hi)
+
+
+@pytest.mark.parametrize("lo, hi, decimals", COLUMNS)
+def test_format_fixed_matches_round_and_str(lo, hi, decimals):
+    values = dense_grid(lo, hi, decimals)
+    assert _format_fixed(values, lo, hi, decimals) == [str(round(value, decimals)) for value in values.tolist()]
+
+
+@pytest.mark.parametrize("lo, hi, decimals", COLUMNS)
+def test_round_fixed_matches_round(lo, hi, decimals):
+    values = dense_grid(lo, hi, decimals)
+    expected = [round(value, decimals) for value in values.tolist()]
+    assert (round_fixed(values, decimals) / 10 ** decimals).tolist() == expected
+
+
+def test_replicated_stations():
+    stations = replicas(monitoring_stations, 30)
+    assert stations[12] == f"{monitoring_stations[0]}/2"
+    block = generate_water_quality_numpy(stations, start_date, 0, 24, 42)
+    assert block.rows == 24 * 30
+    assert {line.split(',')[1] for line in block.text.splitlines()} == set(stations)